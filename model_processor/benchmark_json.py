@@ -0,0 +1,90 @@
+"""
+JSON后端基准测试 - 在合成的models-export数据上比较各后端的加载/保存吞吐量
+
+用法: python benchmark_json.py [--models N] [--repeat R]
+"""
+
+import argparse
+import base64
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 添加当前目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.json_backend import available_backends, create_backend
+
+
+def generate_export(model_count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """生成与models-export结构相近的合成数据（含长system提示词和base64头像）"""
+    rng = random.Random(seed)
+    vendors = ['gpt', 'claude', 'gemini', 'qwen', 'deepseek', 'glm', 'llama', 'mistral', '混元', '文心']
+    models = []
+    for i in range(model_count):
+        vendor = rng.choice(vendors)
+        model_id = f"{vendor}-{rng.randint(1, 5)}.{rng.randint(0, 9)}-{rng.choice(['mini', 'pro', 'max', 'turbo'])}-{i}"
+        avatar = base64.b64encode(rng.randbytes(rng.randint(512, 4096)) if hasattr(rng, 'randbytes')
+                                  else bytes(rng.getrandbits(8) for _ in range(1024))).decode('ascii')
+        models.append({
+            'id': model_id,
+            'user_id': f"user-{rng.randint(1, 50)}",
+            'base_model_id': None,
+            'name': model_id.upper().replace('-', ' '),
+            'params': {
+                'system': "你是一个乐于助人的助手。" * rng.randint(5, 60) + "\nFollow the rules: \"be concise\".",
+                'temperature': round(rng.random(), 2),
+                'max_tokens': rng.choice([1024, 4096, 8192]),
+            },
+            'meta': {
+                'profile_image_url': f"data:image/png;base64,{avatar}",
+                'description': rng.choice([None, "", f"{vendor}系列模型，支持多轮对话"]),
+                'capabilities': {'vision': rng.random() < 0.5, 'citations': True},
+                'tags': [{'name': tag} for tag in rng.sample(['推理思考', '多模态', '免费', 'openai', '搜索检索'], 2)],
+            },
+            'access_control': None,
+            'is_active': True,
+            'updated_at': 1700000000 + i,
+            'created_at': 1690000000 + i,
+        })
+    return models
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """返回多次执行中的最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="JSON后端加载/保存吞吐量基准测试")
+    parser.add_argument('--models', type=int, default=2000, help="合成模型数量")
+    parser.add_argument('--repeat', type=int, default=3, help="每项测试的重复次数（取最短耗时）")
+    args = parser.parse_args()
+
+    models = generate_export(args.models)
+    reference = json.dumps(models, ensure_ascii=False, indent=2)
+    payload = reference.encode('utf-8')
+    size_mb = len(payload) / (1 << 20)
+    print(f"合成数据: {args.models}个模型, {size_mb:.1f}MB (indent=2)")
+    print(f"{'后端':<10}{'加载 MB/s':>12}{'保存 MB/s':>12}{'写入实际使用':>14}{'输出一致':>10}")
+
+    for name in available_backends():
+        backend = create_backend(name)
+        load_seconds = measure(lambda: backend.loads(payload), args.repeat)
+        dump_seconds = measure(lambda: backend.dumps(models, 2), args.repeat)
+        identical = backend.dumps(models, 2) == reference and backend.loads(payload) == models
+        print(f"{name:<10}{size_mb / load_seconds:>12.1f}{size_mb / dump_seconds:>12.1f}"
+              f"{backend.dumps_backend(2):>14}{('是' if identical else '否'):>10}")
+
+
+if __name__ == "__main__":
+    main()
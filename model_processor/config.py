@@ -7,11 +7,136 @@ import logging
 # 日志配置
 LOG_LEVEL = logging.INFO
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# 异步日志：各日志器的记录经队列交给唯一的写入线程，格式化和控制台/文件写入都不阻塞处理流程
+LOG_ASYNC = True
+# 每个模型都会输出的热点日志（匹配成功、生成标签、生成描述）每N条输出1条，其余只计数并在结束时汇总；
+# 默认1为全部输出（与原有日志一致），大批量处理时可调大以减少日志量
+LOG_SAMPLE_EVERY = 1
 
 # 图标相关配置
 ICON_BASE_PATH = "lobe-icons/packages/static-png/light"
 ICON_BASE_URL = "https://registry.npmmirror.com/@lobehub/icons-static-png/latest/files/light"
 
+# lobe-icons子模块获取方式:
+#   'full'   - git submodule update --init --recursive
+#   'sparse' - 浅克隆 + blob:none部分克隆 + 稀疏检出，只检出实际使用的图标目录
+SUBMODULE_FETCH_MODE = 'full'
+SUBMODULE_FETCH_DEPTH = 1
+# lobe-icons检出的提交与主仓库记录的gitlink不一致时，是否更新到记录的提交；
+# 默认只输出警告并保留当前检出（例如手动切换到了更新的图标版本）
+SUBMODULE_SYNC_RECORDED = False
+
+# 图标清单来源:
+#   'filesystem' - 扫描检出后的图标目录
+#   'git'        - 用git ls-tree直接读取子模块中的树对象，无需检出工作区（稀疏获取时也不再检出）
+ICON_MANIFEST_SOURCE = 'filesystem'
+
+# 后台刷新子模块：存在上一次的图标索引缓存时先用它开始匹配，子模块检查/更新在后台线程中进行，
+# 完成后只重新匹配可能受图标变化影响的模型
+BACKGROUND_SUBMODULE_REFRESH = True
+# 后台刷新未结束时最多暂存的已处理模型数（清单变化后要从原始数据重新处理，暂存期间不输出）；
+# 达到上限后等待刷新完成，内存占用与输入大小无关
+REFRESH_PENDING_MAX_MODELS = 5000
+
+# 图标变体（主题/格式）配置，路径相对于项目根目录；各变体索引在首次使用时才构建
+ICON_VARIANTS = {
+    'png-light': {
+        'path': ICON_BASE_PATH,
+        'url': ICON_BASE_URL,
+        'extension': 'png',
+    },
+    'png-dark': {
+        'path': "lobe-icons/packages/static-png/dark",
+        'url': "https://registry.npmmirror.com/@lobehub/icons-static-png/latest/files/dark",
+        'extension': 'png',
+    },
+    'webp-light': {
+        'path': "lobe-icons/packages/static-webp/light",
+        'url': "https://registry.npmmirror.com/@lobehub/icons-static-webp/latest/files/light",
+        'extension': 'webp',
+    },
+    'webp-dark': {
+        'path': "lobe-icons/packages/static-webp/dark",
+        'url': "https://registry.npmmirror.com/@lobehub/icons-static-webp/latest/files/dark",
+        'extension': 'webp',
+    },
+    'svg': {
+        'path': "lobe-icons/packages/static-svg/icons",
+        'url': "https://registry.npmmirror.com/@lobehub/icons-static-svg/latest/files/icons",
+        'extension': 'svg',
+    },
+}
+
+# 用于匹配的图标变体（每个模型只匹配一次，其他变体按图标名称换算URL）
+DEFAULT_ICON_VARIANT = 'png-light'
+
+# profile_image_url使用的图标变体（该变体缺少对应图标时回退到默认变体）
+PROFILE_IMAGE_VARIANT = 'png-light'
+
+# 额外输出的图标URL字段: {变体: meta字段名}，例如 {'png-dark': 'profile_image_url_dark'}
+EXTRA_ICON_URL_FIELDS = {}
+
+# 模糊匹配模式: 'containment'（子串包含，置信度固定为0.5）或 'similarity'（n-gram余弦相似度评分）
+FUZZY_MATCH_MODE = 'containment'
+SIMILARITY_NGRAM_SIZE = 3
+SIMILARITY_MIN_SCORE = 0.35
+
+# 编辑距离匹配（BK树），处理mistal、hunyun这类拼写差异；作为最后一个匹配策略
+# 开启时原本无法匹配的模型可能匹配到图标（如deepsek-v3 -> deepseek-color），输出与关闭时不同；设为False恢复之前的结果
+ENABLE_EDIT_DISTANCE_MATCH = True
+EDIT_DISTANCE_MAX = 2  # 最大编辑距离（实际上限还受关键词长度约束：长度每4个字符允许1）
+EDIT_DISTANCE_MIN_LENGTH = 4  # 参与匹配的最短关键词长度
+
+# 缓存配置（目录相对于项目根目录）
+CACHE_DIR = ".model_processor_cache"
+ICON_INDEX_CACHE_FILE = "icon_index-{variant}.json"
+
+# 图标匹配结果缓存（LRU容量；开启持久化时与图标索引快照保存在同一目录）
+MATCH_CACHE_SIZE = 4096
+PERSIST_MATCH_CACHE = False
+MATCH_CACHE_FILE = "match_cache.json"
+
+# 增量处理：按模型内容指纹（名称、ID、描述、标签）保存处理结果，下次运行时未变化的模型直接复用；
+# 规则、配置、处理代码或图标清单变化时缓存整体失效
+INCREMENTAL_PROCESSING = True
+PROCESSED_CACHE_FILE = "processed_models.json"
+
+# 流式处理时每批批量匹配的模型数量
+PROCESS_BATCH_SIZE = 1000
+
+# 模型族聚类：按规范化名称/ID（去掉提供方前缀和-fovt、-instruct、日期等变体后缀）分组，
+# 每个族在整个运行期间保留一份厂商标签和描述模板素材，族内匹配图标和关键词命中相同的模型直接复用
+# （图标匹配本身由匹配缓存去重）
+MODEL_FAMILY_CLUSTERING = True
+
+# 处理模型的工作进程数（命令行 --jobs 可覆盖）：1为单进程，0为使用全部CPU核心；
+# 多进程时按PARALLEL_CHUNK_SIZE分块提交，输出顺序和统计与单进程一致
+PROCESS_JOBS = 1
+PARALLEL_CHUNK_SIZE = 200
+
+# 流水线模式（命令行 --pipeline 可开启）：解析、处理、写入三个阶段并发执行，阶段之间的队列最多缓存
+# PIPELINE_QUEUE_SIZE批模型（单进程每批PROCESS_BATCH_SIZE个，多进程每批PARALLEL_CHUNK_SIZE个）
+PIPELINE_MODE = False
+PIPELINE_QUEUE_SIZE = 4
+
+# 各阶段耗时与单次耗时分位数另存为JSON（命令行 --timings-json 可指定），为空时只输出到报告
+TIMINGS_JSON_FILE = ""
+
+# 性能分析（命令行 --profile 开启）：处理流程在cProfile下运行，同时按PROFILE_SAMPLE_INTERVAL秒采样调用栈；
+# 结果（.pstats和火焰图工具可用的.collapsed折叠栈）保存到PROFILE_DIR，报告中列出累计耗时前PROFILE_TOP_N个函数
+PROFILE_DIR = "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_TOP_N = 20
+
+# JSON后端: 'auto'（按orjson、msgspec、ujson、json的顺序取第一个已安装的）或指定后端名称；
+# 输出始终与标准库json逐字节一致：格式不一致，或数据中有科学计数法/非有限浮点数等后端输出不同的值时使用标准库
+JSON_BACKEND = 'auto'
+
+# 输出格式: 'json'（indent=2格式化，与原有输出一致）、'json-min'（无空白的紧凑JSON）、'ndjson'（每行一个模型）
+OUTPUT_FORMAT = 'json'
+# 输出压缩（边写边压缩）: None、'gzip' 或 'zstd'（需要安装zstandard）；输入文件按后缀自动识别
+OUTPUT_COMPRESSION = None
+
 # 厂商名称映射 - 将模型名称关键词映射到对应的图标文件名
 VENDOR_MAPPING = {
     # OpenAI系列
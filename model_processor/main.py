@@ -2,20 +2,45 @@
 模型数据处理主程序
 """
 
+import argparse
+import asyncio
+import collections
+import copy
+import hashlib
+import itertools
+import os
 import sys
+import threading
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Deque, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
 # 添加当前目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.file_handler import FileHandler
+from config import (
+    CACHE_DIR, PERSIST_MATCH_CACHE, MATCH_CACHE_FILE, BACKGROUND_SUBMODULE_REFRESH, PROCESS_BATCH_SIZE,
+    REFRESH_PENDING_MAX_MODELS,
+    OUTPUT_FORMAT, OUTPUT_COMPRESSION, INCREMENTAL_PROCESSING, PROCESSED_CACHE_FILE,
+    PROCESS_JOBS, PARALLEL_CHUNK_SIZE, PIPELINE_MODE, PIPELINE_QUEUE_SIZE, MODEL_FAMILY_CLUSTERING, TIMINGS_JSON_FILE,
+    PROFILE_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_TOP_N,
+    ICON_VARIANTS, DEFAULT_ICON_VARIANT, PROFILE_IMAGE_VARIANT, EXTRA_ICON_URL_FIELDS
+)
+from utils.file_handler import FileHandler, JsonArrayWriter, output_file_name
 from utils.git_handler import GitHandler
-from utils.icon_matcher import IconMatcher
+from utils.icon_matcher import IconMatcher, IconLibrary, MatchResult
 from utils.tag_generator import TagGenerator
 from utils.description_generator import DescriptionGenerator
-from utils.logger import get_logger
+from utils.model_features import ModelFeatures, build_model_features, family_key
+from utils.json_backend import get_json_backend
+from utils.processed_cache import ProcessedModelCache, model_fingerprint
+from utils.stage_timer import StageTimer, format_latency
+from utils.profiler import RunProfiler
+from utils.logger import (
+    get_logger, configure_worker_logging, take_sample_counts, merge_sample_counts, log_sample_summary
+)
 
 logger = get_logger("MainProcessor")
 
@@ -23,13 +48,27 @@ logger = get_logger("MainProcessor")
 class ModelProcessor:
     """模型数据处理器"""
     
-    def __init__(self, base_path: str = ".."):
+    def __init__(self, base_path: str = "..", jobs: int = PROCESS_JOBS, pipeline: bool = PIPELINE_MODE,
+                 timings_file: str = TIMINGS_JSON_FILE):
         self.base_path = Path(base_path).absolute()
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)  # 工作进程数，1为单进程处理
+        self.pipeline = pipeline  # 解析、处理、写入以流水线方式并发执行
+        self.timings_file = timings_file  # 阶段耗时JSON的保存路径，为空时不保存
+        self.stage_timer = StageTimer()  # 各阶段的耗时分布
+        # 性能分析器，设置后处理流程在性能分析下运行
+        self.profiler = None  # type: Optional[RunProfiler]
         self.file_handler = FileHandler()
-        self.git_handler = GitHandler(str(self.base_path))
+        self.git_handler = GitHandler(str(self.base_path), sparse_paths=self.required_icon_dirs())
         self.icon_matcher = None  # type: Optional[IconMatcher]
+        self.icon_library = None  # type: Optional[IconLibrary]
+        # 后台刷新子模块的线程及其结果（刷新后的图标索引集合和匹配器）
+        self._refresh_thread = None  # type: Optional[threading.Thread]
+        self._refreshed = None  # type: Optional[Tuple[IconLibrary, IconMatcher]]
         self.tag_generator = TagGenerator()
         self.description_generator = DescriptionGenerator()
+        self.processed_cache = None  # type: Optional[ProcessedModelCache]
+        # 模型族键 -> (计算素材时的图标名称, 关键词命中, 厂商标签和描述模板素材)，整个运行期间保留
+        self.family_contexts = {}  # type: Dict[str, Tuple[str, FrozenSet[str], Dict[str, Any]]]
         
         # 统计信息
         self.stats = {
@@ -39,16 +78,39 @@ class ModelProcessor:
             'generated_descriptions': 0,
             'errors': 0,
             'start_time': time.time(),
-            'failed_matches': []  # 存储匹配失败的模型
+            'failed_matches': [],  # 存储匹配失败的模型
+            'manifest_versions': {},  # 图标清单版本 -> 基于该版本匹配的模型数
+            'rematched_models': [],  # 后台刷新清单后重新匹配的模型
+            'reused_models': 0,  # 增量处理时复用上一次结果的模型数
+            'model_families': {},  # 模型族键 -> 模型数
+            'family_contexts': 0,  # 复用族内厂商标签和描述模板素材的模型数
+            'pipeline_stages': {}  # 流水线模式下各阶段的累计耗时（秒）
         }
     
+    @staticmethod
+    def required_icon_dirs() -> List[str]:
+        """本次运行会用到的图标目录（相对于lobe-icons），用于稀疏检出"""
+        variants = [DEFAULT_ICON_VARIANT, PROFILE_IMAGE_VARIANT] + list(EXTRA_ICON_URL_FIELDS)
+        icon_dirs = []
+        for variant in dict.fromkeys(variants):
+            path = ICON_VARIANTS[variant]['path']
+            icon_dirs.append(path[len("lobe-icons/"):] if path.startswith("lobe-icons/") else path)
+        return icon_dirs
+    
     def initialize(self) -> bool:
         """初始化处理器"""
         try:
             logger.info("开始初始化模型处理器...")
             
+            # 有上一次的图标索引缓存时先用它开始处理，子模块在后台刷新
+            if BACKGROUND_SUBMODULE_REFRESH and self._initialize_with_cached_manifest():
+                logger.info("模型处理器初始化成功（图标清单在后台刷新）")
+                return True
+            
             # 确保lobe-icons子模块准备就绪
-            if not self.git_handler.ensure_submodule_ready():
+            with self.stage_timer.measure("子模块检查"):
+                submodule_ready = self.git_handler.ensure_submodule_ready()
+            if not submodule_ready:
                 logger.error("lobe-icons子模块初始化失败")
                 return False
             
@@ -58,8 +120,8 @@ class ModelProcessor:
                 logger.error("无法获取图标目录路径")
                 return False
             
-            # 初始化图标匹配器
-            self.icon_matcher = IconMatcher(icons_path)
+            with self.stage_timer.measure("索引构建"):
+                self.icon_library, self.icon_matcher = self._create_icon_matcher(icons_path)
             
             logger.info("模型处理器初始化成功")
             return True
@@ -68,6 +130,69 @@ class ModelProcessor:
             logger.error(f"初始化时出错: {e}")
             return False
     
+    def _create_icon_matcher(self, icons_path: Path) -> Tuple[IconLibrary, IconMatcher]:
+        """基于当前子模块状态创建图标索引集合和匹配器"""
+        # 初始化图标索引集合（按子模块提交复用索引快照，其他变体按需构建）
+        cache_dir = self.base_path / CACHE_DIR
+        source_version = self.git_handler.get_submodule_commit()
+        icon_library = IconLibrary(self.base_path, cache_dir, source_version, git_handler=self.git_handler)
+        
+        # 初始化图标匹配器（只在默认变体上匹配）
+        match_cache_file = cache_dir / MATCH_CACHE_FILE if PERSIST_MATCH_CACHE else None
+        icon_matcher = IconMatcher(
+            icons_path,
+            source_version=source_version,
+            match_cache_file=match_cache_file,
+            index=icon_library.get_index(DEFAULT_ICON_VARIANT)
+        )
+        return icon_library, icon_matcher
+    
+    def _initialize_with_cached_manifest(self) -> bool:
+        """
+        用上一次保存的图标索引快照创建匹配器，并在后台线程中刷新子模块
+        
+        Returns:
+            存在可用快照并已启动后台刷新返回True
+        """
+        icon_library = IconLibrary(self.base_path, self.base_path / CACHE_DIR, git_handler=self.git_handler)
+        with self.stage_timer.measure("索引构建"):
+            index = icon_library.load_cached_index(DEFAULT_ICON_VARIANT)
+        if index is None:
+            logger.info("没有可用的图标索引缓存，同步检查子模块")
+            return False
+        
+        # 其他变体按快照对应的子模块提交构建，清单没有变化时与刷新后的快照键一致
+        icon_library.source_version = index.source_version
+        self.icon_library = icon_library
+        self.icon_matcher = IconMatcher(index.icons_path, index=index)
+        
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_icon_manifest, name="SubmoduleRefresh", daemon=True
+        )
+        self._refresh_thread.start()
+        return True
+    
+    def _refresh_icon_manifest(self):
+        """后台线程：确保子模块就绪并基于最新清单构建新的匹配器"""
+        try:
+            with self.stage_timer.measure("子模块检查"):
+                submodule_ready = self.git_handler.ensure_submodule_ready()
+            if not submodule_ready:
+                logger.error("后台刷新lobe-icons子模块失败，继续使用缓存的图标清单")
+                return
+            
+            icons_path = self.git_handler.get_lobe_icons_path()
+            if not icons_path:
+                logger.error("后台刷新后无法获取图标目录路径，继续使用缓存的图标清单")
+                return
+            
+            with self.stage_timer.measure("索引构建"):
+                self._refreshed = self._create_icon_matcher(icons_path)
+            logger.info(f"后台刷新图标清单完成: {self._refreshed[1].index.snapshot_key}")
+            
+        except Exception as e:
+            logger.error(f"后台刷新图标清单时出错: {e}")
+    
     def find_input_file(self) -> str:
         """查找输入文件"""
         logger.info("查找最新的models-export文件...")
@@ -83,13 +208,19 @@ class ModelProcessor:
         
         return input_file
     
-    def process_model(self, model_data: Dict[str, Any]) -> Dict[str, Any]:
-        """处理单个模型数据"""
+    def process_model(self, model_data: Dict[str, Any],
+                      features: Optional[ModelFeatures] = None,
+                      family: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        处理单个模型数据（features已包含匹配结果时直接复用）
+        
+        family为同族模型共用的厂商标签和描述模板素材（见family_context），缺少的部分按模型单独计算。
+        """
         try:
             model_name = model_data.get('name', '')
             model_id = model_data.get('id', '')
 
-            logger.debug(f"处理模型: {model_name} ({model_id})")
+            logger.debug("处理模型: %s (%s)", model_name, model_id)
 
             # 确保meta字段存在
             if 'meta' not in model_data:
@@ -100,36 +231,56 @@ class ModelProcessor:
                 logger.error("图标匹配器未初始化")
                 return model_data
 
-            match_result = self.icon_matcher.match_icon(model_name, model_id)
+            # 提取一次模型特征，供匹配、标签和描述生成共享
+            if features is None:
+                features = build_model_features(model_name, model_id)
+            if features.match_result is None:
+                match_result = self.icon_matcher.match_icon(model_name, model_id, features)
+            else:
+                match_result = features.match_result
 
             # 更新图标URL
             if match_result.matched:
-                model_data['meta']['profile_image_url'] = match_result.icon_url
+                icon_url = self.resolve_icon_url(match_result, PROFILE_IMAGE_VARIANT)
+                model_data['meta']['profile_image_url'] = icon_url
+                for variant, field_name in EXTRA_ICON_URL_FIELDS.items():
+                    variant_url = self.icon_library.get_icon_url(match_result.icon_name, variant)
+                    if variant_url:
+                        model_data['meta'][field_name] = variant_url
                 self.stats['matched_icons'] += 1
-                logger.debug(f"更新图标URL: {match_result.icon_url}")
+                logger.debug("更新图标URL: %s", icon_url)
             else:
                 # 记录匹配失败的模型
                 self.stats['failed_matches'].append({
                     'name': model_name,
                     'id': model_id
                 })
-                logger.debug(f"未匹配到图标，保持原有URL或设置为空")
+                logger.debug("未匹配到图标，保持原有URL或设置为空")
 
             # 生成和更新标签（总是尝试生成标签，即使没有匹配到图标）
-            new_tags = self.tag_generator.generate_tags(model_data, match_result.icon_name if match_result.matched else "")
+            family = family or {}
+            started = time.perf_counter()
+            new_tags = self.tag_generator.generate_tags(
+                model_data, features.icon_name, features, family.get('vendor_tags')
+            )
+            self.stage_timer.record("标签生成", time.perf_counter() - started)
 
             # 总是更新标签，即使是空列表
             model_data['meta']['tags'] = new_tags
             self.stats['updated_tags'] += 1
-            logger.debug(f"更新标签: {len(new_tags)}个")
+            logger.debug("更新标签: %d个", len(new_tags))
 
             # 生成描述（如果没有描述或描述为空）
             existing_description = model_data.get('meta', {}).get('description')
             if not existing_description or existing_description.strip() == "" or existing_description is None:
-                new_description = self.description_generator.generate_description(model_data, match_result.icon_name if match_result.matched else "")
+                started = time.perf_counter()
+                new_description = self.description_generator.generate_description(
+                    model_data, features.icon_name, features, family.get('profile')
+                )
+                self.stage_timer.record("描述生成", time.perf_counter() - started)
                 model_data['meta']['description'] = new_description
                 self.stats['generated_descriptions'] += 1
-                logger.debug(f"生成描述: {new_description[:50]}...")
+                logger.debug("生成描述: %s...", new_description[:50])
 
             return model_data
 
@@ -138,30 +289,576 @@ class ModelProcessor:
             self.stats['errors'] += 1
             return model_data
     
-    def process_models(self, models_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """处理所有模型数据"""
-        logger.info(f"开始处理{len(models_data)}个模型...")
+    def resolve_icon_url(self, match_result: MatchResult, variant: str) -> str:
+        """获取匹配图标在指定变体下的URL，变体中缺少该图标时回退到匹配结果的URL"""
+        if self.icon_library is None or variant == DEFAULT_ICON_VARIANT:
+            return match_result.icon_url
+        return self.icon_library.get_icon_url(match_result.icon_name, variant) or match_result.icon_url
+    
+    def process_models(self, models_data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        逐批处理模型数据（生成器），每批内批量匹配图标后逐个产出处理结果
         
-        self.stats['total_models'] = len(models_data)
-        processed_models = []
+        Args:
+            models_data: 模型数据序列，可以是流式解析得到的迭代器
+            
+        Returns:
+            与输入顺序一致的处理结果迭代器
+        """
+        logger.info("开始处理模型...")
+        if self.jobs > 1:
+            yield from self._process_models_parallel(models_data)
+            return
+        self.load_processed_cache()
+        
+        # 后台刷新未结束时暂存已处理的模型及其原始meta，清单变化后需要从原始数据重新处理；
+        # 暂存数量达到REFRESH_PENDING_MAX_MODELS时等待刷新完成，不在内存中保留整个输入
+        pending_models = []  # type: List[Dict[str, Any]]
+        pending_features = []  # type: List[Optional[ModelFeatures]]
+        pending_metas = []  # type: List[Optional[Dict[str, Any]]]
+        pending_reused = []  # type: List[bool]
+        
+        for batch in self._iter_batches(models_data, PROCESS_BATCH_SIZE):
+            refresh_pending = self._refresh_thread is not None
+            if refresh_pending:
+                pending_metas.extend(
+                    copy.deepcopy(model_data.get('meta')) if isinstance(model_data, dict) else None
+                    for model_data in batch
+                )
+            
+            # 内容未变化的模型复用上一次的处理结果，只有其余模型参与匹配
+            fingerprints, cached_entries = self.lookup_processed(batch)
+            processed_models, features_list = self.process_batch(batch, fingerprints, cached_entries)
+            
+            if refresh_pending:
+                pending_models.extend(processed_models)
+                pending_features.extend(features_list)
+                pending_reused.extend(entry is not None and features is not None
+                                      for entry, features in zip(cached_entries, features_list))
+            else:
+                yield from processed_models
+            
+            # 后台刷新完成（或暂存已满）后处理暂存的模型，之后的批次直接使用新的匹配器
+            if refresh_pending and (not self._refresh_thread.is_alive()
+                                    or len(pending_models) >= REFRESH_PENDING_MAX_MODELS):
+                if self._refresh_thread.is_alive():
+                    logger.info(f"暂存的模型已达{len(pending_models)}个，等待后台刷新完成后再继续处理")
+                self.apply_manifest_refresh(pending_models, pending_features, pending_metas, pending_reused)
+                yield from pending_models
+                pending_models, pending_features, pending_metas, pending_reused = [], [], [], []
+        
+        if self._refresh_thread is not None:
+            self.apply_manifest_refresh(pending_models, pending_features, pending_metas, pending_reused)
+            yield from pending_models
+        
+        logger.info(f"模型处理完成，共{self.stats['total_models']}个模型")
+    
+    def process_batch(self, batch: List[Dict[str, Any]], fingerprints: List[str],
+                      cached_entries: List[Optional[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], List[Optional[ModelFeatures]]]:
+        """
+        处理一批模型：批量匹配未命中增量缓存的模型，再逐个生成标签和描述
         
-        for i, model_data in enumerate(models_data):
+        Args:
+            batch: 模型数据列表（原地更新）
+            fingerprints: 模型内容指纹（未开启增量处理时为空字符串）
+            cached_entries: 上一次的处理结果（未命中时为None）
+            
+        Returns:
+            (处理结果列表, 特征列表)
+        """
+        features_list = self.match_models(
+            batch, [entry and MatchResult(**entry['match']) for entry in cached_entries]
+        )
+        manifest_version = self.icon_matcher.index.snapshot_key if self.icon_matcher else ""
+        
+        processed_models = []  # type: List[Dict[str, Any]]
+        for model_data, features, fingerprint, entry in zip(batch, features_list, fingerprints, cached_entries):
+            self.stats['total_models'] += 1
+            i = self.stats['total_models'] - 1
+            errors = self.stats['errors']
             try:
-                processed_model = self.process_model(model_data)
-                processed_models.append(processed_model)
+                if entry is not None and features is not None:
+                    processed_model = self.apply_processed(model_data, features, entry)
+                else:
+                    family = None
+                    if MODEL_FAMILY_CLUSTERING and features is not None:
+                        family = self.family_context(features)
+                    processed_model = self.process_model(model_data, features, family)
+                    if fingerprint and self.stats['errors'] == errors:
+                        self.record_processed(fingerprint, processed_model, features)
                 
                 # 每处理100个模型输出一次进度
                 if (i + 1) % 100 == 0:
-                    logger.info(f"已处理 {i + 1}/{len(models_data)} 个模型")
+                    logger.info(f"已处理 {i + 1} 个模型")
                     
             except Exception as e:
                 logger.error(f"处理第{i+1}个模型时出错: {e}")
-                processed_models.append(model_data)  # 保留原数据
+                processed_model = model_data  # 保留原数据
                 self.stats['errors'] += 1
+            
+            if features is not None:
+                versions = self.stats['manifest_versions']
+                versions[manifest_version] = versions.get(manifest_version, 0) + 1
+            processed_models.append(processed_model)
+        
+        return processed_models, features_list
+    
+    def family_context(self, features: ModelFeatures) -> Dict[str, Any]:
+        """
+        获取模型族共用的厂商标签和描述模板素材
+        
+        每个族只保留一份素材，记录计算时的图标名称和关键词命中；族内模型的这两项与之相同时直接复用，
+        否则按该模型重新计算并替换族内的素材。
+        
+        Args:
+            features: 已匹配的模型特征
+            
+        Returns:
+            {'vendor_tags': 厂商标签列表, 'profile': 描述素材}
+        """
+        family = family_key(features)
+        model_families = self.stats['model_families']
+        model_families[family] = model_families.get(family, 0) + 1
+        
+        cached = self.family_contexts.get(family)
+        if cached is not None and cached[0] == features.icon_name and cached[1] == features.hits:
+            self.stats['family_contexts'] += 1
+            return cached[2]
         
-        logger.info("模型处理完成")
+        context = {
+            'vendor_tags': self.tag_generator.generate_vendor_tags(
+                features.icon_name, features.model_name, features.model_id, features
+            ),
+            'profile': self.description_generator.family_profile(features),
+        }
+        self.family_contexts[family] = (features.icon_name, frozenset(features.hits), context)
+        return context
+    
+    def _process_models_parallel(self, models_data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        多进程处理模型：按PARALLEL_CHUNK_SIZE分块提交到进程池，按提交顺序合并结果和统计
+        
+        每个工作进程在启动时接收一次图标索引集合和匹配器，标签和描述生成器也只创建一次。
+        进行中的分块数量有上限，输入仍然是流式读取的。
+        """
+        self.finish_manifest_refresh()
+        self.load_processed_cache()
+        
+        pool = self._create_worker_pool()
+        try:
+            in_flight = collections.deque()  # type: Deque[Future]
+            for chunk in self._iter_batches(models_data, PARALLEL_CHUNK_SIZE):
+                in_flight.append(self._submit_chunk(pool, chunk))
+                while len(in_flight) >= self.jobs * 2:
+                    yield from self._merge_chunk_result(in_flight.popleft().result())
+            while in_flight:
+                yield from self._merge_chunk_result(in_flight.popleft().result())
+        finally:
+            pool.shutdown(cancel_futures=True)
+        
+        logger.info(f"模型处理完成，共{self.stats['total_models']}个模型")
+    
+    def finish_manifest_refresh(self):
+        """
+        等待后台刷新完成并换用新的匹配器（还没有处理任何模型时使用）
+        
+        多进程和流水线模式在开始处理前调用：工作进程在启动时复制匹配器，所有分块需要使用同一份图标清单。
+        """
+        if self._refresh_thread is not None:
+            self.apply_manifest_refresh([], [], [], [])
+    
+    def _create_worker_pool(self) -> ProcessPoolExecutor:
+        """创建进程池，每个工作进程在启动时接收一次图标索引集合和匹配器"""
+        logger.info(f"使用{self.jobs}个工作进程处理模型")
+        return ProcessPoolExecutor(
+            self.jobs, initializer=_init_worker,
+            initargs=(str(self.base_path), self.icon_library, self.icon_matcher)
+        )
+    
+    def _submit_chunk(self, pool: ProcessPoolExecutor, chunk: List[Dict[str, Any]]) -> Future:
+        """查找分块的增量缓存后提交到进程池"""
+        fingerprints, cached_entries = self.lookup_processed(chunk)
+        future = pool.submit(_process_chunk, chunk, fingerprints, cached_entries, self.stats['total_models'])
+        self.stats['total_models'] += len(chunk)
+        return future
+    
+    def _merge_chunk_result(self, result: Tuple[List[Dict[str, Any]], Dict[str, Any],
+                                                Dict[str, Dict[str, Any]], Dict[str, Any], float]) -> List[Dict[str, Any]]:
+        """合并一个分块的统计、增量缓存条目和匹配器统计，返回处理结果"""
+        processed_models, stats, records, matcher_stats, elapsed = result
+        stages = self.stats['pipeline_stages']
+        if 'process' in stages:
+            stages['process'] += elapsed
+        for key in ('matched_icons', 'updated_tags', 'generated_descriptions', 'errors', 'reused_models', 'family_contexts'):
+            self.stats[key] += stats[key]
+        model_families = self.stats['model_families']
+        for key, model_count in stats['model_families'].items():
+            model_families[key] = model_families.get(key, 0) + model_count
+        self.stats['failed_matches'].extend(stats['failed_matches'])
+        merge_sample_counts(stats['log_samples'])
+        self.stage_timer.merge(stats['stage_timings'])
+        versions = self.stats['manifest_versions']
+        for manifest_version, model_count in stats['manifest_versions'].items():
+            versions[manifest_version] = versions.get(manifest_version, 0) + model_count
+        if self.processed_cache is not None:
+            self.processed_cache.merge(records)
+        self.icon_matcher.merge_stats(matcher_stats)
         return processed_models
     
+    def run_pipeline(self, models_data: Iterable[Dict[str, Any]], output_file: str) -> bool:
+        """
+        以流水线方式处理并保存：解析、处理、写入三个阶段并发执行，阶段之间用有界队列连接
+        
+        Args:
+            models_data: 模型数据序列（流式解析的迭代器）
+            output_file: 输出文件路径
+            
+        Returns:
+            保存成功返回True，失败返回False（目标文件保持不变）
+        """
+        try:
+            writer = self.file_handler.open_json_writer(output_file, OUTPUT_FORMAT, OUTPUT_COMPRESSION)
+            with writer:
+                asyncio.run(self._run_pipeline(models_data, writer))
+            
+            logger.info(f"成功保存JSON文件: {output_file} ({writer.count}条)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"流水线处理时出错: {e}")
+            return False
+    
+    async def _run_pipeline(self, models_data: Iterable[Dict[str, Any]], writer: JsonArrayWriter):
+        """
+        流水线的三个阶段（asyncio任务），阻塞的工作交给各阶段独占的线程或进程池
+        
+        - 解析: 在读取线程中按批从输入迭代器取出模型
+        - 处理: 单进程时在处理线程中执行process_batch；多进程时按提交顺序等待进程池的分块结果
+        - 写入: 在写入线程中序列化（和压缩）处理结果
+        
+        队列满时上游阶段等待，内存中最多保留约 2 * PIPELINE_QUEUE_SIZE 批模型（多进程时另有进行中的分块）。
+        """
+        loop = asyncio.get_running_loop()
+        batch_size = PARALLEL_CHUNK_SIZE if self.jobs > 1 else PROCESS_BATCH_SIZE
+        parsed_queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)  # type: asyncio.Queue
+        processed_queue = asyncio.Queue(PIPELINE_QUEUE_SIZE)  # type: asyncio.Queue
+        stage_seconds = self.stats['pipeline_stages'] = {'parse': 0.0, 'process': 0.0, 'write': 0.0}
+        
+        reader = ThreadPoolExecutor(1, thread_name_prefix="PipelineParse")
+        processor = ThreadPoolExecutor(1, thread_name_prefix="PipelineProcess")
+        writer_thread = ThreadPoolExecutor(1, thread_name_prefix="PipelineWrite")
+        pool = None  # type: Optional[ProcessPoolExecutor]
+        
+        async def run_stage(stage: str, executor: ThreadPoolExecutor, func, *args):
+            """在阶段的执行器中运行阻塞操作并累计耗时"""
+            started = time.perf_counter()
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            finally:
+                stage_seconds[stage] += time.perf_counter() - started
+        
+        async def parse_stage():
+            batches = self._iter_batches(models_data, batch_size)
+            while True:
+                batch = await run_stage('parse', reader, next, batches, None)
+                if batch is None:
+                    break
+                await parsed_queue.put(batch)
+            await parsed_queue.put(None)
+        
+        async def process_stage():
+            nonlocal pool
+            # 等待后台刷新时解析阶段继续读取输入
+            await loop.run_in_executor(processor, self.finish_manifest_refresh)
+            await loop.run_in_executor(processor, self.load_processed_cache)
+            if self.jobs > 1:
+                pool = self._create_worker_pool()
+            
+            in_flight = collections.deque()  # type: Deque[asyncio.Future]
+            while True:
+                batch = await parsed_queue.get()
+                if batch is None:
+                    break
+                if pool is None:
+                    await processed_queue.put(await run_stage('process', processor, self._process_batch_serial, batch))
+                    continue
+                
+                future = await loop.run_in_executor(processor, self._submit_chunk, pool, batch)
+                in_flight.append(asyncio.wrap_future(future))
+                while len(in_flight) >= self.jobs * 2:
+                    await processed_queue.put(self._merge_chunk_result(await in_flight.popleft()))
+            while in_flight:
+                await processed_queue.put(self._merge_chunk_result(await in_flight.popleft()))
+            await processed_queue.put(None)
+        
+        async def write_stage():
+            while True:
+                processed_models = await processed_queue.get()
+                if processed_models is None:
+                    break
+                await run_stage('write', writer_thread, self._write_models, writer, processed_models)
+        
+        logger.info(f"开始流水线处理模型 (每批{batch_size}个, 队列容量{PIPELINE_QUEUE_SIZE}批)")
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(stage()) for stage in (parse_stage, process_stage, write_stage)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for executor in (reader, processor, writer_thread):
+                executor.shutdown()
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        
+        stage_seconds['total'] = time.perf_counter() - started
+        logger.info(f"模型处理完成，共{self.stats['total_models']}个模型")
+    
+    def _process_batch_serial(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """单进程流水线的处理阶段：查找增量缓存后处理一批模型"""
+        fingerprints, cached_entries = self.lookup_processed(batch)
+        processed_models, _ = self.process_batch(batch, fingerprints, cached_entries)
+        return processed_models
+    
+    def _write_models(self, writer: JsonArrayWriter, models_data: List[Dict[str, Any]]):
+        """流水线的写入阶段：写入一批处理结果"""
+        for model_data in models_data:
+            started = time.perf_counter()
+            writer.write(model_data)
+            self.stage_timer.record("保存", time.perf_counter() - started)
+    
+    @staticmethod
+    def _iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+        """将序列按固定大小分批"""
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def apply_manifest_refresh(self, models_data: List[Dict[str, Any]],
+                               features_list: List[Optional[ModelFeatures]],
+                               original_metas: List[Optional[Dict[str, Any]]], reused: List[bool]):
+        """
+        等待后台刷新完成，清单有变化时只重新处理可能受影响的模型
+        
+        Args:
+            models_data: 已处理的模型数据（原地更新）
+            features_list: 基于缓存清单匹配得到的特征
+            original_metas: 处理前的meta字段副本（原本没有meta时为None）
+            reused: 是否复用了上一次的处理结果
+        """
+        logger.info("等待后台刷新图标清单...")
+        self._refresh_thread.join()
+        self._refresh_thread = None
+        if self._refreshed is None:
+            return
+        
+        stale_matcher = self.icon_matcher
+        icon_library, icon_matcher = self._refreshed
+        self._refreshed = None
+        old_version = stale_matcher.index.snapshot_key
+        new_version = icon_matcher.index.snapshot_key
+        if new_version == old_version:
+            logger.info("图标清单没有变化，无需重新匹配")
+            stale_matcher.match_cache_file = icon_matcher.match_cache_file
+            self.icon_library.source_version = icon_library.source_version
+            return
+        
+        changed_icons = stale_matcher.index.all_icons ^ icon_matcher.index.all_icons
+        if self.processed_cache is not None:
+            # 上一次运行的结果基于旧清单，之后的模型不再复用；本次已处理的模型下面逐个检查
+            self.processed_cache.forget_previous()
+        logger.info(f"图标清单已更新 ({old_version} -> {new_version})，{len(changed_icons)}个图标有变化")
+        
+        icon_matcher.inherit_stats(stale_matcher)
+        self.icon_library = icon_library
+        self.icon_matcher = icon_matcher
+        
+        affected = [
+            i for i, features in enumerate(features_list)
+            if features is not None and stale_matcher.may_change(features, changed_icons)
+        ]
+        for i in affected:
+            model_data = models_data[i]
+            old_features = features_list[i]
+            
+            # 撤销第一次处理的统计和修改
+            if old_features.icon_name:
+                self.stats['matched_icons'] -= 1
+            else:
+                failed = {'name': old_features.model_name, 'id': old_features.model_id}
+                if failed in self.stats['failed_matches']:
+                    self.stats['failed_matches'].remove(failed)
+            self.stats['updated_tags'] -= 1
+            if reused[i]:
+                self.stats['reused_models'] -= 1
+            original_meta = original_metas[i]
+            existing_description = (original_meta or {}).get('description')
+            if not existing_description or existing_description.strip() == "":
+                self.stats['generated_descriptions'] -= 1
+            if original_meta is None:
+                model_data.pop('meta', None)
+            else:
+                model_data['meta'] = original_meta
+            
+            fingerprint = model_fingerprint(model_data) if self.processed_cache is not None else ""
+            features = build_model_features(old_features.model_name, old_features.model_id)
+            errors = self.stats['errors']
+            self.process_model(model_data, features)
+            features_list[i] = features
+            if fingerprint:
+                if self.stats['errors'] == errors:
+                    self.record_processed(fingerprint, model_data, features)
+                else:
+                    self.processed_cache.discard(fingerprint)
+            self.stats['rematched_models'].append({
+                'name': features.model_name,
+                'id': features.model_id,
+                'old_icon': old_features.icon_name,
+                'new_icon': features.icon_name
+            })
+        
+        if affected:
+            versions = self.stats['manifest_versions']
+            versions[old_version] -= len(affected)
+            versions[new_version] = versions.get(new_version, 0) + len(affected)
+        logger.info(f"基于新图标清单重新匹配了{len(affected)}个模型")
+    
+    @property
+    def processed_cache_key(self) -> str:
+        """
+        增量处理缓存的有效性键：匹配缓存键 + 配置与处理代码指纹 + 输出图标变体的清单版本
+        
+        配置和处理代码按源文件整体计算指纹，任何改动都会使缓存失效（保守但不会复用过期结果）。
+        """
+        digest = hashlib.sha1()
+        source_modules = {sys.modules[cls.__module__] for cls in
+                          (IconMatcher, TagGenerator, DescriptionGenerator, ModelFeatures, ModelProcessor)}
+        source_modules.add(sys.modules['config'])
+        for source_file in sorted(str(module.__file__) for module in source_modules):
+            digest.update(Path(source_file).read_bytes())
+        for variant in sorted({PROFILE_IMAGE_VARIANT, *EXTRA_ICON_URL_FIELDS} - {DEFAULT_ICON_VARIANT}):
+            digest.update(f"{variant}={self.icon_library.get_index(variant).snapshot_key};".encode('utf-8'))
+        return f"{self.icon_matcher.match_cache_key}:{digest.hexdigest()[:12]}"
+    
+    def load_processed_cache(self):
+        """加载上一次运行的处理结果（未开启增量处理或匹配器未初始化时跳过）"""
+        if not INCREMENTAL_PROCESSING or self.icon_matcher is None or self.icon_library is None:
+            return
+        try:
+            self.processed_cache = ProcessedModelCache()
+            self.processed_cache.load(self.base_path / CACHE_DIR / PROCESSED_CACHE_FILE, self.processed_cache_key)
+        except Exception as e:
+            logger.warning(f"加载增量处理缓存时出错: {e}")
+            self.processed_cache = None
+    
+    def save_processed_cache(self) -> bool:
+        """保存本次运行的处理结果（键基于刷新后的最终图标清单）"""
+        if self.processed_cache is None:
+            return False
+        return self.processed_cache.save(self.base_path / CACHE_DIR / PROCESSED_CACHE_FILE, self.processed_cache_key)
+    
+    def lookup_processed(self, models_data: List[Any]) -> Tuple[List[str], List[Optional[Dict[str, Any]]]]:
+        """
+        计算一批模型的内容指纹并查找上一次的处理结果
+        
+        Returns:
+            (指纹列表, 缓存条目列表)，未开启增量处理或无法计算指纹的位置分别为空字符串和None
+        """
+        fingerprints = []  # type: List[str]
+        entries = []  # type: List[Optional[Dict[str, Any]]]
+        for model_data in models_data:
+            fingerprint = ""
+            if self.processed_cache is not None and isinstance(model_data, dict):
+                try:
+                    fingerprint = model_fingerprint(model_data)
+                except Exception as e:
+                    logger.debug(f"计算模型指纹时出错: {e}")
+            fingerprints.append(fingerprint)
+            entries.append(self.processed_cache.get(fingerprint) if fingerprint else None)
+        return fingerprints, entries
+    
+    def apply_processed(self, model_data: Dict[str, Any], features: ModelFeatures,
+                        entry: Dict[str, Any]) -> Dict[str, Any]:
+        """把缓存的处理结果写回模型的meta，统计与process_model一致"""
+        if 'meta' not in model_data:
+            model_data['meta'] = {}
+        
+        existing_description = model_data['meta'].get('description')
+        if not existing_description or existing_description.strip() == "":
+            self.stats['generated_descriptions'] += 1
+        model_data['meta'].update(copy.deepcopy(entry['meta']))
+        
+        if features.icon_name:
+            self.stats['matched_icons'] += 1
+        else:
+            self.stats['failed_matches'].append({
+                'name': features.model_name,
+                'id': features.model_id
+            })
+        self.stats['updated_tags'] += 1
+        self.stats['reused_models'] += 1
+        return model_data
+    
+    def record_processed(self, fingerprint: str, model_data: Dict[str, Any], features: Optional[ModelFeatures]):
+        """记录process_model写入meta的字段（按写入顺序，复用时输出的字段顺序保持一致）"""
+        if features is None or features.match_result is None:
+            return
+        
+        meta = model_data['meta']
+        written = {}
+        if features.icon_name:
+            written['profile_image_url'] = meta['profile_image_url']
+            for variant, field_name in EXTRA_ICON_URL_FIELDS.items():
+                if self.icon_library.get_icon_url(features.icon_name, variant):
+                    written[field_name] = meta[field_name]
+        # 描述和标签是指纹的一部分：原有描述未被替换时写回的也是相同的值
+        written['tags'] = meta['tags']
+        written['description'] = meta.get('description')
+        self.processed_cache.put(fingerprint, asdict(features.match_result), written)
+    
+    def match_models(self, models_data: List[Dict[str, Any]],
+                     known_results: Optional[List[Optional[MatchResult]]] = None) -> List[Optional[ModelFeatures]]:
+        """
+        批量提取模型特征并匹配图标
+        
+        Args:
+            models_data: 模型数据列表
+            known_results: 与models_data对应的已知匹配结果（例如增量处理缓存），有结果的位置不再匹配
+            
+        Returns:
+            与输入顺序一致的特征列表；提取失败的位置为None，留给process_model单独处理
+        """
+        features_list = []  # type: List[Optional[ModelFeatures]]
+        for j, model_data in enumerate(models_data):
+            try:
+                features = build_model_features(model_data.get('name', ''), model_data.get('id', ''))
+                if known_results is not None:
+                    features.match_result = known_results[j]
+                features_list.append(features)
+            except Exception as e:
+                logger.debug(f"提取模型特征时出错: {e}")
+                features_list.append(None)
+        
+        if self.icon_matcher is None:
+            return features_list
+        
+        pending = [features for features in features_list if features is not None and features.match_result is None]
+        try:
+            self.icon_matcher.match_icons(
+                [(features.model_name, features.model_id) for features in pending],
+                pending
+            )
+        except Exception as e:
+            logger.error(f"批量匹配图标时出错: {e}")
+        
+        return features_list
+    
     def generate_report(self) -> str:
         """生成处理报告"""
         elapsed_time = time.time() - self.stats['start_time']
@@ -177,6 +874,63 @@ class ModelProcessor:
 匹配成功率: {(self.stats['matched_icons'] / max(self.stats['total_models'], 1) * 100):.1f}%
 描述生成率: {(self.stats['generated_descriptions'] / max(self.stats['total_models'], 1) * 100):.1f}%"""
 
+        # 添加JSON后端信息
+        json_backend = get_json_backend()
+        report += (f"\nJSON后端: 解析 {json_backend.name}, 写入 {json_backend.dumps_backend(2, OUTPUT_FORMAT != 'json')}"
+                   f"\n输出格式: {OUTPUT_FORMAT}{'+' + OUTPUT_COMPRESSION if OUTPUT_COMPRESSION else ''}")
+
+        # 添加匹配缓存统计
+        if self.icon_matcher is not None:
+            cache_stats = self.icon_matcher.match_cache.get_stats()
+            lookups = cache_stats['hits'] + cache_stats['misses']
+            report += (f"\n匹配缓存: 命中{cache_stats['hits']}次, 未命中{cache_stats['misses']}次, "
+                       f"淘汰{cache_stats['evictions']}次, 命中率{(cache_stats['hits'] / max(lookups, 1) * 100):.1f}% "
+                       f"({cache_stats['size']}/{cache_stats['max_size']})")
+            batch_stats = self.icon_matcher.batch_stats
+            if batch_stats['batches']:
+                report += f"\n批量匹配: {batch_stats['inputs']}个模型, {batch_stats['unique']}个不同的名称/ID"
+            if self.processed_cache is not None:
+                report += (f"\n增量处理: 复用已有结果{self.stats['reused_models']}个模型, "
+                           f"重新处理{self.stats['total_models'] - self.stats['reused_models']}个模型")
+            if MODEL_FAMILY_CLUSTERING:
+                report += (f"\n模型族: {len(self.stats['model_families'])}个族, "
+                           f"{self.stats['family_contexts']}个模型复用族内厂商标签和描述模板素材")
+            strategy_seconds = sum(stats['seconds'] for stats in self.icon_matcher.strategy_stats.values())
+            for strategy_name, strategy_stats in self.icon_matcher.strategy_stats.items():
+                average_ms = strategy_stats['seconds'] / max(strategy_stats['calls'], 1) * 1000
+                latency = strategy_stats['latency']
+                report += (f"\n  {strategy_name}: 调用{strategy_stats['calls']}次, 命中{strategy_stats['matches']}次, "
+                           f"累计{strategy_stats['seconds'] * 1000:.1f}ms, 平均{average_ms:.3f}ms, "
+                           f"p50 {latency.percentile(50) * 1000:.3f}ms, p95 {latency.percentile(95) * 1000:.3f}ms, "
+                           f"p99 {latency.percentile(99) * 1000:.3f}ms, "
+                           f"占比{strategy_stats['seconds'] / max(strategy_seconds, 1e-9) * 100:.1f}%")
+            if strategy_seconds:
+                dominant = max(self.icon_matcher.strategy_stats.items(), key=lambda item: item[1]['seconds'])
+                report += (f"\n  耗时最多的策略: {dominant[0]} "
+                           f"(占匹配耗时{dominant[1]['seconds'] / strategy_seconds * 100:.1f}%)")
+
+        # 添加各阶段耗时（逐模型的阶段给出单次耗时的分位数）
+        if self.stage_timer.stages:
+            report += "\n阶段耗时:"
+            for stage, summary in self.stage_timer.summary().items():
+                report += f"\n  {stage}: {format_latency(summary)}"
+
+        # 添加流水线各阶段耗时（总耗时接近最慢的阶段说明各阶段充分重叠）
+        stages = self.stats['pipeline_stages']
+        if stages:
+            process_label = f"处理 {stages['process']:.2f}秒" + (f" ({self.jobs}个进程累计)" if self.jobs > 1 else "")
+            report += (f"\n流水线: 解析 {stages['parse']:.2f}秒, {process_label}, 写入 {stages['write']:.2f}秒, "
+                       f"总耗时 {stages.get('total', 0.0):.2f}秒")
+        
+        # 添加图标清单版本信息（后台刷新后只有受影响的模型基于新清单重新匹配）
+        for manifest_version, model_count in self.stats['manifest_versions'].items():
+            report += f"\n图标清单版本 {manifest_version or '未知'}: {model_count}个模型"
+        if self.stats['rematched_models']:
+            report += f"\n清单更新后重新匹配的模型 ({len(self.stats['rematched_models'])}个):"
+            for i, rematched in enumerate(self.stats['rematched_models'], 1):
+                report += (f"\n  {i}. {rematched['name']} (ID: {rematched['id']}): "
+                           f"{rematched['old_icon'] or '未匹配'} -> {rematched['new_icon'] or '未匹配'}")
+        
         # 添加匹配失败的模型列表
         if self.stats['failed_matches']:
             report += f"\n匹配失败的模型 ({len(self.stats['failed_matches'])}个):"
@@ -185,43 +939,55 @@ class ModelProcessor:
         else:
             report += "\n所有模型都成功匹配到图标！"
 
+        # 添加性能分析结果
+        if self.profiler is not None:
+            report += self.profiler.format_report(PROFILE_TOP_N)
+
         report += "\n========================\n"
         return report
     
+    def timing_data(self) -> Dict[str, Any]:
+        """报告中的耗时数据（秒），供save_timings写入JSON"""
+        strategies = {}
+        if self.icon_matcher is not None:
+            for strategy_name, strategy_stats in self.icon_matcher.strategy_stats.items():
+                strategies[strategy_name] = dict(strategy_stats['latency'].summary(), matches=strategy_stats['matches'])
+        
+        return {
+            'elapsed_seconds': time.time() - self.stats['start_time'],
+            'total_models': self.stats['total_models'],
+            'jobs': self.jobs,
+            'pipeline': self.pipeline,
+            'stages': self.stage_timer.summary(),
+            'strategies': strategies,
+        }
+    
+    def save_timings(self, file_path: str) -> bool:
+        """将耗时数据保存为JSON（相对路径基于base_path）"""
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = self.base_path / path
+        return self.file_handler.save_json(self.timing_data(), str(path))
+    
     def run(self) -> bool:
         """运行主处理流程"""
         try:
             logger.info("开始模型数据处理...")
             
-            # 初始化
-            if not self.initialize():
-                return False
-            
-            # 查找输入文件
-            input_file = self.find_input_file()
-            if not input_file:
-                return False
-            
-            logger.info(f"使用输入文件: {input_file}")
-            
-            # 加载数据
-            models_data = self.file_handler.load_json(input_file)
-            if not models_data:
-                logger.error("加载模型数据失败")
-                return False
-            
-            # 处理数据
-            processed_data = self.process_models(models_data)
-            
-            # 保存结果
-            output_file = str(self.base_path / "models-export-mod.json")
-            if not self.file_handler.save_json(processed_data, output_file):
-                logger.error("保存处理结果失败")
+            # 初始化、处理和保存（开启性能分析时整体在分析器下运行，报告生成不计入）
+            if self.profiler is not None:
+                output_file = self.profiler.run(self._process_and_save)
+            else:
+                output_file = self._process_and_save()
+            if not output_file:
                 return False
             
-            # 生成报告
+            # 生成报告（先汇总被采样省略的热点日志）
+            log_sample_summary()
             report = self.generate_report()
             logger.info(report)
+            if self.timings_file:
+                self.save_timings(self.timings_file)
             
             logger.info(f"处理完成，结果已保存到: {output_file}")
             return True
@@ -229,12 +995,120 @@ class ModelProcessor:
         except Exception as e:
             logger.error(f"主流程执行时出错: {e}")
             return False
+    
+    def _process_and_save(self) -> str:
+        """
+        初始化处理器，流式处理输入文件并保存结果
+        
+        Returns:
+            输出文件路径，失败时返回空字符串
+        """
+        # 初始化
+        if not self.initialize():
+            return ""
+        
+        # 查找输入文件
+        with self.stage_timer.measure("文件发现"):
+            input_file = self.find_input_file()
+        if not input_file:
+            return ""
+        
+        logger.info(f"使用输入文件: {input_file}")
+        
+        # 流式加载数据（逐个解析模型，不在内存中保留整个输入数组）
+        models_data = self.file_handler.iter_models(input_file)
+        models_data = self.stage_timer.iter_timed("JSON加载", models_data)
+        first_model = next(models_data, None)
+        if first_model is None:
+            logger.error("加载模型数据失败")
+            return ""
+        
+        # 边处理边保存结果：解析、处理和写入按模型交替进行，写完后原子替换输出文件
+        output_file = str(self.base_path / output_file_name("models-export-mod", OUTPUT_FORMAT, OUTPUT_COMPRESSION))
+        models_data = itertools.chain([first_model], models_data)
+        if self.pipeline:
+            saved = self.run_pipeline(models_data, output_file)
+        else:
+            saved = self.file_handler.save_json_stream(self.process_models(models_data), output_file,
+                                                       OUTPUT_FORMAT, OUTPUT_COMPRESSION,
+                                                       on_write=lambda seconds: self.stage_timer.record("保存", seconds))
+        if not saved:
+            logger.error("保存处理结果失败")
+            return ""
+        self.icon_matcher.save_match_cache()
+        self.save_processed_cache()
+        return output_file
+
+
+# 工作进程中的处理器（进程池初始化时创建一次，之后处理的所有分块共用）
+_worker_processor = None  # type: Optional[ModelProcessor]
+
+
+def _init_worker(base_path: str, icon_library: IconLibrary, icon_matcher: IconMatcher):
+    """进程池初始化：设置工作进程的日志，创建工作进程的处理器，图标匹配器、标签和描述生成器只初始化一次"""
+    global _worker_processor
+    configure_worker_logging()
+    _worker_processor = ModelProcessor(base_path, jobs=1)
+    _worker_processor.icon_library = icon_library
+    _worker_processor.icon_matcher = icon_matcher
+    icon_matcher.take_stats()  # 从主进程复制来的统计已计入主进程
+    take_sample_counts()
+
+
+def _process_chunk(chunk: List[Dict[str, Any]], fingerprints: List[str],
+                   cached_entries: List[Optional[Dict[str, Any]]],
+                   start: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, Dict[str, Any]], Dict[str, Any], float]:
+    """
+    工作进程：处理一个分块
+    
+    Args:
+        chunk: 模型数据列表
+        fingerprints: 模型内容指纹
+        cached_entries: 上一次的处理结果
+        start: 分块中第一个模型的序号（用于进度日志）
+        
+    Returns:
+        (处理结果, 本分块的统计, 新的增量缓存条目, 匹配器统计, 处理耗时)
+    """
+    started = time.perf_counter()
+    processor = _worker_processor
+    processor.stats.update({
+        'total_models': start,
+        'matched_icons': 0,
+        'updated_tags': 0,
+        'generated_descriptions': 0,
+        'errors': 0,
+        'failed_matches': [],
+        'manifest_versions': {},
+        'reused_models': 0,
+        'model_families': {},
+        'family_contexts': 0
+    })
+    processor.processed_cache = ProcessedModelCache()
+    processed_models, _ = processor.process_batch(chunk, fingerprints, cached_entries)
+    processor.stats['log_samples'] = take_sample_counts()  # 热点日志的采样计数交给主进程汇总
+    processor.stats['stage_timings'] = processor.stage_timer.take()
+    return (processed_models, processor.stats, processor.processed_cache.entries,
+            processor.icon_matcher.take_stats(), time.perf_counter() - started)
 
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="模型数据处理程序")
+    parser.add_argument('--jobs', type=int, default=PROCESS_JOBS,
+                        help="处理模型的工作进程数（0表示使用全部CPU核心，默认: %(default)s）")
+    parser.add_argument('--pipeline', action='store_true', default=PIPELINE_MODE,
+                        help="解析、处理和写入以流水线方式并发执行")
+    parser.add_argument('--timings-json', default=TIMINGS_JSON_FILE, metavar='FILE',
+                        help="将各阶段耗时和分位数另存为JSON文件（相对路径基于项目根目录）")
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                        help="在性能分析下运行，保存.pstats和折叠栈文件（默认目录: %(const)s，相对路径基于项目根目录）")
+    args = parser.parse_args()
+    
     try:
-        processor = ModelProcessor()
+        processor = ModelProcessor(jobs=args.jobs, pipeline=args.pipeline, timings_file=args.timings_json)
+        if args.profile:
+            processor.profiler = RunProfiler(processor.base_path / args.profile, PROFILE_SAMPLE_INTERVAL)
         success = processor.run()
         
         if success:
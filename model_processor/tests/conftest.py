@@ -0,0 +1,183 @@
+"""
+测试公共设置：把model_processor加入导入路径，并提供本地git仓库和小型项目目录所需的环境
+"""
+
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# 与main.py一样以model_processor为根导入config和utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main  # noqa: E402
+from main import ModelProcessor  # noqa: E402
+
+
+def run_git(args, cwd) -> str:
+    """执行git命令，失败时抛出异常，返回去掉首尾空白的标准输出"""
+    result = subprocess.run(["git"] + list(args), cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def git_env(monkeypatch):
+    """固定提交者信息，并允许子模块使用file://协议（git 2.38起默认禁止）"""
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "test")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "test@example.com")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "test")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "test@example.com")
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    monkeypatch.setenv("GIT_CONFIG_COUNT", "2")
+    monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.file.allow")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_0", "always")
+    monkeypatch.setenv("GIT_CONFIG_KEY_1", "init.defaultBranch")
+    monkeypatch.setenv("GIT_CONFIG_VALUE_1", "main")
+
+
+# lobe-icons中默认变体的图标目录
+ICON_DIR = "packages/static-png/light"
+
+
+@pytest.fixture
+def lobe_remote(tmp_path, git_env):
+    """
+    构造lobe-icons裸仓库（两个提交）和记录第一个提交为gitlink的主仓库
+
+    Returns:
+        (主仓库路径, 裸仓库file:// url, 第一个提交, 第二个提交)
+    """
+    source = tmp_path / "source"
+    (source / ICON_DIR).mkdir(parents=True)
+    (source / "packages" / "other").mkdir()
+    run_git(["init", "-q"], source)
+    (source / ICON_DIR / "openai.png").write_bytes(b"openai")
+    (source / ICON_DIR / "claude.png").write_bytes(b"claude")
+    (source / "packages" / "other" / "README.md").write_text("other package\n")
+    run_git(["add", "."], source)
+    run_git(["commit", "-q", "-m", "first"], source)
+    first = run_git(["rev-parse", "HEAD"], source)
+    (source / ICON_DIR / "gemini.png").write_bytes(b"gemini")
+    run_git(["add", "."], source)
+    run_git(["commit", "-q", "-m", "second"], source)
+    second = run_git(["rev-parse", "HEAD"], source)
+
+    bare = tmp_path / "lobe-icons.git"
+    run_git(["clone", "-q", "--bare", str(source), str(bare)], tmp_path)
+    # 允许部分克隆和按提交获取（见sparse_update_submodule的说明）
+    run_git(["config", "uploadpack.allowFilter", "true"], bare)
+    run_git(["config", "uploadpack.allowAnySHA1InWant", "true"], bare)
+    url = bare.as_uri()
+
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    run_git(["init", "-q"], repo)
+    (repo / ".gitmodules").write_text(f'[submodule "lobe-icons"]\n\tpath = lobe-icons\n\turl = {url}\n')
+    run_git(["add", ".gitmodules"], repo)
+    run_git(["update-index", "--add", "--cacheinfo", f"160000,{first},lobe-icons"], repo)
+    run_git(["commit", "-q", "-m", "add lobe-icons"], repo)
+    return repo, url, first, second
+
+
+# 图标目录中的图标（light目录为匹配用的默认变体）
+ICON_NAMES = [
+    "openai", "claude", "claude-color", "anthropic", "gemini", "gemini-color", "google", "deepseek",
+    "deepseek-color", "qwen", "qwen-color", "meta", "mistral", "zhipu", "chatglm", "moonshot", "doubao",
+]
+
+# 小型导出文件：覆盖精确匹配、关键词匹配、同族模型、已有标签和描述以及无法匹配的模型
+MODELS = [
+    {"id": "gpt-4o", "name": "GPT-4o", "object": "model", "meta": {"description": "", "tags": []}},
+    {"id": "gpt-4o-mini", "name": "GPT-4o mini", "object": "model", "meta": {"description": "", "tags": []}},
+    {"id": "o1-preview", "name": "o1-preview", "object": "model", "meta": {}},
+    {"id": "claude-3-5-sonnet-20241022", "name": "Claude 3.5 Sonnet", "object": "model",
+     "meta": {"profile_image_url": "/static/favicon.png", "description": "", "tags": [{"name": "推荐"}]}},
+    {"id": "claude-3-haiku", "name": "claude-3-haiku", "object": "model",
+     "meta": {"description": "已有的描述", "tags": [{"name": "快速"}]}},
+    {"id": "gemini-1.5-pro", "name": "gemini-1.5-pro", "object": "model", "meta": {"tags": []}},
+    {"id": "gemini-2.0-flash-exp", "name": "gemini-2.0-flash-exp", "object": "model", "meta": {}},
+    {"id": "deepseek-chat", "name": "DeepSeek Chat", "object": "model", "meta": {"description": ""}},
+    {"id": "deepseek-r1", "name": "deepseek-r1", "object": "model", "meta": {}},
+    {"id": "qwen2.5-72b-instruct", "name": "qwen2.5-72b-instruct", "object": "model",
+     "params": {"system": "你是一个乐于助人的助手。\n请用中文回答。"}, "meta": {}},
+    {"id": "qwen2.5-coder-32b", "name": "Qwen2.5 Coder 32B", "object": "model", "meta": {}},
+    {"id": "llama-3.1-70b-instruct", "name": "Llama 3.1 70B", "object": "model", "meta": {}},
+    {"id": "mistral-large-latest", "name": "mistral-large-latest", "object": "model", "meta": {}},
+    {"id": "glm-4-plus", "name": "GLM-4-Plus", "object": "model", "meta": {}},
+    {"id": "moonshot-v1-8k", "name": "moonshot-v1-8k", "object": "model", "meta": {}},
+    {"id": "doubao-pro-32k", "name": "豆包 Pro 32k", "object": "model", "meta": {}},
+    {"id": "text-embedding-3-large", "name": "text-embedding-3-large", "object": "model", "meta": {}},
+    {"id": "my-private-model", "name": "my-private-model", "object": "model", "meta": {},
+     "access_control": None, "is_active": True},
+]
+
+
+def make_project(base: Path) -> Path:
+    """在base下创建图标目录和导出文件（无.git，子模块检查只验证目录结构）"""
+    icons = base / "lobe-icons" / "packages" / "static-png" / "light"
+    icons.mkdir(parents=True)
+    for name in ICON_NAMES:
+        (icons / f"{name}.png").write_bytes(b"png")
+    (base / "models-export-1.json").write_text(json.dumps(MODELS, ensure_ascii=False, indent=2), encoding='utf-8')
+    return base
+
+
+def sorted_tags(models):
+    """标签按名称排序（标签生成遍历集合，顺序随字符串哈希种子变化，重新启动的进程中顺序可能不同）"""
+    for model in models:
+        tags = model.get("meta", {}).get("tags")
+        if isinstance(tags, list):
+            model["meta"]["tags"] = sorted(tags, key=lambda tag: tag["name"])
+    return models
+
+
+def run_processor(base: Path, **kwargs) -> ModelProcessor:
+    """运行一次完整处理并返回处理器"""
+    processor = ModelProcessor(str(base), **kwargs)
+    assert processor.run()
+    return processor
+
+
+def delay_refresh(monkeypatch):
+    """让后台刷新在开始应用刷新结果时才完成，使已处理的模型都基于缓存的清单匹配"""
+    refresh_started = threading.Event()
+    refresh_icon_manifest = ModelProcessor._refresh_icon_manifest
+    apply_manifest_refresh = ModelProcessor.apply_manifest_refresh
+
+    def delayed_refresh(self):
+        refresh_started.wait(10)
+        refresh_icon_manifest(self)
+
+    def start_refresh(self, *args):
+        refresh_started.set()
+        apply_manifest_refresh(self, *args)
+
+    monkeypatch.setattr(ModelProcessor, "_refresh_icon_manifest", delayed_refresh)
+    monkeypatch.setattr(ModelProcessor, "apply_manifest_refresh", start_refresh)
+
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    """小批次和小分块，使少量模型也会分成多批、多个分块处理"""
+    monkeypatch.setattr(main, "PROCESS_BATCH_SIZE", 4)
+    monkeypatch.setattr(main, "PARALLEL_CHUNK_SIZE", 5)
+    monkeypatch.setattr(main, "OUTPUT_FORMAT", "json")
+    monkeypatch.setattr(main, "OUTPUT_COMPRESSION", None)
+
+
+@pytest.fixture
+def serial_models(tmp_path, monkeypatch, small_batches):
+    """单进程、非流水线、不使用增量缓存时的处理结果"""
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    base = make_project(tmp_path / "serial")
+    run_processor(base, jobs=1, pipeline=False)
+    return json.loads((base / "models-export-mod.json").read_text(encoding='utf-8'))
+
+
+@pytest.fixture
+def project(tmp_path, small_batches):
+    """小批次设置下的项目目录"""
+    return make_project(tmp_path / "project")
@@ -0,0 +1,58 @@
+"""
+后台刷新子模块测试：先用缓存的图标清单处理，清单变化后只重新匹配受影响的模型
+"""
+
+import json
+
+import pytest
+
+import main
+from conftest import MODELS, delay_refresh, make_project, run_processor
+
+
+@pytest.mark.parametrize("pending_max", [3, 5000])
+def test_changed_manifest_rematches_affected_models(project, tmp_path, monkeypatch, pending_max):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    monkeypatch.setattr(main, "BACKGROUND_SUBMODULE_REFRESH", True)
+    monkeypatch.setattr(main, "REFRESH_PENDING_MAX_MODELS", pending_max)
+    run_processor(project)
+
+    # 新增图标后：用缓存清单开始处理，刷新后重新匹配受影响的模型，结果与直接使用新清单处理一致
+    for base in (project, make_project(tmp_path / "fresh")):
+        (base / "lobe-icons" / "packages" / "static-png" / "light" / "mistral-color.png").write_bytes(b"png")
+    fresh = run_processor(tmp_path / "fresh")
+    delay_refresh(monkeypatch)
+    warm = run_processor(project)
+
+    output = json.loads((project / "models-export-mod.json").read_text(encoding='utf-8'))
+    assert output == json.loads((tmp_path / "fresh" / "models-export-mod.json").read_text(encoding='utf-8'))
+    assert warm.stats['matched_icons'] == fresh.stats['matched_icons']
+    versions = warm.stats['manifest_versions']
+    assert sum(versions.values()) == len(MODELS)
+    rematched = warm.stats['rematched_models']
+    if pending_max < len(MODELS):
+        # 暂存满后等待刷新完成，只有第一批基于缓存的清单匹配，之后的批次直接使用新清单
+        assert len(rematched) <= main.PROCESS_BATCH_SIZE
+        return
+    assert 0 < len(rematched) < len(MODELS)
+    assert {"name": "mistral-large-latest", "id": "mistral-large-latest",
+            "old_icon": "mistral", "new_icon": "mistral-color"} in rematched
+    # 报告中重新匹配的模型计入新清单版本，其余模型仍计入缓存的清单版本
+    assert versions[warm.icon_matcher.index.snapshot_key] == len(rematched)
+
+
+def test_unchanged_manifest_keeps_source_version(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", True)
+    monkeypatch.setattr(main, "BACKGROUND_SUBMODULE_REFRESH", True)
+    monkeypatch.setattr(main, "EXTRA_ICON_URL_FIELDS", {"png-dark": "profile_image_url_dark"})
+    monkeypatch.setattr(main.GitHandler, "get_submodule_commit", lambda self: "abc123")
+    dark = project / "lobe-icons" / "packages" / "static-png" / "dark"
+    dark.mkdir()
+    (dark / "openai.png").write_bytes(b"png")
+    run_processor(project)
+
+    # 使用缓存清单开始处理、后台刷新后清单没有变化：其他变体的快照键仍带子模块提交，上一次的结果全部复用
+    warm = run_processor(project)
+    assert warm.icon_library.source_version == "abc123"
+    assert warm.icon_library.get_index("png-dark").snapshot_key.startswith("abc123:")
+    assert warm.stats['reused_models'] == len(MODELS)
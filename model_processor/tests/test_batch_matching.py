@@ -0,0 +1,65 @@
+"""
+批量匹配测试：结果顺序与输入一致，重复的名称/ID只解析一次，结果与逐个调用match_icon相同
+"""
+
+import pytest
+
+from conftest import ICON_NAMES, MODELS
+from utils.icon_matcher import IconMatcher
+from utils.model_features import build_model_features
+
+# 含大小写不同的重复项和无法匹配的模型
+PAIRS = [(model["name"], model["id"]) for model in MODELS] + [
+    (MODELS[0]["name"].upper(), MODELS[0]["id"]),
+    ("my-private-model", "my-private-model"),
+    (MODELS[1]["name"], MODELS[1]["id"]),
+    ("my-private-model", "my-private-model"),
+]
+
+
+@pytest.fixture
+def icons(tmp_path):
+    icons = tmp_path / "light"
+    icons.mkdir()
+    for name in ICON_NAMES:
+        (icons / f"{name}.png").write_bytes(b"png")
+    return icons
+
+
+def make_matcher(icons, fuzzy_mode):
+    matcher = IconMatcher(icons)
+    matcher.fuzzy_mode = fuzzy_mode
+    return matcher
+
+
+@pytest.mark.parametrize("fuzzy_mode", ["containment", "similarity"])
+def test_batch_equals_single_matches(icons, fuzzy_mode):
+    expected = [make_matcher(icons, fuzzy_mode).match_icon(name, model_id) for name, model_id in PAIRS]
+
+    assert make_matcher(icons, fuzzy_mode).match_icons(PAIRS) == expected
+
+
+def test_duplicates_resolved_once(icons):
+    matcher = make_matcher(icons, "containment")
+    results = matcher.match_icons(PAIRS)
+
+    unique = len({(name.lower(), model_id.lower()) for name, model_id in PAIRS})
+    assert unique < len(PAIRS)
+    assert matcher.batch_stats == {'batches': 1, 'inputs': len(PAIRS), 'unique': unique}
+    # 每个不同的名称/ID只经过一次匹配缓存查询
+    assert matcher.match_cache.hits + matcher.match_cache.misses == unique
+    assert results[len(MODELS)] is results[0]
+
+
+def test_results_written_back_to_features(icons):
+    matcher = make_matcher(icons, "containment")
+    features_list = [build_model_features(name, model_id) for name, model_id in PAIRS]
+    results = matcher.match_icons(PAIRS, features_list)
+
+    assert [features.match_result for features in features_list] == results
+
+
+def test_empty_batch(icons):
+    matcher = make_matcher(icons, "containment")
+    assert matcher.match_icons([]) == []
+    assert matcher.batch_stats == {'batches': 1, 'inputs': 0, 'unique': 0}
@@ -0,0 +1,88 @@
+"""
+BK树测试：查询结果与逐个计算编辑距离一致，并且查询时剪枝
+"""
+
+import random
+import string
+
+import pytest
+
+from utils.bk_tree import BKTree, levenshtein
+from utils.icon_matcher import IconMatcher
+
+WORDS = [
+    "openai", "claude", "anthropic", "gemini", "google", "deepseek", "qwen", "meta", "mistral", "zhipu",
+    "chatglm", "moonshot", "doubao", "hunyuan", "baichuan", "minimax", "yi", "stepfun", "spark", "wenxin",
+]
+
+
+def brute_force(words, word, max_distance):
+    """逐个计算编辑距离的查询结果"""
+    return sorted((levenshtein(word, candidate), candidate) for candidate in set(words)
+                  if levenshtein(word, candidate) <= max_distance)
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("", "", 0), ("", "qwen", 4), ("mistal", "mistral", 1), ("deepsek", "deepseek", 1),
+    ("hunyun", "hunyuan", 1), ("kitten", "sitting", 3), ("gemini", "google", 5),
+])
+def test_levenshtein(a, b, distance):
+    assert levenshtein(a, b) == distance
+    assert levenshtein(b, a) == distance
+
+
+@pytest.mark.parametrize("word", ["mistal", "deepsek", "hunyun", "gemeni", "qwen", "x", "chatgml"])
+@pytest.mark.parametrize("max_distance", [0, 1, 2, 3])
+def test_search_matches_brute_force(word, max_distance):
+    tree = BKTree(WORDS)
+    assert tree.search(word, max_distance) == brute_force(WORDS, word, max_distance)
+
+
+def test_search_distance_boundary():
+    tree = BKTree(WORDS)
+    # deepseek与查询词的距离恰好为2：k=2时包含，k=1时不包含
+    assert levenshtein("deepsk", "deepseek") == 2
+    assert (2, "deepseek") in tree.search("deepsk", 2)
+    assert all(word != "deepseek" for _, word in tree.search("deepsk", 1))
+    assert tree.search("deepseek", 0) == [(0, "deepseek")]
+
+
+def test_duplicates_ignored():
+    tree = BKTree(["qwen", "qwen", "meta"])
+    assert tree.size == 2
+    assert tree.search("qwen", 0) == [(0, "qwen")]
+
+
+def test_search_prunes_subtrees():
+    generator = random.Random(0)
+    words = sorted({"".join(generator.choice(string.ascii_lowercase) for _ in range(generator.randint(4, 10)))
+                    for _ in range(2000)})
+    tree = BKTree(words)
+
+    for word in ("mistal", "deepsek", "hunyun"):
+        tree.nodes_visited = 0
+        assert tree.search(word, 1) == brute_force(words, word, 1)
+        # 三角不等式剪枝后只访问一小部分节点，逐个比较需要访问全部节点
+        assert tree.nodes_visited < tree.size // 2
+
+
+def make_matcher(tmp_path, monkeypatch, enabled):
+    """在只有几个图标的目录上创建匹配器，按enabled开启或关闭编辑距离匹配"""
+    monkeypatch.setattr("utils.icon_matcher.ENABLE_EDIT_DISTANCE_MATCH", enabled)
+    for name in ("deepseek", "deepseek-color", "hunyuan-color", "mistral", "openai"):
+        (tmp_path / f"{name}.png").write_bytes(b"png")
+    return IconMatcher(tmp_path)
+
+
+@pytest.mark.parametrize("model_name, icon_name", [
+    ("deepsek-v3", "deepseek-color"), ("hunyun-lite", "hunyuan-color"), ("mistal-large", "mistral"),
+])
+def test_edit_distance_match(tmp_path, monkeypatch, model_name, icon_name):
+    result = make_matcher(tmp_path, monkeypatch, True).match_icon(model_name, model_name)
+    assert (result.icon_name, result.match_type) == (icon_name, "edit_distance")
+
+
+def test_edit_distance_match_disabled(tmp_path, monkeypatch):
+    # 关闭后拼写有差异的模型不再匹配（默认开启时输出与关闭时不同）
+    result = make_matcher(tmp_path, monkeypatch, False).match_icon("deepsek-v3", "deepsek-v3")
+    assert not result.matched
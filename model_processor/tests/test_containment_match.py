@@ -0,0 +1,82 @@
+"""
+子串包含查询测试：n-gram索引和自动机的结果与逐个遍历all_icons的子串判断一致（包括多个命中时选哪一个）
+"""
+
+import random
+
+import pytest
+
+from conftest import ICON_NAMES, MODELS
+from utils.icon_matcher import IconIndex, IconMatcher
+from utils.model_features import normalize_name
+
+# 在公共图标集上加入互相包含、很短和共享n-gram的名称
+EXTRA_ICONS = ["q", "ai", "wen", "qwenvl", "yuan", "hunyuan", "hunyuan-color", "open", "penai", "gemma", "ge"]
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    icons = tmp_path_factory.mktemp("light")
+    for name in ICON_NAMES + EXTRA_ICONS:
+        (icons / f"{name}.png").write_bytes(b"png")
+    return IconIndex(icons)
+
+
+def candidates(index):
+    """查询串：图标名称的所有子串、模型名称/ID的标准化形式和随机串"""
+    result = {name[start:end] for name in index.all_icons
+              for start in range(len(name)) for end in range(start + 1, len(name) + 1)}
+    for model in MODELS:
+        result.update((normalize_name(model["name"]), normalize_name(model["id"])))
+    generator = random.Random(0)
+    result.update("".join(generator.choice("aeinoquwy-") for _ in range(generator.randint(1, 12)))
+                  for _ in range(500))
+    result.discard("")
+    return sorted(result)
+
+
+def brute_force_matches(index, candidate):
+    return {name for name in index.all_icons if candidate in name or name in candidate}
+
+
+def brute_force_first(index, candidate):
+    """原有实现：按all_icons的迭代顺序返回第一个满足包含关系的图标"""
+    return next((name for name in index.all_icons if candidate in name or name in candidate), None)
+
+
+def test_find_containment_matches(index):
+    for candidate in candidates(index):
+        assert index.find_containment_matches(candidate) == brute_force_matches(index, candidate), candidate
+
+
+def test_first_containment_match_keeps_tie_order(index):
+    ties = 0
+    for candidate in candidates(index):
+        assert index.first_containment_match(candidate) == brute_force_first(index, candidate), candidate
+        ties += len(brute_force_matches(index, candidate)) > 1
+    # 大部分查询串有多个命中，结果取决于迭代顺序
+    assert ties > 100
+
+
+def test_first_containment_match_after_snapshot_load(index, tmp_path):
+    cache_file = tmp_path / "icon_index.json"
+    IconIndex(index.icons_path, cache_file, source_version="abc")
+    loaded = IconIndex(index.icons_path, cache_file, source_version="abc")
+    assert loaded.loaded_from_cache
+
+    # 从快照重建的索引按自身all_icons的迭代顺序选择
+    for candidate in candidates(loaded):
+        assert loaded.first_containment_match(candidate) == brute_force_first(loaded, candidate), candidate
+
+
+def test_fuzzy_match_matches_linear_scan(index):
+    matcher = IconMatcher(index.icons_path, index=index)
+    for model in MODELS + [{"name": "Hunyuan-Lite", "id": "tencent/hunyuan-lite"}, {"name": "", "id": "pen"}]:
+        expected = None
+        for candidate in (normalize_name(model["name"]), normalize_name(model["id"])):
+            icon_name = brute_force_first(index, candidate) if candidate else None
+            if icon_name:
+                expected = index.find_best_match(icon_name)
+                break
+        result = matcher.fuzzy_match(model["name"], model["id"])
+        assert (result.icon_name if result else None) == expected, model["id"]
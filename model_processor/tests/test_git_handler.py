@@ -0,0 +1,109 @@
+"""
+GitHandler子模块获取测试：用本地裸仓库代替lobe-icons远程仓库
+"""
+
+from pathlib import Path
+
+import pytest
+
+from conftest import ICON_DIR, run_git
+from utils.git_handler import GitHandler
+
+
+def missing_objects(path: Path) -> int:
+    """HEAD可达但本地没有的对象数（blob:none部分克隆时未检出的文件）"""
+    output = run_git(["rev-list", "--objects", "--missing=print", "HEAD"], path)
+    return sum(1 for line in output.splitlines() if line.startswith("?"))
+
+
+def test_full_fetch_mode(lobe_remote):
+    repo, _, first, _ = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='full')
+
+    success, message = handler.update_submodule()
+
+    assert success, message
+    icons = handler.lobe_icons_path
+    assert handler.get_submodule_commit() == first
+    assert handler.is_submodule_up_to_date() is True
+    assert (icons / "packages" / "other" / "README.md").exists()
+    assert run_git(["rev-parse", "--is-shallow-repository"], icons) == "false"
+    assert missing_objects(icons) == 0
+    assert handler.get_lobe_icons_path() == icons / ICON_DIR
+
+
+def test_sparse_fetch_mode(lobe_remote):
+    repo, _, first, _ = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='sparse')
+
+    success, message = handler.update_submodule()
+
+    assert success, message
+    icons = handler.lobe_icons_path
+    # 检出主仓库记录的提交（不是远程默认分支的最新提交）
+    assert handler.get_submodule_commit() == first
+    assert handler.is_submodule_up_to_date() is True
+    # 稀疏检出：只有图标目录
+    assert sorted(p.name for p in (icons / ICON_DIR).iterdir()) == ["claude.png", "openai.png"]
+    assert not (icons / "packages" / "other").exists()
+    # 浅克隆：只有一个提交
+    assert run_git(["rev-parse", "--is-shallow-repository"], icons) == "true"
+    assert run_git(["rev-list", "--count", "HEAD"], icons) == "1"
+    # blob:none：稀疏目录之外的文件内容没有下载
+    assert run_git(["config", "remote.origin.partialclonefilter"], icons) == "blob:none"
+    assert missing_objects(icons) == 1
+    assert handler.get_lobe_icons_path() == icons / ICON_DIR
+
+
+def test_sparse_fetch_with_git_manifest(lobe_remote):
+    repo, _, first, _ = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='sparse', manifest_source='git')
+
+    success, message = handler.update_submodule()
+
+    assert success, message
+    icons = handler.lobe_icons_path
+    # 只移动HEAD，不检出工作区，图标清单从树对象读取
+    assert handler.get_submodule_commit() == first
+    assert not (icons / "packages").exists()
+    assert handler.validate_lobe_icons()
+    assert sorted(handler.get_manifest(ICON_DIR).file_names()) == ["claude.png", "openai.png"]
+
+
+def test_sparse_fetch_falls_back_to_default_branch(lobe_remote):
+    repo, url, _, second = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='sparse')
+
+    # 远程不存在的提交无法按提交获取，改为获取默认分支
+    success, message = handler.sparse_update_submodule(url=url, commit="0123456789" * 4)
+
+    assert success, message
+    icons = handler.lobe_icons_path
+    assert handler.get_submodule_commit() == second
+    assert run_git(["rev-parse", "--is-shallow-repository"], icons) == "true"
+    assert sorted(p.name for p in (icons / ICON_DIR).iterdir()) == ["claude.png", "gemini.png", "openai.png"]
+    # 与记录的gitlink不一致
+    assert handler.is_submodule_up_to_date() is False
+
+
+def test_sparse_fetch_reports_unreachable_remote(lobe_remote, tmp_path):
+    repo, _, _, _ = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='sparse')
+
+    success, _ = handler.sparse_update_submodule(url=(tmp_path / "missing.git").as_uri())
+
+    assert not success
+
+
+@pytest.mark.parametrize("sync_recorded", [False, True])
+def test_ensure_ready_with_checkout_ahead_of_gitlink(lobe_remote, sync_recorded):
+    repo, _, first, second = lobe_remote
+    GitHandler(str(repo), fetch_mode='full').update_submodule()
+    run_git(["checkout", "-q", second], repo / "lobe-icons")
+    handler = GitHandler(str(repo), fetch_mode='full', sync_recorded=sync_recorded)
+    assert handler.is_submodule_up_to_date() is False
+
+    assert handler.ensure_submodule_ready()
+
+    # 默认保留当前检出，只有开启同步时才更新到主仓库记录的提交
+    assert handler.get_submodule_commit() == (first if sync_recorded else second)
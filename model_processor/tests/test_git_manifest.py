@@ -0,0 +1,97 @@
+"""
+git树清单测试：从树对象读取的图标列表与检出的目录一致，索引快照按树对象哈希复用
+"""
+
+import os
+
+import pytest
+
+from conftest import ICON_DIR, run_git
+from utils.git_handler import GitHandler
+from utils.icon_matcher import IconIndex, IconLibrary
+
+
+@pytest.fixture
+def checkout(lobe_remote):
+    """完整检出记录的提交，返回(GitHandler, 第二个提交)"""
+    repo, _, _, second = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='full', manifest_source='git')
+    success, message = handler.update_submodule()
+    assert success, message
+    return handler, second
+
+
+def record_git_calls(handler, monkeypatch):
+    """记录GitHandler启动的git命令"""
+    calls = []
+    run_git_command = handler._run_git
+
+    def recording_run_git(args, cwd, timeout=300):
+        calls.append(args)
+        return run_git_command(args, cwd, timeout)
+
+    monkeypatch.setattr(handler, "_run_git", recording_run_git)
+    return calls
+
+
+@pytest.mark.parametrize("rel_path", [ICON_DIR, "packages/other", "packages/static-png/light/"])
+def test_tree_listing_matches_checkout(checkout, rel_path):
+    handler, _ = checkout
+    manifest = handler.get_manifest(rel_path)
+
+    assert sorted(manifest.file_names()) == sorted(os.listdir(handler.lobe_icons_path / rel_path))
+    assert manifest.tree_hash() == run_git(["rev-parse", f"HEAD:{rel_path.rstrip('/')}"], handler.lobe_icons_path)
+
+
+def test_missing_directory(checkout):
+    handler, _ = checkout
+    manifest = handler.get_manifest("packages/static-png/dark")
+
+    assert manifest.tree_hash() == ""
+    assert manifest.file_names() == []
+    assert not IconIndex(handler.lobe_icons_path / "packages/static-png/dark", manifest=manifest).all_icons
+
+
+def test_index_from_manifest_matches_filesystem(checkout):
+    handler, _ = checkout
+    icons_path = handler.lobe_icons_path / ICON_DIR
+    from_git = IconIndex(icons_path, manifest=handler.get_manifest(ICON_DIR))
+    from_filesystem = IconIndex(icons_path)
+
+    assert from_git.all_icons == from_filesystem.all_icons == {"openai", "claude"}
+    assert from_git.normal_icons == from_filesystem.normal_icons
+
+
+def test_snapshot_keyed_on_tree_hash(checkout, tmp_path, monkeypatch):
+    handler, second = checkout
+    icons_path = handler.lobe_icons_path / ICON_DIR
+    cache_file = tmp_path / "icon_index.json"
+    first_tree = handler.get_manifest(ICON_DIR).tree_hash()
+    IconIndex(icons_path, cache_file, manifest=handler.get_manifest(ICON_DIR))
+
+    # 树对象未变：只解析一次树哈希，不再列出目录
+    handler = GitHandler(str(handler.repo_path), manifest_source='git')
+    calls = record_git_calls(handler, monkeypatch)
+    cached = IconIndex(icons_path, cache_file, manifest=handler.get_manifest(ICON_DIR))
+    assert cached.loaded_from_cache
+    assert cached.snapshot_key == f"tree:{first_tree}"
+    assert [args[:2] for args in calls] == [["ls-tree", "HEAD"]]
+
+    # 子模块移动到新提交后树哈希变化，重新读取清单
+    run_git(["checkout", "-q", second], handler.lobe_icons_path)
+    handler = GitHandler(str(handler.repo_path), manifest_source='git')
+    changed = IconIndex(icons_path, cache_file, manifest=handler.get_manifest(ICON_DIR))
+    assert not changed.loaded_from_cache
+    assert changed.snapshot_key != cached.snapshot_key
+    assert changed.all_icons == {"openai", "claude", "gemini"}
+
+
+def test_library_uses_manifest_without_worktree(lobe_remote):
+    repo, _, _, _ = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='sparse', manifest_source='git')
+    success, message = handler.update_submodule()
+    assert success, message
+    assert not (handler.lobe_icons_path / ICON_DIR).exists()
+
+    library = IconLibrary(repo, git_handler=handler)
+    assert library.get_index().all_icons == {"openai", "claude"}
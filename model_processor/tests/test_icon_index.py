@@ -0,0 +1,79 @@
+"""
+图标索引快照测试
+"""
+
+import json
+
+from utils.icon_matcher import IconIndex
+
+ICON_NAMES = ["openai", "claude", "claude-color", "gemini-color", "deepseek", "qwen", "qwen-color"]
+
+
+def test_snapshot_rebuilds_indexes(tmp_path):
+    icons = tmp_path / "light"
+    icons.mkdir()
+    for name in ICON_NAMES:
+        (icons / f"{name}.png").write_bytes(b"png")
+    (icons / "README.md").write_text("not an icon\n")
+    cache_file = tmp_path / "icon_index.json"
+
+    built = IconIndex(icons, cache_file, source_version="abc")
+    loaded = IconIndex(icons, cache_file, source_version="abc")
+
+    assert not built.loaded_from_cache
+    assert loaded.loaded_from_cache
+    # 快照只保存图标名称
+    snapshot = json.loads(cache_file.read_text(encoding='utf-8'))
+    assert snapshot['all_icons'] == sorted(ICON_NAMES)
+    assert not {'color_icons', 'normal_icons', 'ngram_index', 'icon_automaton'} & set(snapshot)
+    # 加载后重新建立的索引与扫描目录建立的一致
+    assert loaded.all_icons == built.all_icons
+    assert loaded.color_icons == built.color_icons
+    assert loaded.normal_icons == built.normal_icons
+    assert loaded.ngram_index == built.ngram_index
+    assert loaded.icon_automaton.keywords == built.icon_automaton.keywords
+    assert loaded.find_containment_matches("qwen2.5-72b") == built.find_containment_matches("qwen2.5-72b")
+    assert loaded.find_best_match("claude") == built.find_best_match("claude")
+
+
+def test_snapshot_key_change_rescans(tmp_path):
+    icons = tmp_path / "light"
+    icons.mkdir()
+    (icons / "openai.png").write_bytes(b"png")
+    cache_file = tmp_path / "icon_index.json"
+    IconIndex(icons, cache_file, source_version="abc")
+
+    # 子模块提交变化：快照失效，重新扫描目录
+    index = IconIndex(icons, cache_file, source_version="def")
+
+    assert not index.loaded_from_cache
+    assert index.all_icons == {"openai"}
+
+
+def test_broken_snapshot_clears_partial_index(tmp_path):
+    icons = tmp_path / "light"
+    icons.mkdir()
+    (icons / "openai.png").write_bytes(b"png")
+    cache_file = tmp_path / "icon_index.json"
+    # 图标名称可以读取，但缺少快照键：加载到最后一步才失败
+    cache_file.write_text(json.dumps({
+        'version': IconIndex.SNAPSHOT_VERSION, 'icons_path': str(icons), 'all_icons': ICON_NAMES,
+    }), encoding='utf-8')
+
+    stale = IconIndex(icons, cache_file, stale_ok=True)
+    assert not stale.loaded_from_cache
+    assert not (stale.all_icons or stale.icon_order or stale.ngram_index or stale.icon_automaton.keywords)
+    assert stale.first_containment_match("qwen2.5") is None
+
+    # 快照键有效但图标名称读到一半失败：重新扫描目录，结果中不残留快照里的图标
+    cache_file.write_text(json.dumps({
+        'version': IconIndex.SNAPSHOT_VERSION, 'key': f"abc:{icons.stat().st_mtime_ns}",
+        'icons_path': str(icons), 'all_icons': ["qwen", "claude-color", None],
+    }), encoding='utf-8')
+    index = IconIndex(icons, cache_file, source_version="abc")
+    assert not index.loaded_from_cache
+    assert index.all_icons == {"openai"}
+    assert index.color_icons == {} and index.normal_icons == {"openai": "openai"}
+    assert set(index.icon_order) == {"openai"}
+    assert index.icon_automaton.keywords == {"openai"}
+    assert index.first_containment_match("qwen2.5") is None
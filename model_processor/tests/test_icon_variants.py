@@ -0,0 +1,89 @@
+"""
+图标变体测试：各变体的索引只在首次请求时构建，按图标名称换算其他变体的URL
+"""
+
+import json
+
+import pytest
+
+import main
+from config import ICON_VARIANTS
+from conftest import ICON_NAMES, run_processor
+from utils.icon_matcher import IconLibrary
+
+# 深色主题只提供部分图标
+DARK_ICONS = ICON_NAMES[:3]
+
+
+def make_dark_icons(base):
+    icons = base / ICON_VARIANTS['png-dark']['path']
+    icons.mkdir(parents=True)
+    for name in DARK_ICONS:
+        (icons / f"{name}.png").write_bytes(b"png")
+
+
+@pytest.fixture
+def library(project):
+    make_dark_icons(project)
+    return IconLibrary(project)
+
+
+def test_only_requested_variants_built(library):
+    assert library.loaded_variants() == []
+
+    index = library.get_index()
+    assert library.loaded_variants() == ['png-light']
+    assert library.get_index('png-light') is index
+    assert set(index.all_icons) == set(ICON_NAMES)
+
+    library.get_index('png-dark')
+    assert library.loaded_variants() == ['png-light', 'png-dark']
+
+
+def test_get_icon_url(library):
+    dark_url = ICON_VARIANTS['png-dark']['url']
+    assert library.get_icon_url(DARK_ICONS[0], 'png-dark') == f"{dark_url}/{DARK_ICONS[0]}.png"
+    # 变体中缺少的图标和空名称返回None
+    assert library.get_icon_url(ICON_NAMES[-1], 'png-dark') is None
+    assert library.get_icon_url("", 'png-dark') is None
+    assert library.loaded_variants() == ['png-dark']
+
+
+def test_unknown_variant(library):
+    with pytest.raises(KeyError):
+        library.get_index('jpeg-light')
+    assert library.loaded_variants() == []
+
+
+def test_variant_snapshots_kept_separately(library, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    IconLibrary(library.base_path, cache_dir, "v1").get_index('png-dark')
+
+    reloaded = IconLibrary(library.base_path, cache_dir, "v1")
+    assert reloaded.load_cached_index('png-light') is None
+    index = reloaded.load_cached_index('png-dark')
+    assert index.loaded_from_cache and set(index.all_icons) == set(DARK_ICONS)
+
+
+def test_default_run_builds_only_default_variant(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    make_dark_icons(project)
+
+    assert run_processor(project).icon_library.loaded_variants() == ['png-light']
+
+
+def test_extra_icon_url_fields(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    monkeypatch.setattr(main, "EXTRA_ICON_URL_FIELDS", {'png-dark': 'profile_image_url_dark'})
+    make_dark_icons(project)
+    processor = run_processor(project)
+
+    assert processor.icon_library.loaded_variants() == ['png-light', 'png-dark']
+    output = json.loads((project / "models-export-mod.json").read_text(encoding='utf-8'))
+    dark_models = [model for model in output if 'profile_image_url_dark' in model['meta']]
+    assert dark_models
+    for model in dark_models:
+        icon_name = model['meta']['profile_image_url'].rsplit('/', 1)[-1][:-len('.png')]
+        assert icon_name in DARK_ICONS
+        assert model['meta']['profile_image_url_dark'] == f"{ICON_VARIANTS['png-dark']['url']}/{icon_name}.png"
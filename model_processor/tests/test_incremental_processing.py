@@ -0,0 +1,56 @@
+"""
+增量处理测试：未变化的模型复用上一次的结果，输出与完整处理一致
+"""
+
+import json
+
+import main
+from conftest import MODELS, delay_refresh, run_processor
+
+
+def test_incremental_cache_warm_run(project, serial_models, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", True)
+    output_file = project / "models-export-mod.json"
+
+    cold = run_processor(project)
+    assert cold.stats['reused_models'] == 0
+    assert json.loads(output_file.read_text(encoding='utf-8')) == serial_models
+
+    output_file.unlink()
+    warm = run_processor(project)
+    # 输入和图标都没有变化：所有模型都复用上一次的结果，输出不变
+    assert warm.stats['reused_models'] == len(MODELS)
+    assert json.loads(output_file.read_text(encoding='utf-8')) == serial_models
+    assert warm.stats['matched_icons'] == cold.stats['matched_icons']
+
+
+def test_incremental_cache_rematched_models_not_reused(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", True)
+    monkeypatch.setattr(main, "BACKGROUND_SUBMODULE_REFRESH", True)
+    run_processor(project)
+
+    # 新增图标使部分模型的匹配结果可能变化；后台刷新在所有模型都从缓存复用后才完成
+    (project / "lobe-icons" / "packages" / "static-png" / "light" / "mistral-color.png").write_bytes(b"png")
+    delay_refresh(monkeypatch)
+    warm = run_processor(project)
+
+    # 重新匹配的模型不再计为复用
+    rematched = len(warm.stats['rematched_models'])
+    assert rematched > 0
+    assert warm.stats['reused_models'] == len(MODELS) - rematched
+
+
+def test_incremental_cache_reprocesses_changed_models(project, serial_models, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", True)
+    run_processor(project)
+
+    # 新的导出文件中只有一个模型的描述变化：只重新处理该模型
+    models = json.loads(json.dumps(MODELS))
+    models[4]["meta"]["description"] = ""
+    (project / "models-export-2.json").write_text(json.dumps(models, ensure_ascii=False), encoding='utf-8')
+    warm = run_processor(project)
+
+    assert warm.stats['reused_models'] == len(MODELS) - 1
+    output = json.loads((project / "models-export-mod.json").read_text(encoding='utf-8'))
+    assert output[:4] == serial_models[:4] and output[5:] == serial_models[5:]
+    assert output[4]["meta"]["description"] not in ("", "已有的描述")
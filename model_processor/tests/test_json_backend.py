@@ -0,0 +1,47 @@
+"""
+JSON后端测试：各后端的解析和序列化结果都应与标准库json逐字节一致
+"""
+
+import json
+
+import pytest
+
+from utils.json_backend import available_backends, create_backend
+
+# 各后端与标准库格式不同的值：科学计数法浮点数、非有限浮点数、超出64位的整数
+SPECIAL_VALUES = [1e-05, 1e20, 1e-07, 1e16, -2.5e-10, float('nan'), float('inf'), float('-inf'), 2 ** 64, -2 ** 63 - 1]
+
+DOCUMENTS = [
+    {"id": "gpt-4o", "params": {"min_p": 1e-05, "top_p": 0.95, "temperature": 0.7}, "meta": {"tags": []}},
+    {"id": "deepseek-r1", "params": {"seed": 2 ** 64, "scale": 1e20, "nan": float('nan')}},
+    [{"nested": [1e-07, {"inf": float('inf')}]}, 0.1, -0.0, 123456.789],
+] + SPECIAL_VALUES
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):
+    return create_backend(request.param)
+
+
+@pytest.mark.parametrize("indent, compact", [(2, False), (None, True), (None, False), (4, False)])
+@pytest.mark.parametrize("document", DOCUMENTS, ids=repr)
+def test_dumps_matches_stdlib(backend, document, indent, compact):
+    expected = json.dumps(document, ensure_ascii=False, indent=indent, separators=(',', ':') if compact else None)
+
+    assert backend.dumps(document, indent, compact) == expected
+
+
+@pytest.mark.parametrize("document", DOCUMENTS, ids=repr)
+def test_loads_round_trips_like_stdlib(backend, document):
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+
+    for data in (text, text.encode('utf-8')):
+        value = backend.loads(data)
+        # NaN不等于自身，比较重新序列化后的文本
+        assert json.dumps(value, ensure_ascii=False, indent=2) == text
+        assert type(value) is type(json.loads(text))
+
+
+def test_loads_reports_invalid_json_like_stdlib(backend):
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads('{"id": ')
@@ -0,0 +1,87 @@
+"""
+关键词自动机测试：一次扫描的命中与逐个关键词做子串判断的结果一致
+"""
+
+import random
+
+import pytest
+
+from config import FUNCTION_KEYWORDS, SPECIAL_RULES, VENDOR_MAPPING
+from conftest import MODELS
+from utils.keyword_automaton import KeywordAutomaton, RuleKeywordMatcher
+
+# 相互重叠、互为前后缀的关键词
+OVERLAPPING = ["he", "she", "his", "hers", "h", "ers", "s"]
+
+# 规则表覆盖的模型文本（f"{名称} {ID}".lower()）
+MODEL_TEXTS = [f"{model['name']} {model['id']}".lower() for model in MODELS] + [
+    "deepseek-r1-distill-qwen-32b deepseek-r1-distill-qwen-32b",
+    "gpt-4o-search-preview openai/gpt-4o-search-preview",
+    "qwen-vl-max-fovt qwen-vl-max-fovt",
+    "flux.1-dev image generation",
+    "tts-1-hd tts-1-hd",
+    "",
+]
+
+
+def brute_force(keywords, text):
+    """逐个关键词查找所有出现位置"""
+    matches = set()
+    for keyword in set(keywords):
+        start = text.find(keyword)
+        while start != -1:
+            matches.add((start, keyword))
+            start = text.find(keyword, start + 1)
+    return matches
+
+
+@pytest.mark.parametrize("text", ["ushers", "hishers", "sheshe", "", "xyz", "hhh"])
+def test_iter_matches_reports_every_occurrence(text):
+    automaton = KeywordAutomaton(OVERLAPPING)
+    matches = list(automaton.iter_matches(text))
+
+    assert set(matches) == brute_force(OVERLAPPING, text)
+    assert len(matches) == len(set(matches))
+    # 按结束位置依次产出
+    ends = [start + len(keyword) for start, keyword in matches]
+    assert ends == sorted(ends)
+
+
+def test_iter_matches_random_texts():
+    generator = random.Random(0)
+    keywords = ["".join(generator.choice("abc") for _ in range(generator.randint(1, 4))) for _ in range(30)]
+    automaton = KeywordAutomaton(keywords)
+
+    for _ in range(200):
+        text = "".join(generator.choice("abcd") for _ in range(generator.randint(0, 30)))
+        assert set(automaton.iter_matches(text)) == brute_force(keywords, text)
+        assert automaton.find_keywords(text) == {keyword for _, keyword in brute_force(keywords, text)}
+
+
+def test_empty_and_duplicate_keywords_ignored():
+    automaton = KeywordAutomaton(["", "qwen", "qwen"])
+    assert automaton.keywords == {"qwen"}
+    assert list(automaton.iter_matches("qwen qwen")) == [(0, "qwen"), (5, "qwen")]
+
+
+@pytest.mark.parametrize("text", MODEL_TEXTS)
+def test_rule_matcher_matches_config_loops(text):
+    matcher = RuleKeywordMatcher()
+    hits = matcher.scan(text)
+
+    # 与逐条遍历config规则表时的命中和顺序一致
+    assert matcher.vendor_keywords(hits) == [keyword for keyword in VENDOR_MAPPING if keyword in text]
+    assert matcher.special_rule_keys(hits) == [keyword for keyword in SPECIAL_RULES if keyword in text]
+    assert matcher.function_tags(hits) == [
+        tag_name for tag_name, keywords in FUNCTION_KEYWORDS.items()
+        if any(keyword.lower() in text for keyword in keywords)
+    ]
+
+
+def test_rules_version_changes_with_rules():
+    base = RuleKeywordMatcher()
+    changed = RuleKeywordMatcher(vendor_mapping=dict(VENDOR_MAPPING, newvendor="newvendor"))
+
+    assert base.rules_version == RuleKeywordMatcher().rules_version
+    assert changed.rules_version != base.rules_version
+    assert changed.vendor_keywords(changed.scan("newvendor-1")) == ["newvendor"]
@@ -0,0 +1,112 @@
+"""
+日志测试：各日志器共用一个文件句柄，热点日志延迟格式化并按设置采样，工作进程中的日志不丢失
+"""
+
+import functools
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import main
+from conftest import run_processor, sorted_tags
+from utils import logger as logger_module
+from utils.logger import Logger, merge_sample_counts, take_sample_counts
+
+
+class RecordCollector(logging.Handler):
+    """收集日志记录（挂在日志器上，与写入线程无关，同步收到记录）"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class FormatCounter:
+    """记录被格式化（转为字符串）的次数"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return "value"
+
+
+@pytest.fixture
+def collected(monkeypatch):
+    """挂上记录收集器的日志器，采样计数在测试之间隔离"""
+    monkeypatch.setattr(logger_module, "_sample_counts", {})
+    log = Logger("SampleTest")
+    collector = RecordCollector()
+    log.logger.addHandler(collector)
+    yield log, collector
+    log.logger.removeHandler(collector)
+
+
+def test_loggers_share_one_file_handle():
+    first, second = Logger("ShareTestA"), Logger("ShareTestB")
+    assert first.logger.handlers == second.logger.handlers
+    file_handlers = [handler for handler in logger_module._shared_handlers()
+                     if isinstance(handler, logging.FileHandler)]
+    assert len(file_handlers) == 1
+
+
+def test_sampled_writes_every_nth_message(collected, monkeypatch):
+    log, collector = collected
+    monkeypatch.setattr(logger_module, "LOG_SAMPLE_EVERY", 3)
+
+    for i in range(7):
+        log.sampled("match", "匹配成功 [%d]", i)
+
+    # 第1、4、7条输出，其余只计数
+    assert [record.getMessage() for record in collector.records] == ["匹配成功 [0]", "匹配成功 [3]", "匹配成功 [6]"]
+    assert take_sample_counts() == {"match": [7, 3]}
+    assert take_sample_counts() == {}
+
+
+def test_sampled_formats_lazily(collected, monkeypatch):
+    log, collector = collected
+    monkeypatch.setattr(logger_module, "LOG_SAMPLE_EVERY", 2)
+    value = FormatCounter()
+
+    # 低于日志级别：不计数也不格式化
+    log.sampled("debug", "调试 %s", value, level=logging.DEBUG - 1)
+    assert value.count == 0
+    # 第1条输出；第2条未被采样，只计数，不格式化
+    log.sampled("tags", "生成标签 %s", value)
+    formatted = value.count
+    log.sampled("tags", "生成标签 %s", value)
+    assert value.count == formatted
+    assert len(collector.records) == 1
+    assert take_sample_counts() == {"tags": [2, 1]}
+
+
+def test_merge_sample_counts(collected):
+    collected[0].sampled("match", "匹配成功")
+    merge_sample_counts({"match": [10, 2], "tags": [5, 5]})
+    assert take_sample_counts() == {"match": [11, 3], "tags": [5, 5]}
+
+
+@pytest.mark.parametrize("start_method", ["spawn", "forkserver"])
+def test_jobs_without_fork(project, serial_models, monkeypatch, tmp_path, start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"不支持{start_method}")
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    monkeypatch.setattr(main, "ProcessPoolExecutor", functools.partial(
+        ProcessPoolExecutor, mp_context=multiprocessing.get_context(start_method)))
+    # 重新启动的工作进程在当前目录打开自己的日志文件
+    monkeypatch.chdir(tmp_path)
+    run_processor(project, jobs=2)
+
+    output = json.loads((project / "models-export-mod.json").read_text(encoding='utf-8'))
+    assert sorted_tags(output) == sorted_tags(serial_models)
+    # 工作进程中的日志没有丢失
+    worker_log = (tmp_path / "model_processor.log").read_text(encoding='utf-8')
+    assert worker_log.count("匹配成功 [") == sum(1 for model in serial_models
+                                              if model["meta"].get("profile_image_url", "").startswith("http"))
@@ -0,0 +1,92 @@
+"""
+匹配结果缓存测试：有界LRU淘汰、未匹配结果缓存、统计计数以及按缓存键失效的持久化
+"""
+
+import pytest
+
+import main
+from conftest import ICON_NAMES, run_processor
+from utils.icon_matcher import IconMatcher, MatchResult
+from utils.match_cache import MatchCache
+
+MISS = MatchResult(False, "", "", 0.0, "none")
+
+
+def result(icon_name: str) -> MatchResult:
+    return MatchResult(True, icon_name, f"https://example.com/{icon_name}.png", 1.0, "exact")
+
+
+@pytest.fixture
+def icons(tmp_path):
+    icons = tmp_path / "light"
+    icons.mkdir()
+    for name in ICON_NAMES:
+        (icons / f"{name}.png").write_bytes(b"png")
+    return icons
+
+
+def test_lru_eviction_and_counters():
+    cache = MatchCache(max_size=2)
+    cache.put("a", result("openai"))
+    cache.put("b", result("claude"))
+    assert cache.get("a") == result("openai")  # a变为最近使用
+    cache.put("c", result("qwen"))  # 淘汰最久未使用的b
+
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.get("b") is None
+    assert cache.get_stats() == {'size': 2, 'max_size': 2, 'hits': 1, 'misses': 1, 'evictions': 1}
+
+
+def test_negative_results_cached():
+    cache = MatchCache()
+    cache.put("unknown", MISS)
+    assert cache.get("unknown") == MISS
+    assert cache.hits == 1
+
+
+def test_zero_size_disables_cache():
+    cache = MatchCache(max_size=0)
+    cache.put("a", result("openai"))
+    assert len(cache) == 0 and cache.get("a") is None
+
+
+def test_repeated_pairs_skip_strategies(icons):
+    matcher = IconMatcher(icons)
+    first = matcher.match_icon("GPT-4o", "gpt-4o")
+    unmatched = matcher.match_icon("my-private-model", "my-private-model")
+    calls = {name: stats['calls'] for name, stats in matcher.strategy_stats.items()}
+
+    # 大小写不同的同一对名称/ID和未匹配的模型都直接命中缓存，不再执行匹配策略
+    assert matcher.match_icon("gpt-4O", "GPT-4o") == first
+    assert matcher.match_icon("my-private-model", "my-private-model") == unmatched
+    assert not unmatched.matched
+    assert {name: stats['calls'] for name, stats in matcher.strategy_stats.items()} == calls
+    assert matcher.match_cache.hits == 2
+
+
+def test_persisted_cache_reused_until_key_changes(icons, tmp_path):
+    cache_file = tmp_path / "match_cache.json"
+    matcher = IconMatcher(icons, match_cache_file=cache_file)
+    expected = matcher.match_icon("deepseek-chat", "deepseek-chat")
+    assert matcher.save_match_cache()
+
+    reloaded = IconMatcher(icons, match_cache_file=cache_file)
+    assert len(reloaded.match_cache) == 1
+    assert reloaded.match_icon("deepseek-chat", "deepseek-chat") == expected
+    assert reloaded.match_cache.hits == 1
+
+    # 图标清单变化（快照键变化）后缓存文件作废
+    assert not MatchCache().load(cache_file, "other-key")
+    (icons / "deepseek-v3.png").write_bytes(b"png")
+    changed = IconMatcher(icons, match_cache_file=cache_file)
+    assert changed.match_cache_key != reloaded.match_cache_key
+    assert len(changed.match_cache) == 0
+
+
+def test_report_shows_cache_counters(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    processor = run_processor(project)
+    stats = processor.icon_matcher.match_cache.get_stats()
+
+    assert f"匹配缓存: 命中{stats['hits']}次, 未命中{stats['misses']}次, 淘汰{stats['evictions']}次" in \
+        processor.generate_report()
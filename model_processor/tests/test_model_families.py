@@ -0,0 +1,56 @@
+"""
+模型族测试：族键的规范化，以及族内厂商标签和描述模板素材在整个运行期间的复用
+"""
+
+import pytest
+
+from main import ModelProcessor
+from utils.icon_matcher import MatchResult
+from utils.model_features import build_model_features, family_key
+
+
+def matched_features(model_id: str, icon_name: str):
+    """构造已匹配到指定图标的模型特征"""
+    features = build_model_features(model_id, model_id)
+    features.match_result = MatchResult(True, icon_name, f"https://example.com/{icon_name}.png", 1.0, "exact")
+    return features
+
+
+@pytest.mark.parametrize("model_id", [
+    "qwen2.5-72b-instruct", "qwen2.5-72b-instruct-fovt", "Qwen/Qwen2.5-72B-Instruct", "qwen2.5-72b-latest",
+])
+def test_family_key_strips_provider_and_variant_suffixes(model_id):
+    assert family_key(build_model_features(model_id, model_id)) == "qwen2.5-72b"
+
+
+def test_family_key_strips_dates():
+    assert family_key(build_model_features("", "claude-3-5-sonnet-20241022")) == "claude-3-5-sonnet"
+    assert family_key(build_model_features("", "gpt-4o-2024-05-13")) == "gpt-4o"
+
+
+def test_family_context_is_shared_across_batches(tmp_path):
+    processor = ModelProcessor(str(tmp_path))
+
+    first = processor.family_context(matched_features("qwen2.5-72b-instruct", "qwen-color"))
+    # 同族、图标和关键词命中相同的模型（可能在之后的批次中）复用同一份素材
+    second = processor.family_context(matched_features("Qwen/Qwen2.5-72B-Instruct", "qwen-color"))
+    assert second is first
+    assert processor.stats['family_contexts'] == 1
+    assert processor.stats['model_families'] == {"qwen2.5-72b": 2}
+
+
+def test_family_context_recomputed_when_member_differs(tmp_path):
+    processor = ModelProcessor(str(tmp_path))
+
+    representative = matched_features("qwen2.5-72b-instruct", "qwen-color")
+    first = processor.family_context(representative)
+    # 关键词命中不同（-fovt）时按该模型重新计算，结果与单独计算一致
+    member = matched_features("qwen2.5-72b-instruct-fovt", "qwen-color")
+    assert member.hits != representative.hits and family_key(member) == family_key(representative)
+    context = processor.family_context(member)
+    assert context is not first
+    assert context['profile'] == processor.description_generator.family_profile(member)
+    assert context['vendor_tags'] == processor.tag_generator.generate_vendor_tags(
+        member.icon_name, member.model_name, member.model_id, member
+    )
+    assert processor.stats['family_contexts'] == 0
@@ -0,0 +1,61 @@
+"""
+模型特征测试：一次提取的特征与各处单独计算的结果一致，使用特征和不使用特征生成的结果相同
+"""
+
+import copy
+
+import pytest
+
+from conftest import ICON_NAMES, MODELS
+from utils.description_generator import DescriptionGenerator
+from utils.icon_matcher import IconMatcher
+from utils.keyword_automaton import get_rule_matcher
+from utils.model_features import build_model_features, extract_keywords, extract_versions, normalize_name
+from utils.tag_generator import TagGenerator
+
+MODEL_IDS = [model["id"] for model in MODELS]
+
+
+@pytest.fixture(scope="module")
+def matcher(tmp_path_factory):
+    icons = tmp_path_factory.mktemp("light")
+    for name in ICON_NAMES:
+        (icons / f"{name}.png").write_bytes(b"png")
+    return IconMatcher(icons)
+
+
+@pytest.mark.parametrize("model", MODELS, ids=MODEL_IDS)
+def test_features_match_separate_computations(model):
+    features = build_model_features(model["name"], model["id"])
+    text = f"{model['name']} {model['id']}".lower()
+
+    assert features.text == text
+    assert features.normalized_name == normalize_name(model["name"])
+    assert features.normalized_id == normalize_name(model["id"])
+    assert features.tokens == extract_keywords(text)
+    assert features.hits == get_rule_matcher().scan(text)
+    assert features.versions == extract_versions(text)
+    assert features.match_result is None and features.icon_name == ""
+
+
+@pytest.mark.parametrize("model", MODELS, ids=MODEL_IDS)
+def test_shared_features_give_same_results(matcher, model):
+    features = build_model_features(model["name"], model["id"])
+    match_result = matcher.match_icon(model["name"], model["id"], features)
+    features.match_result = match_result
+
+    # 各步骤复用同一份特征的结果与各自重新提取时一致
+    assert match_result == matcher.match_icon(model["name"], model["id"])
+    icon_name = features.icon_name
+    tag_generator = TagGenerator()
+    assert tag_generator.generate_tags(copy.deepcopy(model), icon_name, features) == \
+        tag_generator.generate_tags(copy.deepcopy(model), icon_name)
+    description_generator = DescriptionGenerator()
+    assert description_generator.generate_description(copy.deepcopy(model), icon_name, features) == \
+        description_generator.generate_description(copy.deepcopy(model), icon_name)
+
+
+def test_normalize_name():
+    assert normalize_name("Qwen/Qwen2.5_72B  Instruct!") == "qwenqwen25-72binstruct"
+    assert normalize_name("--GPT__4o--") == "gpt-4o"
+    assert normalize_name("") == ""
@@ -0,0 +1,68 @@
+"""
+输出和输入格式测试：紧凑JSON、NDJSON以及gzip/zstd压缩的结果与默认格式的内容一致
+"""
+
+import gzip
+import json
+
+import pytest
+
+import main
+from conftest import MODELS, run_processor
+from utils.file_handler import FileHandler, detect_format, output_file_name, zstandard
+
+
+@pytest.mark.parametrize("output_format", ["json-min", "ndjson"])
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_output_formats(project, serial_models, monkeypatch, output_format, compression):
+    if compression == "zstd" and zstandard is None:
+        pytest.skip("未安装zstandard")
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    monkeypatch.setattr(main, "OUTPUT_FORMAT", output_format)
+    monkeypatch.setattr(main, "OUTPUT_COMPRESSION", compression)
+    run_processor(project)
+
+    output_file = project / output_file_name("models-export-mod", output_format, compression)
+    assert FileHandler.load_json(str(output_file)) == serial_models
+    with FileHandler.open_binary(str(output_file)) as f:
+        text = f.read().decode('utf-8')
+    if output_format == "json-min":
+        assert text == json.dumps(serial_models, ensure_ascii=False, separators=(',', ':'))
+    else:
+        assert text == "".join(json.dumps(model, ensure_ascii=False, separators=(',', ':')) + "\n"
+                               for model in serial_models)
+
+
+@pytest.mark.parametrize("file_name, expected", [
+    ("models-export-7.json", ("json", None)),
+    ("models-export-7.ndjson", ("ndjson", None)),
+    ("models-export-7.jsonl.gz", ("ndjson", "gzip")),
+    ("models-export-7.json.zst", ("json", "zstd")),
+    ("MODELS-EXPORT-7.NDJSON.GZ", ("ndjson", "gzip")),
+])
+def test_detect_format(file_name, expected):
+    assert detect_format(file_name) == expected
+
+
+def test_find_latest_export_file_accepts_all_formats(tmp_path):
+    for name in ("models-export-3.json", "models-export-12.ndjson.gz", "models-export-9.json.zst",
+                 "models-export-mod.json", "models-export-20.txt"):
+        (tmp_path / name).write_bytes(b"")
+
+    # 按编号选择最新的文件，不认识的后缀和输出文件不参与
+    assert FileHandler.find_latest_export_file(str(tmp_path)) == str(tmp_path / "models-export-12.ndjson.gz")
+
+
+@pytest.mark.parametrize("file_name", ["models-export-2.ndjson.gz", "models-export-2.json.gz"])
+def test_compressed_input(project, serial_models, monkeypatch, file_name):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    (project / "models-export-1.json").unlink()
+    if ".ndjson" in file_name:
+        text = "".join(json.dumps(model, ensure_ascii=False) + "\n" for model in MODELS)
+    else:
+        text = json.dumps(MODELS, ensure_ascii=False)
+    (project / file_name).write_bytes(gzip.compress(text.encode('utf-8')))
+
+    run_processor(project)
+
+    assert json.loads((project / "models-export-mod.json").read_text(encoding='utf-8')) == serial_models
@@ -0,0 +1,32 @@
+"""
+多进程处理测试：按分块并行处理的输出顺序和汇总统计与单进程一致
+"""
+
+import json
+
+import pytest
+
+import main
+from conftest import MODELS, make_project, run_processor
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_jobs(project, serial_models, monkeypatch, incremental):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", incremental)
+    processor = run_processor(project, jobs=2)
+
+    assert json.loads((project / "models-export-mod.json").read_text(encoding='utf-8')) == serial_models
+    assert processor.stats['total_models'] == len(MODELS)
+
+
+def test_jobs_stats_match_serial(project, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    serial = run_processor(make_project(tmp_path / "serial"), jobs=1)
+    parallel = run_processor(project, jobs=3)
+
+    for key in ('total_models', 'matched_icons', 'updated_tags', 'generated_descriptions', 'errors',
+                'failed_matches', 'model_families'):
+        assert parallel.stats[key] == serial.stats[key], key
+    assert parallel.icon_matcher.strategy_stats.keys() == serial.icon_matcher.strategy_stats.keys()
+    for name, strategy_stats in serial.icon_matcher.strategy_stats.items():
+        assert parallel.icon_matcher.strategy_stats[name]['matches'] == strategy_stats['matches'], name
@@ -0,0 +1,52 @@
+"""
+流水线模式测试：结果与单进程处理一致，有界队列限制解析阶段领先写入阶段的模型数
+"""
+
+import json
+
+import pytest
+
+import main
+from conftest import MODELS, run_processor
+from main import ModelProcessor
+from utils.file_handler import FileHandler
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_pipeline(project, serial_models, monkeypatch, jobs):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    processor = run_processor(project, jobs=jobs, pipeline=True)
+
+    assert json.loads((project / "models-export-mod.json").read_text(encoding='utf-8')) == serial_models
+    assert set(processor.stats['pipeline_stages']) >= {"parse", "process", "write"}
+
+
+def test_pipeline_backpressure(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    monkeypatch.setattr(main, "PIPELINE_QUEUE_SIZE", 1)
+    models = [dict(model, id=f"{model['id']}-{i}") for i in range(20) for model in MODELS]
+    (project / "models-export-1.json").write_text(json.dumps(models, ensure_ascii=False), encoding='utf-8')
+
+    # 记录每解析一个模型时已解析但尚未写入的模型数
+    written = 0
+    leads = []
+    iter_models = FileHandler.iter_models
+    write_models = ModelProcessor._write_models
+
+    def counting_iter_models(file_path):
+        for parsed, model in enumerate(iter_models(file_path), 1):
+            leads.append(parsed - written)
+            yield model
+
+    def counting_write_models(self, writer, models_data):
+        nonlocal written
+        write_models(self, writer, models_data)
+        written += len(models_data)
+
+    monkeypatch.setattr(FileHandler, "iter_models", staticmethod(counting_iter_models))
+    monkeypatch.setattr(ModelProcessor, "_write_models", counting_write_models)
+    run_processor(project, pipeline=True)
+
+    assert written == len(models)
+    # 两个队列各一批，加上解析、处理和写入中的各一批
+    assert max(leads) <= (2 * 1 + 3) * main.PROCESS_BATCH_SIZE
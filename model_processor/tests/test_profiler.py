@@ -0,0 +1,114 @@
+"""
+性能分析测试：保存pstats和折叠栈文件，报告中列出累计耗时最多的函数
+"""
+
+import pstats
+import threading
+import time
+
+import pytest
+
+import main
+from main import ModelProcessor
+from utils.profiler import RunProfiler
+
+
+def busy(seconds: float) -> int:
+    """占用CPU一段时间，返回循环次数"""
+    deadline = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < deadline:
+        count += 1
+    return count
+
+
+def read_collapsed(path):
+    """解析折叠栈文件: [(帧列表, 采样次数)]"""
+    stacks = []
+    for line in path.read_text(encoding='utf-8').splitlines():
+        stack, count = line.rsplit(" ", 1)
+        stacks.append((stack.split(";"), int(count)))
+    return stacks
+
+
+def test_run_saves_pstats_and_collapsed_stacks(tmp_path):
+    profiler = RunProfiler(tmp_path / "profiles", 0.001, name="unit")
+
+    assert profiler.run(busy, 0.1) > 0
+
+    assert profiler.pstats_file.parent == tmp_path / "profiles"
+    assert profiler.pstats_file.name.startswith("unit-") and profiler.pstats_file.suffix == ".pstats"
+    functions = {name for _, _, name in pstats.Stats(str(profiler.pstats_file)).stats}
+    assert "busy" in functions
+
+    stacks = read_collapsed(profiler.collapsed_file)
+    assert stacks
+    assert all(stack[0] == threading.main_thread().name for stack, _ in stacks)
+    assert any(stack[-1].startswith("busy (test_profiler.py:") for stack, _ in stacks)
+    # 按采样次数从多到少排列
+    counts = [count for _, count in stacks]
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_sampler_skips_daemon_threads(tmp_path):
+    def work():
+        profiler_threads.append(threading.current_thread().name)
+        busy(0.1)
+
+    profiler_threads = []
+    workers = [threading.Thread(target=work, name="Worker", daemon=False),
+               threading.Thread(target=work, name="Daemon", daemon=True)]
+
+    def run_threads():
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    profiler = RunProfiler(tmp_path, 0.001)
+    profiler.run(run_threads)
+
+    thread_names = {stack[0] for stack, _ in read_collapsed(profiler.collapsed_file)}
+    assert "Worker" in thread_names
+    assert "Daemon" not in thread_names and "StackSampler" not in thread_names
+
+
+def test_results_saved_when_function_raises(tmp_path):
+    def failing():
+        busy(0.01)
+        raise ValueError
+
+    profiler = RunProfiler(tmp_path, 0.001)
+    with pytest.raises(ValueError):
+        profiler.run(failing)
+    assert profiler.pstats_file.exists() and profiler.collapsed_file.exists()
+
+
+def test_top_functions_and_report(tmp_path):
+    profiler = RunProfiler(tmp_path, 0.001)
+    assert profiler.top_functions(2) == [] and profiler.format_report(2) == ""
+    profiler.run(busy, 0.05)
+
+    functions = profiler.top_functions(2)
+    assert len(functions) == 2
+    assert functions[0][0].endswith("(busy)")
+    cumulative = [cumulative_time for _, _, _, cumulative_time in profiler.top_functions(100)]
+    assert cumulative == sorted(cumulative, reverse=True)
+
+    report = profiler.format_report(2)
+    assert "性能分析 (按累计耗时前2个函数" in report
+    assert report.count("\n  累计") == 2
+    assert str(profiler.pstats_file) in report and str(profiler.collapsed_file) in report
+
+
+def test_processor_report_lists_top_functions(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    monkeypatch.setattr(main, "PROFILE_TOP_N", 7)
+    processor = ModelProcessor(str(project))
+    processor.profiler = RunProfiler(project / "profiles", 0.001)
+    assert processor.run()
+
+    assert processor.profiler.pstats_file.exists() and processor.profiler.collapsed_file.exists()
+    report = processor.generate_report()
+    assert "性能分析 (按累计耗时前7个函数" in report
+    assert "_process_and_save" in report
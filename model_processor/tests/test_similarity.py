@@ -0,0 +1,110 @@
+"""
+相似度评分测试：稀疏实现（scipy矩阵或纯Python倒排表）的最佳图标与逐个计算余弦相似度的结果一致
+"""
+
+import random
+
+import pytest
+
+import utils.icon_matcher
+from conftest import ICON_NAMES, MODELS
+from utils.icon_matcher import IconMatcher
+from utils.model_features import normalize_name
+from utils.similarity import NgramSimilarityScorer, ngram_vector, sparse
+
+# 加入共享n-gram、得分可能相同的图标名称
+ICONS = ICON_NAMES + ["qwenvl", "qwen-color", "hunyuan", "hunyuan-color", "gemma", "gemini", "ab", "ba"]
+
+
+def candidates():
+    result = [normalize_name(model["name"]) for model in MODELS] + [normalize_name(model["id"]) for model in MODELS]
+    generator = random.Random(0)
+    result += ["".join(generator.choice("abegimnoquwy-") for _ in range(generator.randint(1, 10)))
+               for _ in range(300)]
+    return result + ["zzz", "a", "ab", "ba"]
+
+
+def brute_force(icon_names, candidate, size=3):
+    """逐个图标计算余弦相似度，得分相同时取排序靠前的图标"""
+    query = ngram_vector(candidate, size)
+    best_icon, best_score = None, 0.0
+    for name in sorted(set(icon_names)):
+        vector = ngram_vector(name, size)
+        score = sum(weight * vector.get(gram, 0.0) for gram, weight in query.items())
+        if score > best_score + 1e-12:
+            best_icon, best_score = name, score
+    return best_icon, best_score
+
+
+def python_scorer(icon_names):
+    scorer = NgramSimilarityScorer(icon_names)
+    scorer._icon_matrix = None  # 强制使用纯Python倒排表
+    return scorer
+
+
+def assert_same(result, expected):
+    assert result[0] == expected[0]
+    assert result[1] == pytest.approx(expected[1])
+
+
+def test_postings_match_brute_force():
+    scorer = python_scorer(ICONS)
+    for candidate in candidates():
+        assert_same(scorer.best_match(candidate), brute_force(ICONS, candidate))
+
+
+def test_matrix_matches_postings(monkeypatch):
+    if sparse is None:
+        pytest.skip("未安装numpy/scipy")
+    scorer = NgramSimilarityScorer(ICONS)
+    monkeypatch.setattr(scorer, "MATRIX_CHUNK_SIZE", 7)  # 覆盖分块边界
+    expected = python_scorer(ICONS).score_batch(candidates())
+    results = scorer.score_batch(candidates())
+    assert results.keys() == expected.keys()
+    for candidate, result in results.items():
+        assert_same(result, expected[candidate])
+
+
+def test_score_batch_caches_results():
+    scorer = python_scorer(ICONS)
+    results = scorer.score_batch(["qwen", "", "qwen", "deepseek"])
+
+    assert set(results) == {"qwen", "deepseek"}
+    assert results["qwen"] == ("qwen", pytest.approx(1.0))
+    assert scorer.best_match("deepseek") is scorer._best["deepseek"]
+    assert scorer.best_match("") == (None, 0.0)
+
+
+def test_no_icons_or_shared_ngrams():
+    assert python_scorer([]).best_match("qwen") == (None, 0.0)
+    assert python_scorer(ICONS).best_match("zzz") == (None, 0.0)
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    icons = tmp_path / "light"
+    icons.mkdir()
+    for name in ICONS:
+        (icons / f"{name}.png").write_bytes(b"png")
+    matcher = IconMatcher(icons)
+    matcher.fuzzy_mode = 'similarity'
+    return matcher
+
+
+def test_similarity_match_uses_best_of_name_and_id(matcher):
+    result = matcher.similarity_match("Hunyuan Lite", "tencent/hunyuan-lite")
+    name_best = brute_force(matcher.similarity_scorer.icon_names, normalize_name("Hunyuan Lite"))
+    id_best = brute_force(matcher.similarity_scorer.icon_names, normalize_name("tencent/hunyuan-lite"))
+    best_icon, best_score = max(name_best, id_best, key=lambda item: item[1])
+
+    assert result.match_type == "similarity"
+    assert result.icon_name == matcher.index.find_best_match(best_icon)
+    assert result.confidence == round(best_score, 4)
+
+
+def test_similarity_match_min_score(matcher, monkeypatch):
+    result = matcher.similarity_match("gemmini", "gemmini")
+    assert result is not None
+
+    monkeypatch.setattr(utils.icon_matcher, "SIMILARITY_MIN_SCORE", result.confidence + 0.01)
+    assert matcher.similarity_match("gemmini", "gemmini") is None
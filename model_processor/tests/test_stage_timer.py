@@ -0,0 +1,131 @@
+"""
+阶段计时测试：直方图分位数的误差、合并、计时上下文和逐个计时的迭代，以及报告和耗时JSON
+"""
+
+import json
+import math
+import random
+import time
+
+import pytest
+
+import main
+from conftest import MODELS, run_processor
+from utils.stage_timer import LatencyHistogram, StageTimer, format_latency
+
+
+def exact_percentile(samples, percent):
+    """最近秩法的精确分位数"""
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(len(ordered) * percent / 100)) - 1]
+
+
+def test_percentiles_within_bucket_error():
+    generator = random.Random(0)
+    samples = [generator.lognormvariate(math.log(1e-3), 1.5) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for seconds in samples:
+        histogram.record(seconds)
+
+    # 每翻一倍8个桶，取几何中点时相对误差不超过2^(1/16)-1
+    for percent in (1, 50, 90, 95, 99, 100):
+        assert histogram.percentile(percent) == pytest.approx(exact_percentile(samples, percent), rel=0.045)
+    summary = histogram.summary()
+    assert summary['calls'] == len(samples)
+    assert summary['seconds'] == pytest.approx(sum(samples))
+    assert summary['mean'] == pytest.approx(sum(samples) / len(samples))
+    assert summary['max'] == max(samples)
+
+
+def test_percentile_edge_cases():
+    histogram = LatencyHistogram()
+    assert histogram.summary() == {'calls': 0, 'seconds': 0.0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0,
+                                   'max': 0.0}
+
+    # 低于下限的耗时计入第一个桶，分位数不超过最大值
+    histogram.record(0.0)
+    histogram.record(1e-9)
+    assert histogram.buckets == {0: 2}
+    assert histogram.percentile(99) == 1e-9
+
+
+def test_merge_equals_single_histogram():
+    generator = random.Random(1)
+    samples = [generator.uniform(1e-6, 0.1) for _ in range(1000)]
+    combined = LatencyHistogram()
+    parts = [LatencyHistogram(), LatencyHistogram(), LatencyHistogram()]
+    for position, seconds in enumerate(samples):
+        combined.record(seconds)
+        parts[position % 3].record(seconds)
+
+    merged = LatencyHistogram()
+    for part in parts:
+        merged.merge(part)
+    assert merged.buckets == combined.buckets
+    assert merged.summary() == pytest.approx(combined.summary())
+
+
+def test_measure_records_on_exception():
+    timer = StageTimer()
+    with timer.measure("索引构建"):
+        time.sleep(0.01)
+    with pytest.raises(ValueError):
+        with timer.measure("索引构建"):
+            raise ValueError
+
+    assert timer.stages["索引构建"].calls == 2
+    assert timer.stages["索引构建"].max >= 0.01
+
+
+def test_iter_timed_counts_each_item():
+    def slow_items():
+        for item in range(5):
+            time.sleep(0.002)
+            yield item
+
+    timer = StageTimer()
+    assert list(timer.iter_timed("JSON加载", slow_items())) == list(range(5))
+    histogram = timer.stages["JSON加载"]
+    assert histogram.calls == 5
+    assert histogram.seconds >= 5 * 0.002
+
+    assert list(timer.iter_timed("空输入", [])) == []
+    assert "空输入" not in timer.stages
+
+
+def test_take_and_merge():
+    worker = StageTimer()
+    worker.record("标签生成", 0.001)
+    worker.record("标签生成", 0.003)
+    parent = StageTimer()
+    parent.record("标签生成", 0.002)
+
+    parent.merge(worker.take())
+    assert worker.stages == {}
+    assert parent.stages["标签生成"].calls == 3
+    assert parent.stages["标签生成"].seconds == pytest.approx(0.006)
+
+
+def test_format_latency():
+    histogram = LatencyHistogram()
+    histogram.record(0.25)
+    assert format_latency(histogram.summary()) == "累计250.0ms, 调用1次"
+
+    histogram.record(0.25)
+    assert format_latency(histogram.summary()).startswith("累计500.0ms, 调用2次, p50 ")
+
+
+def test_report_and_timings_json(project, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    processor = run_processor(project, timings_file="timings.json")
+
+    timings = json.loads((project / "timings.json").read_text(encoding='utf-8'))
+    assert timings['total_models'] == len(MODELS)
+    assert timings['stages']["JSON加载"]['calls'] == len(MODELS)
+    assert timings['stages']["标签生成"]['calls'] == len(MODELS)
+    assert {"索引构建", "文件发现", "保存"} <= set(timings['stages'])
+    assert timings['strategies'] and all('p95' in stats for stats in timings['strategies'].values())
+
+    report = processor.generate_report()
+    for stage, summary in processor.stage_timer.summary().items():
+        assert f"\n  {stage}: {format_latency(summary)}" in report
@@ -0,0 +1,93 @@
+"""
+流式读取测试：逐个解析顶层数组元素的结果与json.load一致，与读取块的大小无关
+"""
+
+import json
+
+import pytest
+
+from conftest import MODELS
+from utils.file_handler import FileHandler
+
+# 覆盖跨块截断的各种位置：多字节字符、转义、字符串中的括号和逗号、嵌套数组、数字和字面量
+TRICKY_MODELS = MODELS + [
+    {"id": "quote\"],[{", "name": "逗号,和括号]}", "meta": {"tags": [[1, [2, []]], {}], "n": -12.5e-3}},
+    {"id": "unicode", "name": "中文😀\\u0041", "meta": None},
+    123456789012345678901234567890,
+    [],
+    "字符串元素",
+    True,
+    None,
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_json_array_matches_json_load(tmp_path, chunk_size, indent):
+    path = tmp_path / "models-export-1.json"
+    path.write_text(json.dumps(TRICKY_MODELS, ensure_ascii=False, indent=indent), encoding='utf-8')
+
+    assert list(FileHandler.iter_json_array(str(path), chunk_size)) == TRICKY_MODELS
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("[]", []),
+    ("  [ ]  \n", []),
+    ("", []),
+    ('{"id": "single"}', [{"id": "single"}]),
+    ("[1,\n 2 ,3]", [1, 2, 3]),
+])
+def test_iter_json_array_edge_cases(tmp_path, text, expected):
+    path = tmp_path / "models-export-1.json"
+    path.write_text(text, encoding='utf-8')
+
+    assert list(FileHandler.iter_json_array(str(path), 2)) == expected
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "[1 2]", "[1,]", '[{"id": "a"}, {"id": ]'])
+def test_iter_json_array_rejects_invalid_json(tmp_path, text):
+    path = tmp_path / "models-export-1.json"
+    path.write_text(text, encoding='utf-8')
+
+    with pytest.raises(json.JSONDecodeError):
+        list(FileHandler.iter_json_array(str(path), 3))
+
+
+class CountingReader:
+    """记录已读取字符数的文本流包装"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.characters = 0
+
+    def read(self, size):
+        data = self.stream.read(size)
+        self.characters += len(data)
+        return data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stream.close()
+
+
+def test_iter_json_array_reads_incrementally(tmp_path, monkeypatch):
+    path = tmp_path / "models-export-1.json"
+    text = json.dumps(MODELS, ensure_ascii=False, indent=2)
+    path.write_text(text, encoding='utf-8')
+    readers = []
+    open_text = FileHandler.open_text
+
+    def counting_open_text(file_path):
+        readers.append(CountingReader(open_text(file_path)))
+        return readers[-1]
+
+    monkeypatch.setattr(FileHandler, "open_text", staticmethod(counting_open_text))
+    models = FileHandler.iter_json_array(str(path), 256)
+
+    # 产出第一个模型时只读取了文件开头的几个块
+    assert next(models) == MODELS[0]
+    assert readers[0].characters <= 2 * 256 < len(text)
+    assert list(models) == MODELS[1:]
+    assert readers[0].characters == len(text)
@@ -0,0 +1,55 @@
+"""
+流式写入测试：逐个写入的输出与一次性json.dump一致，中断时不留下写了一半的文件
+"""
+
+import json
+
+import pytest
+
+import main
+from conftest import MODELS, run_processor
+from utils.file_handler import FileHandler, JsonArrayWriter
+
+
+def test_serial_output_is_processed(serial_models):
+    assert [model["id"] for model in serial_models] == [model["id"] for model in MODELS]
+    by_id = {model["id"]: model for model in serial_models}
+    assert by_id["gpt-4o"]["meta"]["profile_image_url"].endswith("/openai.png")
+    assert by_id["deepseek-chat"]["meta"]["profile_image_url"].endswith("/deepseek-color.png")
+    assert by_id["claude-3-haiku"]["meta"]["description"] == "已有的描述"
+    assert by_id["my-private-model"]["meta"].get("profile_image_url") in (None, "")
+
+
+def test_streaming_writer_matches_json_dump(project, serial_models, monkeypatch):
+    monkeypatch.setattr(main, "INCREMENTAL_PROCESSING", False)
+    run_processor(project)
+
+    # 流式写入的结果与一次性json.dump整个列表逐字节一致
+    text = (project / "models-export-mod.json").read_text(encoding='utf-8')
+    assert text == json.dumps(serial_models, ensure_ascii=False, indent=2)
+
+
+def test_interrupted_writer_leaves_no_partial_file(tmp_path):
+    target = tmp_path / "models-export-mod.json"
+    target.write_text("[]", encoding='utf-8')
+
+    with pytest.raises(KeyboardInterrupt):
+        with JsonArrayWriter(str(target)) as writer:
+            writer.write(MODELS[0])
+            raise KeyboardInterrupt
+
+    # 原有文件保持不变，临时文件已删除
+    assert target.read_text(encoding='utf-8') == "[]"
+    assert [path.name for path in tmp_path.iterdir()] == [target.name]
+
+
+def test_failed_stream_keeps_previous_output(tmp_path):
+    target = tmp_path / "models-export-mod.json"
+
+    def models():
+        yield MODELS[0]
+        raise RuntimeError("处理中断")
+
+    assert not FileHandler.save_json_stream(models(), str(target))
+    assert not target.exists()
+    assert list(tmp_path.iterdir()) == []
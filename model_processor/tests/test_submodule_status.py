@@ -0,0 +1,105 @@
+"""
+子模块状态探测测试：子模块已就绪时启动检查只读取git文件，不启动git进程也不切换工作目录
+"""
+
+import os
+import subprocess
+
+import pytest
+
+import main
+from conftest import run_git
+from main import ModelProcessor
+from utils.git_handler import GitHandler
+
+
+@pytest.fixture
+def ready_repo(lobe_remote):
+    """完整检出记录的提交，主仓库index中还有其他普通文件和目录"""
+    repo, _, first, second = lobe_remote
+    names = ["a.txt", "lobe-icons-notes.md", "docs/guide.md", "zzz/deep/file.txt"]
+    for name in names:
+        (repo / name).parent.mkdir(parents=True, exist_ok=True)
+        (repo / name).write_text(name)
+    run_git(["add"] + names, repo)
+    run_git(["commit", "-q", "-m", "files"], repo)
+    success, message = GitHandler(str(repo), fetch_mode='full').update_submodule()
+    assert success, message
+    return repo, first, second
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    """记录启动的子进程，并禁止切换工作目录"""
+    started = []
+    popen = subprocess.Popen
+
+    def recording_popen(args, *popen_args, **kwargs):
+        started.append(args)
+        return popen(args, *popen_args, **kwargs)
+
+    def forbidden_chdir(path):
+        raise AssertionError(f"切换了工作目录: {path}")
+
+    monkeypatch.setattr(subprocess, "Popen", recording_popen)
+    monkeypatch.setattr(os, "chdir", forbidden_chdir)
+    return started
+
+
+@pytest.mark.parametrize("index_version", ["2", "3", "4"])
+def test_ready_submodule_starts_no_process(ready_repo, processes, index_version):
+    repo, first, _ = ready_repo
+    run_git(["update-index", "--index-version", index_version], repo)
+    processes.clear()
+    handler = GitHandler(str(repo))
+
+    assert handler.ensure_submodule_ready()
+    assert handler.get_submodule_commit() == first
+    assert processes == []
+
+
+def test_packed_branch_head(ready_repo, processes):
+    repo, first, _ = ready_repo
+    icons = repo / "lobe-icons"
+    run_git(["checkout", "-q", "-b", "local"], icons)
+    run_git(["pack-refs", "--all"], icons)
+    processes.clear()
+    handler = GitHandler(str(repo))
+
+    assert handler.is_submodule_up_to_date() is True
+    assert handler.get_submodule_commit() == first
+    assert processes == []
+
+
+def git_submodule_status(repo):
+    result = subprocess.run(["git", "submodule", "status"], cwd=repo, capture_output=True, text=True, check=True)
+    # git在状态行末尾附加describe结果，文件探测不生成这一部分
+    return result.stdout.rstrip("\n").split(" (")[0]
+
+
+def test_status_matches_git_submodule_status(lobe_remote):
+    repo, _, _, second = lobe_remote
+    handler = GitHandler(str(repo), fetch_mode='full')
+    assert handler.read_submodule_status() == git_submodule_status(repo)  # 未初始化
+
+    handler.update_submodule()
+    assert handler.read_submodule_status() == git_submodule_status(repo)  # 已就绪
+    assert handler.is_submodule_up_to_date() is True
+
+    run_git(["checkout", "-q", second], repo / "lobe-icons")
+    assert handler.read_submodule_status() == git_submodule_status(repo)  # 检出的提交不一致
+    assert handler.is_submodule_up_to_date() is False
+
+
+def test_noop_startup_starts_no_process(ready_repo, processes, monkeypatch):
+    repo, first, _ = ready_repo
+    monkeypatch.setattr(main, "BACKGROUND_SUBMODULE_REFRESH", False)
+    processes.clear()
+    cwd = os.getcwd()
+    processor = ModelProcessor(str(repo))
+
+    assert processor.initialize()
+    assert processor.icon_matcher.index.all_icons == {"openai", "claude"}
+    assert processor.icon_library.source_version == first
+    assert processes == []
+    assert os.getcwd() == cwd
@@ -6,6 +6,16 @@
 - git_handler: Git子模块操作
 - icon_matcher: 智能图标匹配算法
 - tag_generator: 智能标签生成器
+- description_generator: 智能描述生成器
+- keyword_automaton: 规则关键词多模式匹配自动机
+- model_features: 模型特征提取
+- match_cache: 图标匹配结果缓存
+- similarity: 基于n-gram向量的相似度评分
+- bk_tree: 编辑距离BK树
+- json_backend: 可插拔JSON后端
+- processed_cache: 增量处理缓存
+- stage_timer: 阶段耗时与单次耗时分布统计
+- profiler: 性能分析（cProfile和调用栈采样）
 - logger: 统一日志系统
 """
 
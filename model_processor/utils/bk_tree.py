@@ -0,0 +1,93 @@
+"""
+BK树 - 基于编辑距离的度量索引，用于查找拼写相近的图标名称
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def levenshtein(a: str, b: str) -> int:
+    """计算两个字符串的编辑距离（插入、删除、替换各计1）"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,  # 删除
+                current[j - 1] + 1,  # 插入
+                previous[j - 1] + (char_a != char_b),  # 替换
+            ))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """BK树：利用三角不等式剪枝，查询时只访问可能满足距离要求的子树"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        # 节点: (词, {与父节点的距离: 子节点})
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self.size = 0
+        self.nodes_visited = 0  # 累计查询访问的节点数
+
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        """插入一个词（重复的词会被忽略）"""
+        if self._root is None:
+            self._root = (word, {})
+            self.size = 1
+            return
+
+        node = self._root
+        while True:
+            node_word, children = node
+            distance = levenshtein(word, node_word)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        查找编辑距离不超过max_distance的所有词
+
+        Args:
+            word: 查询词
+            max_distance: 最大编辑距离
+
+        Returns:
+            按(距离, 词)排序的结果列表
+        """
+        if self._root is None:
+            return []
+
+        results = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            self.nodes_visited += 1
+
+            distance = levenshtein(word, node_word)
+            if distance <= max_distance:
+                results.append((distance, node_word))
+
+            # 三角不等式：只有与当前节点距离在[d-k, d+k]内的子树可能包含结果
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+
+        results.sort()
+        return results
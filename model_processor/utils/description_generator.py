@@ -11,6 +11,8 @@ from typing import Dict, Any, List, Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import VENDOR_MAPPING, FUNCTION_KEYWORDS, VENDOR_TAGS, SPECIAL_RULES
 from .logger import get_logger
+from .keyword_automaton import get_rule_matcher
+from .model_features import ModelFeatures, build_model_features, is_numeric_version
 
 logger = get_logger("DescriptionGenerator")
 
@@ -23,6 +25,7 @@ class DescriptionGenerator:
         self.function_keywords = FUNCTION_KEYWORDS
         self.vendor_tags = VENDOR_TAGS
         self.special_rules = SPECIAL_RULES
+        self.rule_matcher = get_rule_matcher()
         
         # 描述模板
         self.templates = {
@@ -78,7 +81,54 @@ class DescriptionGenerator:
             '当贝': '当贝'
         }
 
-    def extract_vendor_info(self, model_name: str, model_id: str, tags: List[Dict[str, str]]) -> str:
+    def family_profile(self, features: ModelFeatures) -> Dict[str, Any]:
+        """
+        计算只依赖名称和ID关键词命中的描述素材（厂商、主要功能和特殊功能的推断结果）
+        
+        同一模型族中关键词命中相同的模型共用这些结果，标签相关的部分仍按模型单独判断。
+        
+        Args:
+            features: 模型特征
+            
+        Returns:
+            素材字典
+        """
+        hits = features.hits
+        
+        vendor = "AI"
+        for keyword in self.rule_matcher.vendor_keywords(hits):
+            vendor = self.vendor_mapping[keyword]
+            vendor = self.vendor_chinese.get(vendor, vendor.title())
+            break
+        
+        if hits & {'thinking', 'reasoning', 'r1', 'o1'}:
+            main_function = '推理思考'
+        elif hits & {'image', 'generation', 'dall-e'}:
+            main_function = '文生图'
+        elif hits & {'tts', 'speech', 'voice'}:
+            main_function = '语音处理'
+        elif hits & {'search', 'web'}:
+            main_function = '搜索检索'
+        elif hits & {'embedding', 'embed'}:
+            main_function = '嵌入向量'
+        elif hits & {'vision', 'vl', 'multimodal'}:
+            main_function = '多模态'
+        else:
+            main_function = 'default'
+        
+        return {
+            'vendor': vendor,
+            'main_function': main_function,
+            'search': 'search' in hits,
+            'vision': bool(hits & {'vision', 'vl'}),
+            'free': 'fovt' in hits,
+            'thinking': bool(hits & {'thinking', 'reasoning'}),
+            'advanced': bool(hits & {'pro', 'max', 'plus', 'ultra'}),
+        }
+
+    def extract_vendor_info(self, model_name: str, model_id: str, tags: List[Dict[str, str]],
+                            features: Optional[ModelFeatures] = None,
+                            profile: Optional[Dict[str, Any]] = None) -> str:
         """提取厂商信息"""
         try:
             # 从标签中提取厂商信息
@@ -89,43 +139,26 @@ class DescriptionGenerator:
                 if tag_name in self.vendor_chinese:
                     return self.vendor_chinese[tag_name]
             
-            # 从模型名称和ID中推断厂商
-            text_to_check = f"{model_name} {model_id}".lower()
-            
-            for keyword, vendor in self.vendor_mapping.items():
-                if keyword in text_to_check:
-                    return self.vendor_chinese.get(vendor, vendor.title())
-            
-            # 默认返回
-            return "AI"
+            # 从模型名称和ID中推断厂商（无法推断时为"AI"）
+            profile = profile or self.family_profile(features or build_model_features(model_name, model_id))
+            return profile['vendor']
             
         except Exception as e:
             logger.error(f"提取厂商信息时出错: {e}")
             return "AI"
 
-    def extract_version_info(self, model_name: str, model_id: str) -> str:
+    def extract_version_info(self, model_name: str, model_id: str,
+                             features: Optional[ModelFeatures] = None) -> str:
         """提取版本信息"""
         try:
-            text = f"{model_name} {model_id}".lower()
-            
-            # 版本模式匹配
-            version_patterns = [
-                r'(\d+\.\d+)',  # 2.5, 3.0 等
-                r'(r\d+)',      # r1, r2 等
-                r'(o\d+)',      # o1, o3 等
-                r'(v\d+)',      # v3 等
-                r'(\d+b)',      # 32b, 72b 等参数量
-            ]
-            
-            versions = []
-            for pattern in version_patterns:
-                matches = re.findall(pattern, text)
-                versions.extend(matches)
+            # 版本片段按模式优先级（数字版本、r/o/v系列、参数量）排列
+            features = features or build_model_features(model_name, model_id)
+            versions = features.versions
             
             if versions:
                 # 优先返回数字版本
                 for version in versions:
-                    if re.match(r'\d+\.\d+', version):
+                    if is_numeric_version(version):
                         return version
                 return versions[0].upper()
             
@@ -135,7 +168,9 @@ class DescriptionGenerator:
             logger.error(f"提取版本信息时出错: {e}")
             return ""
 
-    def extract_main_function(self, tags: List[Dict[str, str]], model_name: str, model_id: str) -> str:
+    def extract_main_function(self, tags: List[Dict[str, str]], model_name: str, model_id: str,
+                              features: Optional[ModelFeatures] = None,
+                              profile: Optional[Dict[str, Any]] = None) -> str:
         """提取主要功能"""
         try:
             tag_names = [tag.get('name', '') for tag in tags if isinstance(tag, dict)]
@@ -152,42 +187,30 @@ class DescriptionGenerator:
                     return func
             
             # 从模型名称推断功能
-            text = f"{model_name} {model_id}".lower()
-            
-            if any(word in text for word in ['thinking', 'reasoning', 'r1', 'o1']):
-                return '推理思考'
-            elif any(word in text for word in ['image', 'generation', 'dall-e']):
-                return '文生图'
-            elif any(word in text for word in ['tts', 'speech', 'voice']):
-                return '语音处理'
-            elif any(word in text for word in ['search', 'web']):
-                return '搜索检索'
-            elif any(word in text for word in ['embedding', 'embed']):
-                return '嵌入向量'
-            elif any(word in text for word in ['vision', 'vl', 'multimodal']):
-                return '多模态'
-            
-            return 'default'
+            profile = profile or self.family_profile(features or build_model_features(model_name, model_id))
+            return profile['main_function']
             
         except Exception as e:
             logger.error(f"提取主要功能时出错: {e}")
             return 'default'
 
-    def has_special_feature(self, model_name: str, model_id: str, tags: List[Dict[str, str]]) -> Dict[str, bool]:
+    def has_special_feature(self, model_name: str, model_id: str, tags: List[Dict[str, str]],
+                            features: Optional[ModelFeatures] = None,
+                            profile: Optional[Dict[str, Any]] = None) -> Dict[str, bool]:
         """检查特殊功能"""
         try:
-            text = f"{model_name} {model_id}".lower()
+            profile = profile or self.family_profile(features or build_model_features(model_name, model_id))
             tag_names = [tag.get('name', '') for tag in tags if isinstance(tag, dict)]
             
-            features = {
-                'search': 'search' in text or '搜索检索' in tag_names,
-                'vision': any(word in text for word in ['vision', 'vl']) or '多模态' in tag_names,
-                'free': 'fovt' in text or '免费' in tag_names,
-                'thinking': any(word in text for word in ['thinking', 'reasoning']),
-                'advanced': any(word in text for word in ['pro', 'max', 'plus', 'ultra'])
+            special_features = {
+                'search': profile['search'] or '搜索检索' in tag_names,
+                'vision': profile['vision'] or '多模态' in tag_names,
+                'free': profile['free'] or '免费' in tag_names,
+                'thinking': profile['thinking'],
+                'advanced': profile['advanced']
             }
             
-            return features
+            return special_features
             
         except Exception as e:
             logger.error(f"检查特殊功能时出错: {e}")
@@ -231,13 +254,17 @@ class DescriptionGenerator:
             logger.error(f"选择模板时出错: {e}")
             return self.templates['default']['base']
 
-    def generate_description(self, model_data: Dict[str, Any], icon_name: str = "") -> str:
+    def generate_description(self, model_data: Dict[str, Any], icon_name: str = "",
+                             features: Optional[ModelFeatures] = None,
+                             profile: Optional[Dict[str, Any]] = None) -> str:
         """
         生成模型描述
 
         Args:
             model_data: 模型数据字典
             icon_name: 匹配到的图标名称（可选）
+            features: 预先提取的模型特征（可选）
+            profile: 模型族共用的描述素材（可选，见family_profile）
 
         Returns:
             生成的描述字符串
@@ -253,19 +280,21 @@ class DescriptionGenerator:
             # 获取现有描述，如果已有描述则不覆盖
             existing_description = model_data.get('meta', {}).get('description')
             if existing_description and existing_description.strip():
-                logger.info(f"模型 '{model_name}' 已有描述，跳过生成")
+                logger.sampled("跳过描述", "模型 '%s' 已有描述，跳过生成", model_name)
                 return existing_description
 
             tags = model_data.get('meta', {}).get('tags', [])
 
             # 提取信息
-            vendor = self.extract_vendor_info(model_name, model_id, tags)
-            version = self.extract_version_info(model_name, model_id)
-            main_function = self.extract_main_function(tags, model_name, model_id)
-            features = self.has_special_feature(model_name, model_id, tags)
+            features = features or build_model_features(model_name, model_id)
+            profile = profile or self.family_profile(features)
+            vendor = self.extract_vendor_info(model_name, model_id, tags, features, profile)
+            version = self.extract_version_info(model_name, model_id, features)
+            main_function = self.extract_main_function(tags, model_name, model_id, features, profile)
+            special_features = self.has_special_feature(model_name, model_id, tags, features, profile)
 
             # 选择模板
-            template = self.select_template(main_function, features)
+            template = self.select_template(main_function, special_features)
 
             # 构建描述
             description = template.format(
@@ -277,7 +306,7 @@ class DescriptionGenerator:
             description = re.sub(r'\s+', ' ', description)
 
             # 添加特殊说明
-            if features.get('free'):
+            if special_features.get('free'):
                 if '免费' not in description:
                     description += "，提供免费AI服务"
 
@@ -285,7 +314,7 @@ class DescriptionGenerator:
             if len(description) > 200:
                 description = description[:197] + "..."
 
-            logger.info(f"为模型 '{model_name}' 生成描述: {description}")
+            logger.sampled("生成描述", "为模型 '%s' 生成描述: %s", model_name, description)
             return description
 
         except Exception as e:
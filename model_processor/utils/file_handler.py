@@ -4,13 +4,171 @@
 
 import json
 import glob
+import gzip
+import io
+import os
 import re
+import zlib
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Callable, Dict, Any, Iterable, Iterator, List, TextIO, Tuple
+from .json_backend import get_json_backend
 from .logger import get_logger
 
+try:
+    import zstandard
+except ImportError:  # 可选依赖，仅zstd压缩格式需要
+    zstandard = None
+
 logger = get_logger("FileHandler")
 
+# 导出文件名，如 models-export-7.json、models-export-7.ndjson.gz
+EXPORT_FILE_PATTERN = re.compile(r'^models-export-(\d+)\.(?:json|ndjson|jsonl)(?:\.gz|\.zst)?$')
+
+
+# 压缩格式对应的文件后缀
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# 输出格式: 'json'（indent=2格式化）、'json-min'（无空白的紧凑JSON）、'ndjson'（每行一个模型）
+OUTPUT_FORMATS = ('json', 'json-min', 'ndjson')
+
+
+def _create_compressor(compression: Optional[str]):
+    """创建增量压缩器（提供compress/flush），compression为None时返回None"""
+    if compression is None:
+        return None
+    if compression == 'gzip':
+        # wbits=31生成gzip容器格式；头部不含文件名和时间戳，相同内容的输出一致
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("zstd压缩需要安装zstandard")
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    raise ValueError(f"未知的压缩格式: {compression}")
+
+
+def detect_format(file_path: str) -> Tuple[str, Optional[str]]:
+    """
+    根据文件名后缀判断数据格式和压缩格式
+    
+    Args:
+        file_path: 文件路径，如 models-export-7.ndjson.gz
+        
+    Returns:
+        (格式: json或ndjson, 压缩格式: gzip、zstd或None)
+    """
+    name = Path(file_path).name.lower()
+    compression = None
+    for compression_name, suffix in COMPRESSION_SUFFIXES.items():
+        if name.endswith(suffix):
+            compression = compression_name
+            name = name[:-len(suffix)]
+            break
+    return ('ndjson' if name.endswith(('.ndjson', '.jsonl')) else 'json'), compression
+
+
+def output_file_name(stem: str, output_format: str = 'json', compression: Optional[str] = None) -> str:
+    """生成输出文件名，如 models-export-mod.ndjson.gz"""
+    extension = '.ndjson' if output_format == 'ndjson' else '.json'
+    return stem + extension + (COMPRESSION_SUFFIXES[compression] if compression else '')
+
+
+class JsonArrayWriter:
+    """
+    流式JSON数组写入器：逐个写入元素，输出与json.dump(列表, ensure_ascii=False, indent=indent)逐字节一致
+    （compact=True时与separators=(',', ':')的紧凑输出一致）
+    
+    内容先写入同目录下的临时文件（可边写边压缩），close时原子替换目标文件；出错时调用discard删除临时文件，
+    因此目标文件要么是完整的旧内容，要么是完整的新内容。
+    """
+    
+    # 写缓冲区大小
+    BUFFER_SIZE = 1 << 20
+    
+    def __init__(self, file_path: str, indent: Optional[int] = 2, compact: bool = False,
+                 compression: Optional[str] = None, buffer_size: int = BUFFER_SIZE):
+        self.path = Path(file_path)
+        self.temp_path = self.path.with_name(self.path.name + '.tmp')
+        self.indent = None if compact else indent
+        self.compact = compact
+        self.count = 0
+        self._compressor = _create_compressor(compression)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.temp_path, 'wb', buffering=buffer_size)
+        if self.indent is None:
+            self._separator = ',' if compact else ', '
+            self._newline = ''
+            self._item_prefix = ''
+        else:
+            self._separator = ','
+            self._newline = '\n'
+            self._item_prefix = '\n' + ' ' * self.indent
+    
+    def _write(self, text: str):
+        """编码（并压缩）后写入临时文件"""
+        data = text.encode('utf-8')
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        self._file.write(data)
+    
+    def _dumps(self, item: Any) -> str:
+        """序列化单个元素"""
+        return get_json_backend().dumps(item, self.indent, self.compact)
+    
+    def write(self, item: Any):
+        """写入一个数组元素"""
+        text = self._dumps(item)
+        if self.indent is not None:
+            # JSON字符串内部的换行已被转义，逐行加一级缩进即可
+            text = text.replace('\n', self._item_prefix)
+        self._write(('[' if self.count == 0 else self._separator) + self._item_prefix + text)
+        self.count += 1
+    
+    def _finish(self):
+        """写入结尾内容"""
+        self._write('[]' if self.count == 0 else self._newline + ']')
+    
+    def close(self):
+        """写入结尾并原子替换目标文件"""
+        self._finish()
+        if self._compressor is not None:
+            self._file.write(self._compressor.flush())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+    
+    def discard(self):
+        """放弃写入，删除临时文件，保留原有目标文件"""
+        self._file.close()
+        if self.temp_path.exists():
+            self.temp_path.unlink()
+    
+    def __enter__(self) -> 'JsonArrayWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class NdjsonWriter(JsonArrayWriter):
+    """流式NDJSON写入器：每行一个紧凑JSON元素"""
+    
+    def __init__(self, file_path: str, compression: Optional[str] = None,
+                 buffer_size: int = JsonArrayWriter.BUFFER_SIZE):
+        super().__init__(file_path, compact=True, compression=compression, buffer_size=buffer_size)
+    
+    def write(self, item: Any):
+        """写入一行"""
+        self._write(self._dumps(item) + '\n')
+        self.count += 1
+    
+    def _finish(self):
+        """NDJSON没有结尾内容"""
+
 
 class FileHandler:
     """文件操作处理器"""
@@ -18,7 +176,7 @@ class FileHandler:
     @staticmethod
     def find_latest_export_file(base_path: str = ".") -> Optional[str]:
         """
-        查找最新的models-export-*.json文件
+        查找最新的models-export-*文件（支持.json/.ndjson及其.gz/.zst压缩形式）
         
         Args:
             base_path: 搜索基础路径
@@ -28,7 +186,7 @@ class FileHandler:
         """
         try:
             # 搜索匹配的文件
-            pattern = str(Path(base_path) / "models-export-*.json")
+            pattern = str(Path(base_path) / "models-export-*")
             files = glob.glob(pattern)
             
             if not files:
@@ -40,7 +198,7 @@ class FileHandler:
             for file_path in files:
                 filename = Path(file_path).name
                 # 提取数字部分
-                match = re.search(r'models-export-(\d+)\.json', filename)
+                match = EXPORT_FILE_PATTERN.match(filename)
                 if match:
                     number = int(match.group(1))
                     file_numbers.append((number, file_path))
@@ -81,8 +239,18 @@ class FileHandler:
                 logger.error(f"路径不是文件: {file_path}")
                 return None
             
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data_format, compression = detect_format(file_path)
+            if compression is None:
+                content = path.read_bytes()
+            else:
+                with FileHandler.open_binary(file_path) as f:
+                    content = f.read()
+            
+            backend = get_json_backend()
+            if data_format == 'ndjson':
+                data = [backend.loads(line) for line in content.splitlines() if line.strip()]
+            else:
+                data = backend.loads(content)
             
             logger.info(f"成功加载JSON文件: {file_path}")
             
@@ -100,6 +268,147 @@ class FileHandler:
             logger.error(f"加载文件时出错 {file_path}: {e}")
             return None
     
+    @staticmethod
+    def open_binary(file_path: str) -> io.BufferedIOBase:
+        """按文件后缀打开文件，压缩文件边读边解压"""
+        _, compression = detect_format(file_path)
+        if compression == 'gzip':
+            return gzip.open(file_path, 'rb')
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ValueError("读取zstd压缩文件需要安装zstandard")
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True))
+        return open(file_path, 'rb')
+    
+    @staticmethod
+    def open_text(file_path: str) -> TextIO:
+        """按文件后缀以UTF-8文本方式打开文件，压缩文件边读边解压"""
+        return io.TextIOWrapper(FileHandler.open_binary(file_path), encoding='utf-8')
+    
+    @staticmethod
+    def iter_models(file_path: str) -> Iterator[Any]:
+        """
+        按文件格式流式读取模型，每次产出一个模型
+        
+        Args:
+            file_path: 输入文件路径（.json/.ndjson，可带.gz/.zst压缩后缀）
+            
+        Returns:
+            模型迭代器
+        """
+        data_format, _ = detect_format(file_path)
+        if data_format == 'ndjson':
+            return FileHandler.iter_ndjson(file_path)
+        return FileHandler.iter_json_array(file_path)
+    
+    @staticmethod
+    def iter_ndjson(file_path: str) -> Iterator[Any]:
+        """流式读取NDJSON文件，逐行产出（跳过空行）"""
+        backend = get_json_backend()
+        with FileHandler.open_binary(file_path) as f:
+            for line in f:
+                if line.strip():
+                    yield backend.loads(line)
+    
+    # 流式解析每次读取的字符数
+    STREAM_CHUNK_SIZE = 1 << 20
+    
+    @staticmethod
+    def iter_json_array(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+        """
+        流式读取JSON文件顶层数组，每次产出一个元素，内存占用与元素数量无关
+        
+        顶层不是数组时产出整个值（与load_json的列表包装行为一致）。
+        
+        Args:
+            file_path: JSON文件路径
+            chunk_size: 每次读取的字符数
+        
+        Returns:
+            元素迭代器
+        
+        Raises:
+            json.JSONDecodeError: 文件内容不是合法JSON
+        """
+        decoder = json.JSONDecoder()
+        
+        with FileHandler.open_text(file_path) as f:
+            buffer = f.read(chunk_size)
+            position = 0
+            eof = not buffer
+            
+            def fill(min_size: int = 0) -> bool:
+                """丢弃已解析部分并追加读取，读到文件末尾时返回False"""
+                nonlocal buffer, position, eof
+                if eof:
+                    return False
+                chunk = f.read(max(chunk_size, min_size))
+                buffer = buffer[position:] + chunk
+                position = 0
+                eof = not chunk
+                return not eof
+            
+            def skip_whitespace() -> bool:
+                """跳过空白，缓冲区中还有内容时返回True"""
+                nonlocal position
+                while True:
+                    while position < len(buffer) and buffer[position] in ' \t\r\n':
+                        position += 1
+                    if position < len(buffer):
+                        return True
+                    if not fill():
+                        return False
+            
+            def decode_value() -> Any:
+                """从当前位置解码一个完整的值，必要时继续读取（单个值跨越多个块时逐次加大读取量）"""
+                nonlocal position
+                min_size = chunk_size
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buffer, position)
+                        # 数字等值可能恰好在块末尾被截断，需读到后续字符才能确定
+                        if end < len(buffer) or eof:
+                            position = end
+                            return value
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                    min_size *= 2
+                    fill(min_size)
+            
+            if not skip_whitespace():
+                return
+            
+            if buffer[position] != '[':
+                value = decode_value()
+                if value:
+                    yield value
+                return
+            
+            position += 1
+            expect_value = True
+            first = True
+            while True:
+                if not skip_whitespace():
+                    raise json.JSONDecodeError("数组未结束", buffer, position)
+                char = buffer[position]
+                if char == ']' and (first or not expect_value):
+                    return
+                if not expect_value:
+                    if char != ',':
+                        raise json.JSONDecodeError("数组元素之间缺少逗号", buffer, position)
+                    position += 1
+                    expect_value = True
+                    continue
+                
+                yield decode_value()
+                expect_value = False
+                first = False
+                # 已解析部分超过半个缓冲区时再整体截断，避免每个元素都复制缓冲区
+                if position > len(buffer) // 2 and position > chunk_size:
+                    buffer = buffer[position:]
+                    position = 0
+    
     @staticmethod
     def save_json(data: List[Dict[Any, Any]], file_path: str, indent: int = 2) -> bool:
         """
@@ -120,7 +429,7 @@ class FileHandler:
             path.parent.mkdir(parents=True, exist_ok=True)
             
             with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=indent)
+                f.write(get_json_backend().dumps(data, indent))
             
             logger.info(f"成功保存JSON文件: {file_path}")
             return True
@@ -129,6 +438,63 @@ class FileHandler:
             logger.error(f"保存文件时出错 {file_path}: {e}")
             return False
     
+    @staticmethod
+    def open_json_writer(file_path: str, output_format: str = 'json', compression: Optional[str] = None,
+                         indent: Optional[int] = 2) -> JsonArrayWriter:
+        """
+        创建流式写入器（作为上下文管理器使用：正常退出时原子替换目标文件，出错时丢弃临时文件）
+        
+        Args:
+            file_path: 目标文件路径
+            output_format: 输出格式，见OUTPUT_FORMATS
+            compression: 压缩格式: None、'gzip'或'zstd'
+            indent: json格式的缩进
+            
+        Returns:
+            写入器
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"未知的输出格式: {output_format}")
+        if output_format == 'ndjson':
+            return NdjsonWriter(file_path, compression)
+        return JsonArrayWriter(file_path, indent, output_format == 'json-min', compression)
+    
+    @staticmethod
+    def save_json_stream(items: Iterable[Any], file_path: str, output_format: str = 'json',
+                         compression: Optional[str] = None, indent: Optional[int] = 2,
+                         on_write: Optional[Callable[[float], None]] = None) -> bool:
+        """
+        边产出边写入（大块缓冲写入，可边写边压缩，完成后原子替换目标文件）
+        
+        Args:
+            items: 要保存的元素序列，可以是生成器
+            file_path: 目标文件路径
+            output_format: 输出格式，见OUTPUT_FORMATS
+            compression: 压缩格式: None、'gzip'或'zstd'
+            indent: json格式的缩进
+            on_write: 每写入一个元素后以写入耗时（秒）调用（可选，用于阶段计时）
+            
+        Returns:
+            保存成功返回True，失败返回False（目标文件保持不变）
+        """
+        try:
+            writer = FileHandler.open_json_writer(file_path, output_format, compression, indent)
+            with writer:
+                for item in items:
+                    if on_write is None:
+                        writer.write(item)
+                        continue
+                    started = time.perf_counter()
+                    writer.write(item)
+                    on_write(time.perf_counter() - started)
+            
+            logger.info(f"成功保存JSON文件: {file_path} ({writer.count}条)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"保存文件时出错 {file_path}: {e}")
+            return False
+    
     @staticmethod
     def validate_file(file_path: str) -> bool:
         """
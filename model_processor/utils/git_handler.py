@@ -2,21 +2,56 @@
 Git子模块操作工具
 """
 
+import struct
 import subprocess
-import os
+import sys
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
+
+# 添加父目录到Python路径以支持导入config
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import SUBMODULE_FETCH_MODE, SUBMODULE_FETCH_DEPTH, SUBMODULE_SYNC_RECORDED, ICON_MANIFEST_SOURCE
 from .logger import get_logger
 
 logger = get_logger("GitHandler")
 
 
+class GitTreeManifest:
+    """基于git树对象的图标清单，直接读取子模块中的目录树，无需检出工作区"""
+    
+    def __init__(self, git_handler: 'GitHandler', rel_path: str):
+        self.git_handler = git_handler
+        self.rel_path = rel_path  # 相对于lobe-icons的目录
+        self._tree_hash: Optional[str] = None
+    
+    def tree_hash(self) -> str:
+        """目录对应的树对象哈希（读取一次后缓存），无法解析时返回空字符串"""
+        if self._tree_hash is None:
+            self._tree_hash = self.git_handler.get_tree_hash(self.rel_path)
+        return self._tree_hash
+    
+    def file_names(self) -> List[str]:
+        """目录下的文件名列表"""
+        tree_hash = self.tree_hash()
+        if not tree_hash:
+            return []
+        return self.git_handler.list_tree_names(tree_hash)
+
+
 class GitHandler:
     """Git操作处理器"""
     
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", fetch_mode: str = SUBMODULE_FETCH_MODE,
+                 sparse_paths: Optional[Iterable[str]] = None, manifest_source: str = ICON_MANIFEST_SOURCE,
+                 sync_recorded: bool = SUBMODULE_SYNC_RECORDED):
         self.repo_path = Path(repo_path).absolute()
         self.lobe_icons_path = self.repo_path / "lobe-icons"
+        self.fetch_mode = fetch_mode  # full 或 sparse
+        self.sync_recorded = sync_recorded  # 检出的提交与gitlink不一致时是否更新到记录的提交
+        # 稀疏检出的目录（相对于lobe-icons）
+        self.sparse_paths = list(sparse_paths) if sparse_paths else ["packages/static-png/light"]
+        self.manifest_source = manifest_source  # filesystem 或 git
+        self._tree_hashes: Dict[str, str] = {}  # 目录 -> 树对象哈希，子模块更新后清空
     
     def update_submodule(self) -> Tuple[bool, str]:
         """
@@ -25,32 +60,22 @@ class GitHandler:
         Returns:
             (成功状态, 输出信息)
         """
+        self._tree_hashes.clear()
+        if self.fetch_mode == 'sparse':
+            return self.sparse_update_submodule()
+        
         try:
             logger.info("开始更新git子模块...")
             
-            # 切换到仓库目录
-            original_cwd = os.getcwd()
-            os.chdir(self.repo_path)
-            
-            try:
-                # 执行git submodule update命令
-                result = subprocess.run(
-                    ["git", "submodule", "update", "--init", "--recursive"],
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5分钟超时
-                )
-                
-                if result.returncode == 0:
-                    logger.info("Git子模块更新成功")
-                    return True, result.stdout
-                else:
-                    logger.error(f"Git子模块更新失败: {result.stderr}")
-                    return False, result.stderr
-                    
-            finally:
-                # 恢复原始工作目录
-                os.chdir(original_cwd)
+            # 执行git submodule update命令（5分钟超时）
+            result = self._run_git(["submodule", "update", "--init", "--recursive"], self.repo_path, timeout=300)
+            
+            if result.returncode == 0:
+                logger.info("Git子模块更新成功")
+                return True, result.stdout
+            else:
+                logger.error(f"Git子模块更新失败: {result.stderr}")
+                return False, result.stderr
                 
         except subprocess.TimeoutExpired:
             logger.error("Git子模块更新超时")
@@ -62,45 +87,252 @@ class GitHandler:
             logger.error(f"更新子模块时出错: {e}")
             return False, str(e)
     
+    def _run_git(self, args: List[str], cwd: Path, timeout: int = 300) -> subprocess.CompletedProcess:
+        """在指定目录执行git命令（不改变进程工作目录）"""
+        return subprocess.run(
+            ["git"] + args,
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    
+    def get_recorded_commit(self) -> str:
+        """
+        获取主仓库中记录的lobe-icons子模块提交（gitlink）
+        
+        优先直接从主仓库的index文件读取，无法解析时回退到git ls-tree。
+        
+        Returns:
+            提交哈希，无法确定时返回空字符串
+        """
+        git_dir = self._resolve_git_dir(self.repo_path)
+        if git_dir is None:
+            return ""
+        
+        try:
+            commit = self._read_index_gitlink(git_dir, "lobe-icons")
+            if commit is not None:
+                return commit
+        except Exception as e:
+            logger.debug(f"解析主仓库index失败，回退到git命令: {e}")
+        
+        result = self._run_git(["ls-tree", "HEAD", "lobe-icons"], self.repo_path, timeout=30)
+        if result.returncode != 0 or not result.stdout.strip():
+            return ""
+        # 输出格式: 160000 commit <sha>\tlobe-icons
+        return result.stdout.split()[2]
+    
+    def sparse_update_submodule(self, url: Optional[str] = None, commit: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        以浅克隆 + blob:none部分克隆 + 稀疏检出的方式获取lobe-icons，只检出sparse_paths中的目录
+        
+        使用本地裸仓库作为url时，裸仓库需开启uploadpack.allowFilter和uploadpack.allowAnySHA1InWant，
+        并以file://形式传入，否则--depth和--filter不会生效。
+        
+        Args:
+            url: 远程仓库地址，默认读取.gitmodules中的配置
+            commit: 要检出的提交，默认为主仓库记录的gitlink
+            
+        Returns:
+            (成功状态, 输出信息)
+        """
+        self._tree_hashes.clear()
+        try:
+            logger.info(f"开始稀疏获取lobe-icons子模块: {', '.join(self.sparse_paths)}")
+            
+            if url is None:
+                result = self._run_git(
+                    ["config", "-f", ".gitmodules", "--get", "submodule.lobe-icons.url"], self.repo_path, timeout=30
+                )
+                url = result.stdout.strip()
+                if not url:
+                    return False, "未在.gitmodules中找到lobe-icons的url"
+            
+            if commit is None:
+                commit = self.get_recorded_commit()
+            
+            # 登记子模块，使git submodule status等命令能识别它
+            self._run_git(["submodule", "init", "lobe-icons"], self.repo_path, timeout=30)
+            
+            self.lobe_icons_path.mkdir(parents=True, exist_ok=True)
+            icons_path = self.lobe_icons_path
+            depth = str(SUBMODULE_FETCH_DEPTH)
+            
+            steps = [
+                ["init", "-q"],
+                ["remote", "remove", "origin"],
+                ["remote", "add", "origin", url],
+                ["config", "extensions.partialClone", "origin"],
+                ["sparse-checkout", "init", "--cone"],
+                ["sparse-checkout", "set"] + self.sparse_paths,
+            ]
+            for args in steps:
+                result = self._run_git(args, icons_path, timeout=60)
+                # remote remove在首次获取时必然失败，可以忽略
+                if result.returncode != 0 and args[:2] != ["remote", "remove"]:
+                    logger.error(f"稀疏获取失败 (git {' '.join(args)}): {result.stderr}")
+                    return False, result.stderr
+            
+            fetch_args = ["fetch", "--depth", depth, "--filter=blob:none", "origin"]
+            result = self._run_git(fetch_args + [commit] if commit else fetch_args, icons_path)
+            if result.returncode != 0 and commit:
+                # 远程不允许按提交获取时退回到默认分支
+                logger.warning(f"无法获取记录的提交{commit[:8]}，改为获取默认分支: {result.stderr.strip()}")
+                result = self._run_git(fetch_args, icons_path)
+            if result.returncode != 0:
+                logger.error(f"稀疏获取失败: {result.stderr}")
+                return False, result.stderr
+            
+            if self.manifest_source == 'git':
+                # 图标清单直接从树对象读取，只移动HEAD，不检出工作区
+                result = self._run_git(["update-ref", "--no-deref", "HEAD", "FETCH_HEAD"], icons_path)
+            else:
+                result = self._run_git(["checkout", "-q", "--detach", "FETCH_HEAD"], icons_path)
+            if result.returncode != 0:
+                logger.error(f"检出lobe-icons失败: {result.stderr}")
+                return False, result.stderr
+            
+            logger.info("lobe-icons子模块稀疏获取成功")
+            return True, result.stdout
+            
+        except subprocess.TimeoutExpired:
+            logger.error("稀疏获取子模块超时")
+            return False, "操作超时"
+        except FileNotFoundError:
+            logger.error("未找到git命令，请确保git已安装")
+            return False, "git命令未找到"
+        except Exception as e:
+            logger.error(f"稀疏获取子模块时出错: {e}")
+            return False, str(e)
+    
     def check_submodule_status(self) -> Tuple[bool, str]:
         """
         检查子模块状态
         
+        直接比较主仓库index中的gitlink和子模块git目录中的HEAD，不启动git进程；
+        无法解析时回退到git submodule status。状态信息格式与git submodule status一致：
+        前缀'-'表示未初始化，'+'表示检出的提交与记录不一致。
+        
         Returns:
             (状态正常, 状态信息)
         """
         try:
-            original_cwd = os.getcwd()
-            os.chdir(self.repo_path)
-            
-            try:
-                result = subprocess.run(
-                    ["git", "submodule", "status"],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if result.returncode == 0:
-                    status_output = result.stdout.strip()
-                    logger.info(f"子模块状态: {status_output}")
-                    
-                    # 检查是否有未初始化的子模块（以-开头）
-                    if status_output.startswith('-'):
-                        return False, "子模块未初始化"
-                    
-                    return True, status_output
-                else:
+            status_output = self.read_submodule_status()
+            if status_output is None:
+                result = self._run_git(["submodule", "status"], self.repo_path, timeout=30)
+                if result.returncode != 0:
                     logger.error(f"检查子模块状态失败: {result.stderr}")
                     return False, result.stderr
-                    
-            finally:
-                os.chdir(original_cwd)
+                status_output = result.stdout.strip()
+            
+            logger.info(f"子模块状态: {status_output}")
+            
+            # 检查是否有未初始化的子模块（以-开头）
+            if status_output.startswith('-'):
+                return False, "子模块未初始化"
+            
+            return True, status_output
                 
         except Exception as e:
             logger.error(f"检查子模块状态时出错: {e}")
             return False, str(e)
     
+    def read_submodule_status(self) -> Optional[str]:
+        """
+        通过读取git文件生成lobe-icons的子模块状态行
+        
+        Returns:
+            状态行（如 " <sha> lobe-icons"），无法仅凭文件确定时返回None
+        """
+        git_dir = self._resolve_git_dir(self.repo_path)
+        if git_dir is None:
+            return None
+        
+        try:
+            recorded = self._read_index_gitlink(git_dir, "lobe-icons")
+        except Exception as e:
+            logger.debug(f"解析主仓库index失败: {e}")
+            return None
+        if not recorded:
+            return None
+        
+        submodule_git_dir = self._resolve_submodule_git_dir()
+        head = self._read_head_commit(submodule_git_dir) if submodule_git_dir else ""
+        if not head:
+            return f"-{recorded} lobe-icons"
+        prefix = " " if head == recorded else "+"
+        return f"{prefix}{head} lobe-icons"
+    
+    def is_submodule_up_to_date(self) -> Optional[bool]:
+        """
+        判断子模块检出的提交是否与主仓库记录的gitlink一致
+        
+        Returns:
+            一致返回True，不一致返回False，无法确定时返回None
+        """
+        status_output = self.read_submodule_status()
+        if status_output is None:
+            return None
+        return status_output.startswith(" ")
+    
+    def get_tree_hash(self, rel_path: str) -> str:
+        """
+        获取子模块HEAD中某个目录的树对象哈希
+        
+        Args:
+            rel_path: 相对于lobe-icons的目录
+            
+        Returns:
+            树对象哈希，目录不存在或无法读取时返回空字符串
+        """
+        rel_path = rel_path.rstrip("/")
+        if rel_path in self._tree_hashes:
+            return self._tree_hashes[rel_path]
+        
+        try:
+            result = self._run_git(["ls-tree", "HEAD", rel_path], self.lobe_icons_path, timeout=30)
+            # 输出格式: 040000 tree <hash>\t<path>
+            parts = result.stdout.split()
+            if result.returncode == 0 and len(parts) >= 3 and parts[1] == "tree":
+                self._tree_hashes[rel_path] = parts[2]
+                return parts[2]
+            return ""
+        except Exception as e:
+            logger.warning(f"读取git树对象时出错 {rel_path}: {e}")
+            return ""
+    
+    def list_tree_names(self, tree_hash: str) -> List[str]:
+        """列出树对象中的条目名称"""
+        result = self._run_git(["ls-tree", "--name-only", tree_hash], self.lobe_icons_path, timeout=60)
+        if result.returncode != 0:
+            logger.error(f"读取git树对象失败 {tree_hash}: {result.stderr}")
+            return []
+        return result.stdout.splitlines()
+    
+    def get_manifest(self, rel_path: str) -> GitTreeManifest:
+        """获取目录的git树清单"""
+        return GitTreeManifest(self, rel_path)
+    
+    def validate_icon_manifest(self) -> bool:
+        """
+        验证子模块git对象中存在图标目录（git清单模式，不要求检出工作区）
+        
+        Returns:
+            图标目录树存在返回True
+        """
+        if not self._resolve_submodule_git_dir():
+            logger.error("lobe-icons子模块的git目录不存在")
+            return False
+        
+        tree_hash = self.get_tree_hash("packages/static-png/light")
+        if not tree_hash:
+            logger.error("lobe-icons的git树中不存在packages/static-png/light目录")
+            return False
+        
+        logger.info(f"lobe-icons图标清单验证成功 (树对象 {tree_hash[:8]})")
+        return True
+    
     def validate_lobe_icons(self) -> bool:
         """
         验证lobe-icons目录结构
@@ -108,6 +340,9 @@ class GitHandler:
         Returns:
             目录结构有效返回True
         """
+        if self.manifest_source == 'git':
+            return self.validate_icon_manifest()
+        
         try:
             # 检查主目录
             if not self.lobe_icons_path.exists():
@@ -136,19 +371,159 @@ class GitHandler:
                 logger.error("lobe-icons/packages/static-png/light目录不存在")
                 return False
             
-            # 检查是否有图标文件
-            icon_files = list(light_path.glob("*.png"))
-            if not icon_files:
+            # 检查是否有图标文件（找到一个即可，完整扫描由IconIndex负责）
+            if not any(light_path.glob("*.png")):
                 logger.error("lobe-icons/packages/static-png/light目录中没有PNG文件")
                 return False
             
-            logger.info(f"lobe-icons目录结构验证成功，找到{len(icon_files)}个图标文件")
+            logger.info("lobe-icons目录结构验证成功")
             return True
             
         except Exception as e:
             logger.error(f"验证lobe-icons目录时出错: {e}")
             return False
     
+    def get_submodule_commit(self) -> str:
+        """
+        获取lobe-icons子模块当前检出的提交
+        
+        Returns:
+            提交哈希，无法确定时返回空字符串
+        """
+        try:
+            git_dir = self._resolve_submodule_git_dir()
+            if not git_dir:
+                return ""
+            
+            commit = self._read_head_commit(git_dir)
+            if commit:
+                return commit
+            
+            # 无法直接解析引用时回退到git命令
+            result = self._run_git(["rev-parse", "HEAD"], self.lobe_icons_path, timeout=30)
+            if result.returncode == 0:
+                return result.stdout.strip()
+            return ""
+            
+        except Exception as e:
+            logger.warning(f"获取子模块提交时出错: {e}")
+            return ""
+    
+    def _resolve_submodule_git_dir(self) -> Optional[Path]:
+        """解析子模块的git目录（.git可能是目录，也可能是指向.git/modules的gitdir文件）"""
+        return self._resolve_git_dir(self.lobe_icons_path)
+    
+    @staticmethod
+    def _resolve_git_dir(work_tree: Path) -> Optional[Path]:
+        """解析工作区的git目录（.git为目录或gitdir文件），不存在时返回None"""
+        dot_git = work_tree / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text(encoding='utf-8').strip()
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:"):].strip())
+                if not git_dir.is_absolute():
+                    git_dir = work_tree / git_dir
+                return git_dir
+        return None
+    
+    @staticmethod
+    def _read_index_gitlink(git_dir: Path, path: str) -> Optional[str]:
+        """
+        从git index文件中读取gitlink条目（mode 160000）记录的提交
+        
+        支持index版本2-4；sha256仓库和拆分index（split index）等无法处理的情况返回None，
+        由调用方回退到git命令。
+        
+        Args:
+            git_dir: 主仓库的git目录
+            path: 子模块路径
+            
+        Returns:
+            提交哈希；index中没有该gitlink时返回空字符串；无法解析时返回None
+        """
+        index_file = git_dir / "index"
+        if not index_file.exists():
+            return None
+        
+        config_file = git_dir / "config"
+        if config_file.exists() and "objectformat" in config_file.read_text(encoding='utf-8').lower():
+            return None
+        
+        data = index_file.read_bytes()
+        if len(data) < 12 or data[:4] != b"DIRC":
+            return None
+        version, entry_count = struct.unpack(">II", data[4:12])
+        if version not in (2, 3, 4):
+            return None
+        
+        target = path.encode('utf-8')
+        offset = 12
+        previous_name = b""
+        for _ in range(entry_count):
+            entry_start = offset
+            # ctime(8) mtime(8) dev ino mode uid gid size(各4) sha1(20) flags(2)
+            mode = struct.unpack(">I", data[offset + 24:offset + 28])[0]
+            sha = data[offset + 40:offset + 60]
+            flags = struct.unpack(">H", data[offset + 60:offset + 62])[0]
+            offset += 62
+            if flags & 0x4000:  # 扩展标志（版本3及以上）
+                offset += 2
+            
+            if version == 4:
+                # 名称前缀压缩：变长整数表示从上一个名称末尾去掉的字节数
+                strip = data[offset] & 0x7f
+                while data[offset] & 0x80:
+                    offset += 1
+                    strip = ((strip + 1) << 7) | (data[offset] & 0x7f)
+                offset += 1
+                name_end = data.index(b"\0", offset)
+                name = previous_name[:len(previous_name) - strip] + data[offset:name_end]
+                offset = name_end + 1
+            else:
+                name_end = data.index(b"\0", offset)
+                name = data[offset:name_end]
+                # 条目按8字节对齐，名称后至少有一个NUL
+                offset = entry_start + ((name_end - entry_start) // 8 + 1) * 8
+            previous_name = name
+            
+            if name == target:
+                return sha.hex() if mode == 0o160000 else ""
+        
+        # 拆分index（link扩展）时共享部分的条目不在此文件中
+        while offset + 8 <= len(data) - 20:
+            signature = data[offset:offset + 4]
+            size = struct.unpack(">I", data[offset + 4:offset + 8])[0]
+            if signature == b"link":
+                return None
+            offset += 8 + size
+        return ""
+    
+    @staticmethod
+    def _read_head_commit(git_dir: Path) -> str:
+        """读取git目录中HEAD指向的提交（支持分离HEAD、松散引用和packed-refs）"""
+        head_file = git_dir / "HEAD"
+        if not head_file.exists():
+            return ""
+        
+        head = head_file.read_text(encoding='utf-8').strip()
+        if not head.startswith("ref:"):
+            return head
+        
+        ref = head[len("ref:"):].strip()
+        ref_file = git_dir / ref
+        if ref_file.exists():
+            return ref_file.read_text(encoding='utf-8').strip()
+        
+        packed_refs = git_dir / "packed-refs"
+        if packed_refs.exists():
+            for line in packed_refs.read_text(encoding='utf-8').splitlines():
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+        return ""
+    
     def get_lobe_icons_path(self) -> Optional[Path]:
         """
         获取lobe-icons图标目录路径
@@ -169,12 +544,18 @@ class GitHandler:
         """
         logger.info("检查lobe-icons子模块状态...")
         
-        # 首先检查目录结构
+        # 首先检查目录结构，再比较检出的提交与主仓库记录（只读取git文件，不启动进程）
         if self.validate_lobe_icons():
-            logger.info("lobe-icons子模块已准备就绪")
-            return True
+            if self.is_submodule_up_to_date() is not False:
+                logger.info("lobe-icons子模块已准备就绪")
+                return True
+            if not self.sync_recorded:
+                logger.warning("lobe-icons子模块检出的提交与主仓库记录不一致，保留当前检出"
+                               "（设置SUBMODULE_SYNC_RECORDED可更新到记录的提交）")
+                return True
+            logger.info("lobe-icons子模块检出的提交与主仓库记录不一致")
         
-        # 如果目录结构不完整，尝试更新子模块
+        # 如果目录结构不完整（或开启同步时提交不一致），尝试更新子模块
         logger.info("lobe-icons子模块需要更新...")
         success, message = self.update_submodule()
         
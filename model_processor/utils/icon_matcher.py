@@ -2,16 +2,33 @@
 智能图标匹配算法
 """
 
-import re
+import hashlib
+import json
+import os
 import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Set, TYPE_CHECKING
 from dataclasses import dataclass
 
 # 添加父目录到Python路径以支持导入config
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import VENDOR_MAPPING, ICON_BASE_URL
+from config import (
+    VENDOR_MAPPING, ICON_BASE_URL, MATCH_CACHE_SIZE,
+    ICON_VARIANTS, DEFAULT_ICON_VARIANT, ICON_INDEX_CACHE_FILE,
+    FUZZY_MATCH_MODE, SIMILARITY_NGRAM_SIZE, SIMILARITY_MIN_SCORE,
+    ENABLE_EDIT_DISTANCE_MATCH, EDIT_DISTANCE_MAX, EDIT_DISTANCE_MIN_LENGTH
+)
 from .logger import get_logger
+from .keyword_automaton import KeywordAutomaton, get_rule_matcher
+from .model_features import ModelFeatures, build_model_features, extract_keywords, normalize_name
+from .match_cache import MatchCache
+from .similarity import NgramSimilarityScorer
+from .bk_tree import BKTree
+from .stage_timer import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .git_handler import GitHandler, GitTreeManifest
 
 logger = get_logger("IconMatcher")
 
@@ -29,44 +46,235 @@ class MatchResult:
 class IconIndex:
     """图标索引管理器"""
     
-    def __init__(self, icons_path: Path):
+    # 子串倒排索引使用的n-gram长度
+    NGRAM_SIZE = 3
+    # 索引快照格式版本，结构变化时递增以淘汰旧缓存
+    SNAPSHOT_VERSION = 2
+    
+    def __init__(self, icons_path: Path, cache_file: Optional[Path] = None, source_version: str = "",
+                 extension: str = "png", base_url: str = ICON_BASE_URL,
+                 manifest: Optional['GitTreeManifest'] = None, stale_ok: bool = False):
         self.icons_path = icons_path
+        self.manifest = manifest  # git树清单，设置后不再扫描icons_path
+        self.extension = extension  # 图标文件扩展名（不含点）
+        self.base_url = base_url
+        self.cache_file = cache_file  # 索引快照文件，为None时不使用缓存
+        self.source_version = source_version  # 图标来源版本（lobe-icons子模块提交）
+        self.stale_ok = stale_ok  # 为True时只加载上一次保存的快照，不校验快照键也不扫描目录
+        self.loaded_from_cache = False
+        self.snapshot_key = ""  # 子模块提交 + 图标目录修改时间
         self.color_icons: Dict[str, str] = {}  # 带-color后缀的图标
         self.normal_icons: Dict[str, str] = {}  # 普通图标
         self.all_icons: Set[str] = set()  # 所有图标名称（不含扩展名）
+        self.icon_order: Dict[str, int] = {}  # 图标在all_icons迭代顺序中的位置
+        self.ngram_index: Dict[str, Set[str]] = {}  # n-gram -> 包含该片段的图标
+        self.icon_automaton = KeywordAutomaton(())  # 用于查找候选串中包含的图标名
+        self._bk_tree = None  # type: Optional[BKTree]
         self._build_index()
     
     def _build_index(self):
         """构建图标索引"""
         try:
-            if not self.icons_path.exists():
+            if self.stale_ok:
+                if self._load_snapshot(None):
+                    self.loaded_from_cache = True
+                    logger.info(f"加载上一次的图标索引缓存 [{self.snapshot_key}]: {len(self.all_icons)}个图标")
+                return
+            
+            if self.manifest is None and not self.icons_path.exists():
                 logger.error(f"图标目录不存在: {self.icons_path}")
                 return
             
-            png_files = list(self.icons_path.glob("*.png"))
-            logger.info(f"找到{len(png_files)}个PNG文件")
+            snapshot_key = self._snapshot_key()
+            if not snapshot_key:
+                logger.error(f"无法读取图标清单: {self.icons_path}")
+                return
+            self.snapshot_key = snapshot_key
+            if self._load_snapshot(snapshot_key):
+                self.loaded_from_cache = True
+                logger.info(f"从缓存加载图标索引: {len(self.color_icons)}个彩色图标, {len(self.normal_icons)}个普通图标")
+                return
             
-            for png_file in png_files:
-                name = png_file.stem  # 不含扩展名的文件名
-                self.all_icons.add(name)
-                
-                if name.endswith('-color'):
-                    # 带颜色后缀的图标
-                    base_name = name[:-6]  # 去掉-color后缀
-                    self.color_icons[base_name] = name
-                    self.color_icons[name] = name  # 也支持完整名称匹配
-                else:
-                    # 普通图标
-                    self.normal_icons[name] = name
+            suffix = f".{self.extension}"
+            if self.manifest is not None:
+                file_names = self.manifest.file_names()
+            else:
+                # 直接读取目录项名称，避免为每个文件创建Path对象
+                with os.scandir(self.icons_path) as entries:
+                    file_names = [entry.name for entry in entries]
+            icon_names = [name[:-len(suffix)] for name in file_names if name.endswith(suffix)]
+            logger.info(f"找到{len(icon_names)}个{self.extension.upper()}文件")
+            
+            self._index_icon_names(icon_names)
             
             logger.info(f"索引构建完成: {len(self.color_icons)}个彩色图标, {len(self.normal_icons)}个普通图标")
             
+            self._save_snapshot(snapshot_key)
+            
         except Exception as e:
             logger.error(f"构建图标索引时出错: {e}")
     
+    def _index_icon_names(self, icon_names: Iterable[str]):
+        """按图标名称（不含扩展名）建立彩色/普通图标表和模糊匹配用的子串索引"""
+        for name in icon_names:
+            self.all_icons.add(name)
+            
+            if name.endswith('-color'):
+                # 带颜色后缀的图标
+                base_name = name[:-6]  # 去掉-color后缀
+                self.color_icons[base_name] = name
+                self.color_icons[name] = name  # 也支持完整名称匹配
+            else:
+                # 普通图标
+                self.normal_icons[name] = name
+        
+        self._build_search_index()
+    
+    def _build_search_index(self):
+        """构建模糊匹配用的子串索引"""
+        self._build_icon_order()
+        
+        # 长度不超过NGRAM_SIZE的所有子串都入索引：短查询直接命中，长查询取交集后校验
+        self.ngram_index = {}
+        for name in self.all_icons:
+            for size in range(1, self.NGRAM_SIZE + 1):
+                for start in range(len(name) - size + 1):
+                    self.ngram_index.setdefault(name[start:start + size], set()).add(name)
+        
+        self.icon_automaton = KeywordAutomaton(self.all_icons)
+    
+    @property
+    def bk_tree(self) -> BKTree:
+        """图标基础名称（去掉-color后缀）的BK树，首次使用时构建"""
+        if self._bk_tree is None:
+            base_names = sorted({name[:-6] if name.endswith('-color') else name for name in self.all_icons})
+            self._bk_tree = BKTree(base_names)
+        return self._bk_tree
+    
+    def _build_icon_order(self):
+        """记录集合的迭代顺序，使索引查询与逐个遍历all_icons时选出同一个图标"""
+        self.icon_order = {name: order for order, name in enumerate(self.all_icons)}
+    
+    def _snapshot_key(self) -> str:
+        """生成快照键：git清单模式下为目录树对象哈希，否则为子模块提交 + 图标目录修改时间"""
+        if self.manifest is not None:
+            tree_hash = self.manifest.tree_hash()
+            return f"tree:{tree_hash}" if tree_hash else ""
+        return f"{self.source_version}:{self.icons_path.stat().st_mtime_ns}"
+    
+    def _load_snapshot(self, snapshot_key: Optional[str]) -> bool:
+        """
+        从快照文件加载索引
+        
+        Args:
+            snapshot_key: 当前图标目录对应的快照键，为None时接受任意键（加载后写入snapshot_key和source_version）
+            
+        Returns:
+            快照有效且加载成功返回True
+        """
+        if not self.cache_file or not self.cache_file.exists():
+            return False
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            
+            if (snapshot.get('version') != self.SNAPSHOT_VERSION
+                    or (snapshot_key is not None and snapshot.get('key') != snapshot_key)
+                    or snapshot.get('icons_path') != str(self.icons_path)):
+                logger.info("图标索引缓存已过期，重新扫描图标目录")
+                return False
+            
+            # 快照只保存图标名称，图标表和子串索引加载后重新建立
+            self._index_icon_names(snapshot['all_icons'])
+            self.snapshot_key = snapshot['key']
+            if snapshot_key is None:
+                self.source_version = snapshot.get('source_version', self.source_version)
+            return True
+            
+        except Exception as e:
+            logger.warning(f"读取图标索引缓存失败，将重新构建: {e}")
+            self._clear_index()
+            return False
+    
+    def _clear_index(self):
+        """清空图标表和所有由图标名称派生的索引（快照加载到一半失败时使用）"""
+        self.color_icons = {}
+        self.normal_icons = {}
+        self.all_icons = set()
+        self.icon_order = {}
+        self.ngram_index = {}
+        self.icon_automaton = KeywordAutomaton(())
+        self._bk_tree = None
+    
+    def _save_snapshot(self, snapshot_key: str):
+        """将图标名称写入快照文件（先写临时文件再原子替换）"""
+        if not self.cache_file:
+            return
+        
+        try:
+            snapshot = {
+                'version': self.SNAPSHOT_VERSION,
+                'key': snapshot_key,
+                'source_version': self.source_version,
+                'icons_path': str(self.icons_path),
+                'all_icons': sorted(self.all_icons),
+            }
+            
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_file, self.cache_file)
+            logger.info(f"图标索引缓存已保存: {self.cache_file}")
+            
+        except Exception as e:
+            logger.warning(f"保存图标索引缓存失败: {e}")
+    
+    def find_containment_matches(self, candidate: str) -> Set[str]:
+        """
+        查找与候选串存在包含关系的图标（candidate in icon 或 icon in candidate）
+        
+        Args:
+            candidate: 标准化后的候选名称
+            
+        Returns:
+            满足包含关系的图标名称集合
+        """
+        if not candidate:
+            return set()
+        
+        # icon in candidate：一次自动机扫描
+        matches = self.icon_automaton.find_keywords(candidate)
+        
+        # candidate in icon：n-gram倒排索引
+        size = self.NGRAM_SIZE
+        if len(candidate) <= size:
+            matches.update(self.ngram_index.get(candidate, ()))
+            return matches
+        
+        postings = []
+        for start in range(len(candidate) - size + 1):
+            posting = self.ngram_index.get(candidate[start:start + size])
+            if not posting:
+                return matches
+            postings.append(posting)
+        
+        postings.sort(key=len)
+        shared = postings[0].intersection(*postings[1:])
+        matches.update(name for name in shared if candidate in name)
+        return matches
+    
+    def first_containment_match(self, candidate: str) -> Optional[str]:
+        """返回按all_icons迭代顺序第一个与候选串存在包含关系的图标"""
+        matches = self.find_containment_matches(candidate)
+        if not matches:
+            return None
+        return min(matches, key=self.icon_order.__getitem__)
+    
     def get_icon_url(self, icon_name: str) -> str:
         """获取图标URL"""
-        return f"{ICON_BASE_URL}/{icon_name}.png"
+        return f"{self.base_url}/{icon_name}.{self.extension}"
     
     def find_best_match(self, icon_name: str) -> Optional[str]:
         """查找最佳匹配的图标"""
@@ -81,59 +289,192 @@ class IconIndex:
         return None
 
 
-class IconMatcher:
-    """智能图标匹配器"""
+class IconLibrary:
+    """多主题/多格式图标索引集合，各变体的子索引在首次请求时才构建"""
     
-    def __init__(self, icons_path: Path):
-        self.index = IconIndex(icons_path)
+    def __init__(self, base_path: Path, cache_dir: Optional[Path] = None, source_version: str = "",
+                 variants: Optional[Dict[str, Dict[str, str]]] = None,
+                 git_handler: Optional['GitHandler'] = None):
+        self.base_path = base_path
+        self.git_handler = git_handler  # 设置且处于git清单模式时，从git树对象读取图标列表
+        self.cache_dir = cache_dir  # 为None时各子索引不使用快照
+        self.source_version = source_version
+        self.variants = ICON_VARIANTS if variants is None else variants
+        self._indexes: Dict[str, IconIndex] = {}
     
-    def normalize_name(self, name: str) -> str:
-        """标准化名称"""
-        if not name:
-            return ""
+    def get_index(self, variant: str = DEFAULT_ICON_VARIANT) -> IconIndex:
+        """
+        获取指定变体的图标索引（首次请求时构建）
         
-        # 转小写
-        name = name.lower()
+        Args:
+            variant: 变体名称，如png-light、webp-dark
+            
+        Returns:
+            图标索引
+        """
+        index = self._indexes.get(variant)
+        if index is None:
+            if variant not in self.variants:
+                raise KeyError(f"未知的图标变体: {variant}")
+            
+            config = self.variants[variant]
+            cache_file = None
+            if self.cache_dir:
+                cache_file = self.cache_dir / ICON_INDEX_CACHE_FILE.format(variant=variant)
+            
+            icons_path = self.base_path / config['path']
+            manifest = None
+            if self.git_handler is not None and self.git_handler.manifest_source == 'git':
+                manifest = self.git_handler.get_manifest(
+                    icons_path.relative_to(self.git_handler.lobe_icons_path).as_posix()
+                )
+            
+            logger.info(f"构建图标索引 [{variant}]")
+            index = IconIndex(
+                icons_path,
+                cache_file,
+                self.source_version,
+                extension=config.get('extension', 'png'),
+                base_url=config['url'],
+                manifest=manifest
+            )
+            self._indexes[variant] = index
+        return index
+    
+    def load_cached_index(self, variant: str = DEFAULT_ICON_VARIANT) -> Optional[IconIndex]:
+        """
+        直接加载变体上一次保存的索引快照（不检查子模块状态），用于后台刷新期间先行匹配
         
-        # 去除特殊字符，保留字母数字和连字符
-        name = re.sub(r'[^a-z0-9\-_]', '', name)
+        Args:
+            variant: 变体名称
+            
+        Returns:
+            加载成功的索引，没有可用快照时返回None
+        """
+        if not self.cache_dir or variant not in self.variants:
+            return None
         
-        # 将下划线替换为连字符
-        name = name.replace('_', '-')
+        config = self.variants[variant]
+        index = IconIndex(
+            self.base_path / config['path'],
+            self.cache_dir / ICON_INDEX_CACHE_FILE.format(variant=variant),
+            self.source_version,
+            extension=config.get('extension', 'png'),
+            base_url=config['url'],
+            stale_ok=True
+        )
+        if not index.loaded_from_cache:
+            return None
+        self._indexes[variant] = index
+        return index
+    
+    def loaded_variants(self) -> List[str]:
+        """已构建的变体列表"""
+        return list(self._indexes)
+    
+    def get_icon_url(self, icon_name: str, variant: str = DEFAULT_ICON_VARIANT) -> Optional[str]:
+        """获取图标在指定变体下的URL，该变体中不存在此图标时返回None"""
+        if not icon_name:
+            return None
         
-        # 去除多余的连字符
-        name = re.sub(r'-+', '-', name)
-        name = name.strip('-')
+        index = self.get_index(variant)
+        if icon_name in index.all_icons:
+            return index.get_icon_url(icon_name)
+        return None
+
+
+class IconMatcher:
+    """智能图标匹配器"""
+    
+    def __init__(self, icons_path: Path, cache_file: Optional[Path] = None, source_version: str = "",
+                 match_cache_size: int = MATCH_CACHE_SIZE, match_cache_file: Optional[Path] = None,
+                 index: Optional[IconIndex] = None):
+        # 可直接传入已构建的索引（例如来自IconLibrary），此时不再扫描icons_path
+        self.index = index if index is not None else IconIndex(icons_path, cache_file, source_version)
+        self.rule_matcher = get_rule_matcher()
+        self.match_cache = MatchCache(match_cache_size)
+        self.match_cache_file = match_cache_file  # 为None时不持久化匹配缓存
+        self.batch_stats = {'batches': 0, 'inputs': 0, 'unique': 0}
+        self.fuzzy_mode = FUZZY_MATCH_MODE
+        self.enable_edit_distance = ENABLE_EDIT_DISTANCE_MATCH
+        # 各匹配策略的调用次数、命中次数和累计耗时
+        self.strategy_stats: Dict[str, Dict[str, Any]] = {}  # 策略名称 -> 调用次数、命中次数、累计耗时和单次耗时分布
+        self._similarity_scorer = None  # type: Optional[NgramSimilarityScorer]
+        # 关键词 -> BK树中最近的图标 (距离, 图标基础名称)，不同模型的关键词大量重复，每个只查询一次
+        self._nearest_icons: Dict[str, Optional[Tuple[int, str]]] = {}
+        if self.match_cache_file:
+            self.match_cache.load(self.match_cache_file, self.match_cache_key)
+    
+    @property
+    def match_cache_key(self) -> str:
+        """匹配缓存的有效性键：图标索引快照键 + 规则表指纹 + 模糊匹配模式 + 匹配设置与匹配代码指纹"""
+        return f"{self.index.snapshot_key}:{self.rule_matcher.rules_version}:{self.fuzzy_mode}:{self.settings_version}"
+    
+    @property
+    def settings_version(self) -> str:
+        """
+        影响匹配结果的设置和匹配代码的指纹
+        
+        缓存中也保存未匹配的结果，任何一项变化（例如开启编辑距离匹配）都必须让缓存失效；
+        匹配代码按源文件整体计算指纹，与增量处理缓存的做法一致。
+        """
+        settings = [
+            self.enable_edit_distance, EDIT_DISTANCE_MAX, EDIT_DISTANCE_MIN_LENGTH,
+            SIMILARITY_MIN_SCORE, SIMILARITY_NGRAM_SIZE, ICON_BASE_URL,
+        ]
+        digest = hashlib.sha1(json.dumps(settings).encode('utf-8'))
+        for module in (__name__, build_model_features.__module__, NgramSimilarityScorer.__module__, BKTree.__module__):
+            digest.update(Path(sys.modules[module].__file__).read_bytes())
+        return digest.hexdigest()[:12]
+    
+    @property
+    def similarity_scorer(self) -> NgramSimilarityScorer:
+        """相似度评分器（首次使用时基于图标基础名称构建）"""
+        if self._similarity_scorer is None:
+            base_names = {name[:-6] if name.endswith('-color') else name for name in self.index.all_icons}
+            self._similarity_scorer = NgramSimilarityScorer(base_names, SIMILARITY_NGRAM_SIZE)
+        return self._similarity_scorer
+    
+    def save_match_cache(self) -> bool:
+        """持久化匹配缓存（未配置缓存文件时跳过）"""
+        if not self.match_cache_file:
+            return False
+        return self.match_cache.save(self.match_cache_file, self.match_cache_key)
+    
+    @staticmethod
+    def _cache_key(model_name: str, model_id: str) -> Tuple:
+        """
+        生成匹配缓存键
         
-        return name
+        所有匹配策略只依赖小写后的名称和ID；normalize_name会丢弃'.'等字符，
+        而厂商映射规则（如qwen2.5）依赖这些字符，因此不能用标准化名称作为键。
+        """
+        return (
+            model_name.lower() if isinstance(model_name, str) else model_name,
+            model_id.lower() if isinstance(model_id, str) else model_id,
+        )
+    
+    def normalize_name(self, name: str) -> str:
+        """标准化名称"""
+        return normalize_name(name)
     
     def extract_keywords(self, text: str) -> List[str]:
         """从文本中提取关键词"""
-        if not text:
-            return []
-        
-        # 转小写并分割
-        words = re.findall(r'[a-zA-Z0-9]+', text.lower())
-        
-        # 过滤短词和常见词
-        filtered_words = []
-        skip_words = {'the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by'}
-        
-        for word in words:
-            if len(word) >= 2 and word not in skip_words:
-                filtered_words.append(word)
-        
-        return filtered_words
+        return extract_keywords(text)
     
-    def exact_match(self, model_name: str, model_id: str) -> Optional[MatchResult]:
+    def exact_match(self, model_name: str, model_id: str,
+                    features: Optional[ModelFeatures] = None) -> Optional[MatchResult]:
         """精确匹配"""
-        candidates = [model_name, model_id]
+        features = features or build_model_features(model_name, model_id)
+        candidates = [
+            (model_name, features.normalized_name),
+            (model_id, features.normalized_id),
+        ]
         
-        for candidate in candidates:
+        for candidate, normalized in candidates:
             if not candidate:
                 continue
             
-            normalized = self.normalize_name(candidate)
             matched_icon = self.index.find_best_match(normalized)
             
             if matched_icon:
@@ -147,34 +488,36 @@ class IconMatcher:
         
         return None
     
-    def vendor_mapping_match(self, model_name: str, model_id: str) -> Optional[MatchResult]:
+    def vendor_mapping_match(self, model_name: str, model_id: str,
+                             features: Optional[ModelFeatures] = None) -> Optional[MatchResult]:
         """基于厂商映射的匹配"""
-        text_to_check = f"{model_name} {model_id}".lower()
+        features = features or build_model_features(model_name, model_id)
         
-        for keyword, vendor in VENDOR_MAPPING.items():
-            if keyword in text_to_check:
-                matched_icon = self.index.find_best_match(vendor)
-                if matched_icon:
-                    return MatchResult(
-                        matched=True,
-                        icon_name=matched_icon,
-                        icon_url=self.index.get_icon_url(matched_icon),
-                        confidence=0.8,
-                        match_type="vendor_mapping"
-                    )
+        for keyword in self.rule_matcher.vendor_keywords(features.hits):
+            vendor = VENDOR_MAPPING[keyword]
+            matched_icon = self.index.find_best_match(vendor)
+            if matched_icon:
+                return MatchResult(
+                    matched=True,
+                    icon_name=matched_icon,
+                    icon_url=self.index.get_icon_url(matched_icon),
+                    confidence=0.8,
+                    match_type="vendor_mapping"
+                )
         
         return None
     
-    def keyword_match(self, model_name: str, model_id: str) -> Optional[MatchResult]:
+    def keyword_match(self, model_name: str, model_id: str,
+                      features: Optional[ModelFeatures] = None) -> Optional[MatchResult]:
         """关键词匹配"""
-        all_keywords = self.extract_keywords(f"{model_name} {model_id}")
+        features = features or build_model_features(model_name, model_id)
         
         best_match = None
         best_confidence = 0
         
-        for keyword in all_keywords:
-            normalized_keyword = self.normalize_name(keyword)
-            matched_icon = self.index.find_best_match(normalized_keyword)
+        # 关键词只含小写字母和数字，已是标准化形式
+        for keyword in features.tokens:
+            matched_icon = self.index.find_best_match(keyword)
             
             if matched_icon:
                 # 计算置信度（基于关键词长度和位置）
@@ -192,47 +535,129 @@ class IconMatcher:
         
         return best_match
     
-    def fuzzy_match(self, model_name: str, model_id: str) -> Optional[MatchResult]:
+    def fuzzy_match(self, model_name: str, model_id: str,
+                    features: Optional[ModelFeatures] = None) -> Optional[MatchResult]:
         """模糊匹配"""
-        candidates = [self.normalize_name(model_name), self.normalize_name(model_id)]
+        if self.fuzzy_mode == 'similarity':
+            return self.similarity_match(model_name, model_id, features)
         
-        best_match = None
-        best_confidence = 0
+        features = features or build_model_features(model_name, model_id)
+        candidates = [features.normalized_name, features.normalized_id]
         
         for candidate in candidates:
             if not candidate:
                 continue
             
-            for icon_name in self.index.all_icons:
-                # 简单的包含匹配
-                if candidate in icon_name or icon_name in candidate:
-                    confidence = 0.5
-                    matched_icon = self.index.find_best_match(icon_name)
-                    
-                    if matched_icon and confidence > best_confidence:
-                        best_confidence = confidence
-                        best_match = MatchResult(
-                            matched=True,
-                            icon_name=matched_icon,
-                            icon_url=self.index.get_icon_url(matched_icon),
-                            confidence=confidence,
-                            match_type="fuzzy"
-                        )
+            # 简单的包含匹配（通过子串索引查询，所有命中置信度相同，取第一个即可）
+            icon_name = self.index.first_containment_match(candidate)
+            if not icon_name:
+                continue
+            
+            matched_icon = self.index.find_best_match(icon_name)
+            if matched_icon:
+                return MatchResult(
+                    matched=True,
+                    icon_name=matched_icon,
+                    icon_url=self.index.get_icon_url(matched_icon),
+                    confidence=0.5,
+                    match_type="fuzzy"
+                )
         
-        return best_match
+        return None
     
-    def match_icon(self, model_name: str, model_id: str) -> MatchResult:
+    def edit_distance_match(self, model_name: str, model_id: str,
+                            features: Optional[ModelFeatures] = None) -> Optional[MatchResult]:
+        """编辑距离匹配：在BK树中查找与关键词拼写相近的图标"""
+        features = features or build_model_features(model_name, model_id)
+        
+        best = self._nearest_icon(features)
+        if best is None:
+            return None
+        
+        distance, _, icon_base, token = best
+        matched_icon = self.index.find_best_match(icon_base)
+        if not matched_icon:
+            return None
+        
+        return MatchResult(
+            matched=True,
+            icon_name=matched_icon,
+            icon_url=self.index.get_icon_url(matched_icon),
+            confidence=round(0.45 * (1 - distance / max(len(token), len(icon_base))), 4),
+            match_type="edit_distance"
+        )
+    
+    def _nearest_icon(self, features: ModelFeatures) -> Optional[Tuple[int, int, str, str]]:
+        """所有关键词中编辑距离最近的图标: (距离, -关键词长度, 图标基础名称, 关键词)，没有时返回None"""
+        best = None
+        for token in features.tokens:
+            if len(token) < EDIT_DISTANCE_MIN_LENGTH:
+                continue
+            
+            if token not in self._nearest_icons:
+                # 搜索结果按(距离, 词)排序，第一个即该关键词的最优候选
+                max_distance = min(EDIT_DISTANCE_MAX, len(token) // 4)
+                results = self.index.bk_tree.search(token, max_distance)
+                self._nearest_icons[token] = results[0] if results else None
+            nearest = self._nearest_icons[token]
+            if nearest is None:
+                continue
+            
+            candidate = (nearest[0], -len(token), nearest[1], token)
+            if best is None or candidate < best:
+                best = candidate
+        return best
+    
+    def similarity_match(self, model_name: str, model_id: str,
+                         features: Optional[ModelFeatures] = None) -> Optional[MatchResult]:
+        """相似度匹配：取名称和ID中n-gram余弦相似度最高的图标，置信度即相似度"""
+        features = features or build_model_features(model_name, model_id)
+        
+        best_icon = None
+        best_score = 0.0
+        for candidate in (features.normalized_name, features.normalized_id):
+            icon_name, score = self.similarity_scorer.best_match(candidate)
+            if icon_name and score > best_score:
+                best_icon, best_score = icon_name, score
+        
+        if not best_icon or best_score < SIMILARITY_MIN_SCORE:
+            return None
+        
+        matched_icon = self.index.find_best_match(best_icon)
+        if not matched_icon:
+            return None
+        
+        return MatchResult(
+            matched=True,
+            icon_name=matched_icon,
+            icon_url=self.index.get_icon_url(matched_icon),
+            confidence=round(best_score, 4),
+            match_type="similarity"
+        )
+    
+    def match_icon(self, model_name: str, model_id: str,
+                   features: Optional[ModelFeatures] = None) -> MatchResult:
         """
         主匹配函数，按优先级尝试各种匹配策略
         
         Args:
             model_name: 模型名称
             model_id: 模型ID
+            features: 预先提取的模型特征（可选），匹配结果会写回其中
             
         Returns:
             匹配结果
         """
-        logger.debug(f"开始匹配图标: name='{model_name}', id='{model_id}'")
+        logger.debug("开始匹配图标: name='%s', id='%s'", model_name, model_id)
+        
+        features = features or build_model_features(model_name, model_id)
+        
+        cache_key = self._cache_key(model_name, model_id)
+        cached = self.match_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("命中匹配缓存: %s -> %s", model_name, cached.icon_name or '未匹配')
+            features.match_result = cached
+            return cached
         
         # 按优先级尝试不同的匹配策略
         strategies = [
@@ -241,22 +666,184 @@ class IconMatcher:
             ("关键词匹配", self.keyword_match),
             ("模糊匹配", self.fuzzy_match),
         ]
+        if self.enable_edit_distance:
+            strategies.append(("编辑距离匹配", self.edit_distance_match))
         
         for strategy_name, strategy_func in strategies:
             try:
-                result = strategy_func(model_name, model_id)
+                started = time.perf_counter()
+                result = strategy_func(model_name, model_id, features)
+                self._record_strategy(strategy_name, time.perf_counter() - started, bool(result and result.matched))
                 if result and result.matched:
-                    logger.info(f"匹配成功 [{strategy_name}]: {model_name} -> {result.icon_name} (置信度: {result.confidence:.2f})")
+                    logger.sampled("匹配成功", "匹配成功 [%s]: %s -> %s (置信度: %.2f)",
+                                   strategy_name, model_name, result.icon_name, result.confidence)
+                    features.match_result = result
+                    self.match_cache.put(cache_key, result)
                     return result
             except Exception as e:
                 logger.error(f"{strategy_name}匹配时出错: {e}")
         
         # 所有策略都失败，返回未匹配结果
-        logger.warning(f"未找到匹配的图标: name='{model_name}', id='{model_id}'")
-        return MatchResult(
+        logger.warning("未找到匹配的图标: name='%s', id='%s'", model_name, model_id)
+        result = MatchResult(
             matched=False,
             icon_name="",
             icon_url="",
             confidence=0.0,
             match_type="none"
         )
+        features.match_result = result
+        self.match_cache.put(cache_key, result)
+        return result
+    
+    def may_change(self, features: ModelFeatures, changed_icons: Set[str]) -> bool:
+        """
+        判断图标清单的变化是否可能改变模型的匹配结果（保守判断，宁可多判不会漏判）
+
+        Args:
+            features: 已匹配的模型特征
+            changed_icons: 新旧清单之间新增或删除的图标名称
+
+        Returns:
+            可能改变时返回True
+        """
+        if not changed_icons:
+            return False
+
+        result = features.match_result
+        if result is None:
+            return True
+
+        # 同时比较完整名称和基础名称，覆盖-color变体的增删
+        changed = set(changed_icons)
+        changed.update(name[:-6] for name in changed_icons if name.endswith('-color'))
+        if result.matched and (result.icon_name in changed or result.icon_name[:-6] in changed):
+            return True
+
+        # 相似度和编辑距离依赖整个图标集合，近似匹配或未匹配的结果都可能变化
+        if result.match_type in ('fuzzy', 'similarity', 'edit_distance', 'none') and \
+                (self.fuzzy_mode == 'similarity' or self.enable_edit_distance):
+            return True
+
+        # 精确匹配和关键词匹配
+        candidates = {features.normalized_name, features.normalized_id}
+        candidates.update(features.tokens)
+        if not changed.isdisjoint(candidates):
+            return True
+
+        # 厂商映射匹配
+        if any(VENDOR_MAPPING[keyword] in changed for keyword in self.rule_matcher.vendor_keywords(features.hits)):
+            return True
+
+        # 模糊匹配（包含关系）
+        for candidate in (features.normalized_name, features.normalized_id):
+            if candidate and any(candidate in name or name in candidate for name in changed_icons):
+                return True
+
+        return False
+
+    def inherit_stats(self, other: 'IconMatcher'):
+        """沿用另一个匹配器的统计数据（刷新图标清单后替换匹配器时使用）"""
+        self.batch_stats = other.batch_stats
+        self.strategy_stats = other.strategy_stats
+        self.match_cache.hits += other.match_cache.hits
+        self.match_cache.misses += other.match_cache.misses
+        self.match_cache.evictions += other.match_cache.evictions
+
+    def take_stats(self) -> Dict[str, Any]:
+        """取出并清零统计数据（多进程处理时工作进程按分块汇总到主进程）"""
+        stats = {
+            'batch_stats': self.batch_stats,
+            'strategy_stats': self.strategy_stats,
+            'match_cache': {
+                'hits': self.match_cache.hits,
+                'misses': self.match_cache.misses,
+                'evictions': self.match_cache.evictions,
+            },
+        }
+        self.batch_stats = {'batches': 0, 'inputs': 0, 'unique': 0}
+        self.strategy_stats = {}
+        self.match_cache.hits = self.match_cache.misses = self.match_cache.evictions = 0
+        return stats
+
+    def merge_stats(self, stats: Dict[str, Any]):
+        """累加take_stats取出的统计数据"""
+        for key, value in stats['batch_stats'].items():
+            self.batch_stats[key] += value
+        for strategy_name, strategy_stats in stats['strategy_stats'].items():
+            merged = self.strategy_stats.get(strategy_name)
+            if merged is None:
+                merged = self.strategy_stats[strategy_name] = self._new_strategy_stats()
+            for key, value in strategy_stats.items():
+                if key == 'latency':
+                    merged[key].merge(value)
+                else:
+                    merged[key] += value
+        self.match_cache.hits += stats['match_cache']['hits']
+        self.match_cache.misses += stats['match_cache']['misses']
+        self.match_cache.evictions += stats['match_cache']['evictions']
+
+    def _record_strategy(self, strategy_name: str, elapsed: float, matched: bool):
+        """记录一次策略调用"""
+        stats = self.strategy_stats.get(strategy_name)
+        if stats is None:
+            stats = self.strategy_stats[strategy_name] = self._new_strategy_stats()
+        stats['calls'] += 1
+        stats['matches'] += matched
+        stats['seconds'] += elapsed
+        stats['latency'].record(elapsed)
+
+    @staticmethod
+    def _new_strategy_stats() -> Dict[str, Any]:
+        """单个策略的空统计"""
+        return {'calls': 0, 'matches': 0, 'seconds': 0.0, 'latency': LatencyHistogram()}
+    
+    def match_icons(self, models: Iterable[Tuple[str, str]],
+                    features_list: Optional[List[ModelFeatures]] = None) -> List[MatchResult]:
+        """
+        批量匹配图标，重复的(名称, ID)只解析一次
+        
+        Args:
+            models: (模型名称, 模型ID) 序列
+            features_list: 与models一一对应的预提取特征（可选），匹配结果会写回其中
+            
+        Returns:
+            与输入顺序一致的匹配结果列表
+        """
+        pairs = list(models)
+        if features_list is None:
+            features_list = [None] * len(pairs)
+        
+        # 先按键去重，每个键只保留第一次出现时的特征
+        keys = [self._cache_key(model_name, model_id) for model_name, model_id in pairs]
+        unique_features: Dict[Tuple, ModelFeatures] = {}
+        for position, key in enumerate(keys):
+            if key not in unique_features:
+                model_name, model_id = pairs[position]
+                unique_features[key] = features_list[position] or build_model_features(model_name, model_id)
+        
+        # 相似度模式下为所有未缓存的键一次性打分
+        if self.fuzzy_mode == 'similarity':
+            candidates = []
+            for key, features in unique_features.items():
+                if key not in self.match_cache:
+                    candidates.extend((features.normalized_name, features.normalized_id))
+            self.similarity_scorer.score_batch(candidates)
+        
+        resolved: Dict[Tuple, MatchResult] = {}
+        results = []
+        for position, key in enumerate(keys):
+            result = resolved.get(key)
+            if result is None:
+                model_name, model_id = pairs[position]
+                result = self.match_icon(model_name, model_id, unique_features[key])
+                resolved[key] = result
+            if features_list[position] is not None:
+                features_list[position].match_result = result
+            results.append(result)
+        
+        self.batch_stats['batches'] += 1
+        self.batch_stats['inputs'] += len(pairs)
+        self.batch_stats['unique'] += len(resolved)
+        logger.debug(f"批量匹配完成: {len(pairs)}个模型, {len(resolved)}个不同的名称/ID")
+        return results
@@ -0,0 +1,268 @@
+"""
+可插拔JSON后端 - 安装了orjson/msgspec/ujson时自动使用，否则回退到标准库json
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# 添加父目录到Python路径以支持导入config
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import JSON_BACKEND
+from .logger import get_logger
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # 可选依赖
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:  # 可选依赖
+    ujson = None
+
+logger = get_logger("JsonBackend")
+
+# 自动选择时的优先顺序
+BACKEND_PRIORITY = ('orjson', 'msgspec', 'ujson', 'json')
+
+# 用于校验序列化结果是否与标准库逐字节一致的样例
+_PROBE = [
+    {},
+    [],
+    {
+        "id": "gpt-4o",
+        "name": "GPT-4o 中文 🚀",
+        "escapes": "\"\\/\n\r\t\b\f\x01\x1f\x7f  <>&'",
+        "numbers": [0, -1, 42, 2 ** 53, 0.1, 1.5, -2.0, 100.0, 123456.789],
+        "flags": [True, False, None],
+        "nested": {"empty_dict": {}, "empty_list": [], "list": [{"a": [1, [2, {}]]}]},
+    },
+]
+
+
+def _is_plain(value: Any) -> bool:
+    """
+    检查数据是否只包含各后端序列化结果与标准库逐字节一致的值
+
+    科学计数法形式的浮点数（1e-05、1e+20）、非有限浮点数、超出64位的整数、非字符串键以及
+    JSON基本类型以外的对象在各后端的输出与标准库不同，含有这些值的数据交给标准库处理。
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is str or kind is bool or value is None:
+            continue
+        if kind is dict:
+            for key in value:
+                if type(key) is not str:
+                    return False
+            stack.extend(value.values())
+        elif kind is list:
+            stack.extend(value)
+        elif kind is int:
+            if not -(1 << 63) <= value < (1 << 64):
+                return False
+        elif kind is float:
+            # 有限且不用科学计数法的浮点数，repr只含数字、小数点和负号
+            text = repr(value)
+            if 'e' in text or 'n' in text:
+                return False
+        else:
+            return False
+    return True
+
+
+def _has_no_large_float(value: Any) -> bool:
+    """
+    检查解析结果中没有绝对值不小于1e18的浮点数
+
+    部分后端把超出64位的整数解析为浮点数，含有这类数值的文本交给标准库重新解析（真正的大浮点数也会重新解析，结果不变）。
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list:
+            stack.extend(value)
+        elif kind is float and not abs(value) < 1e18:
+            return False
+    return True
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int], compact: bool) -> str:
+    """标准库序列化，作为各后端输出的基准"""
+    return json.dumps(obj, ensure_ascii=False, indent=indent, separators=(',', ':') if compact else None)
+
+
+class JsonBackend:
+    """
+    JSON后端：loads等价于json.loads（接受str或bytes）；dumps等价于json.dumps(obj, ensure_ascii=False, indent=indent)，
+    compact=True时等价于json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    """
+
+    name = "json"
+
+    def __init__(self):
+        # (缩进, 紧凑) -> 本后端的序列化结果是否与标准库一致（常用格式在选择后端时校验，其他格式首次使用时校验）
+        self._dumps_verified: Dict[Tuple[Optional[int], bool], bool] = {}
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        解析JSON文本
+
+        后端无法解析的内容（NaN/Infinity、孤立的代理字符等）和含有超出64位整数的文本交给标准库解析。
+        """
+        if self.name != "json":
+            try:
+                value = self._loads(data)
+            except Exception:
+                pass
+            else:
+                if _has_no_large_float(value):
+                    return value
+        return json.loads(data)
+
+    def dumps(self, obj: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+        """
+        序列化为JSON文本
+
+        该格式未通过校验，或数据中有后端输出与标准库不同的值（见_is_plain）时使用标准库。
+        """
+        if compact:
+            indent = None
+        if self.name != "json" and self.dumps_backend(indent, compact) == self.name and _is_plain(obj):
+            try:
+                return self._dumps(obj, indent, compact)
+            except (TypeError, OverflowError):
+                pass
+        return _stdlib_dumps(obj, indent, compact)
+
+    def dumps_backend(self, indent: Optional[int] = 2, compact: bool = False) -> str:
+        """实际用于该格式的序列化后端名称"""
+        if self.name == "json":
+            return self.name
+        if compact:
+            indent = None
+
+        verified = self._dumps_verified.get((indent, compact))
+        if verified is None:
+            try:
+                verified = all(
+                    self._dumps(probe, indent, compact) == _stdlib_dumps(probe, indent, compact)
+                    for probe in _PROBE
+                )
+            except Exception:
+                verified = False
+            if not verified:
+                logger.info(f"{self.name}的序列化格式与标准库不一致 (indent={indent}, compact={compact})，写入时使用标准库")
+            self._dumps_verified[(indent, compact)] = verified
+        return self.name if verified else "json"
+
+    def _loads(self, data: Union[str, bytes]) -> Any:
+        """后端原生解析（子类实现）"""
+        return json.loads(data)
+
+    def _dumps(self, obj: Any, indent: Optional[int], compact: bool) -> str:
+        """后端原生序列化（子类实现）"""
+        return _stdlib_dumps(obj, indent, compact)
+
+
+class OrjsonBackend(JsonBackend):
+    """orjson后端（只支持2空格缩进或无空白的紧凑格式）"""
+
+    name = "orjson"
+
+    def _loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(self, obj: Any, indent: Optional[int], compact: bool) -> str:
+        if compact:
+            return orjson.dumps(obj).decode('utf-8')
+        if indent != 2:
+            raise ValueError("orjson只支持indent=2")
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+
+
+class MsgspecBackend(JsonBackend):
+    """msgspec后端（先紧凑编码，需要缩进时再格式化）"""
+
+    name = "msgspec"
+
+    def _loads(self, data: Union[str, bytes]) -> Any:
+        return msgspec.json.decode(data)
+
+    def _dumps(self, obj: Any, indent: Optional[int], compact: bool) -> str:
+        if compact:
+            return msgspec.json.encode(obj).decode('utf-8')
+        if indent is None:
+            raise ValueError("msgspec不支持标准库默认的', '分隔符")
+        return msgspec.json.format(msgspec.json.encode(obj), indent=indent).decode('utf-8')
+
+
+class UjsonBackend(JsonBackend):
+    """ujson后端"""
+
+    name = "ujson"
+
+    def _loads(self, data: Union[str, bytes]) -> Any:
+        return ujson.loads(data)
+
+    def _dumps(self, obj: Any, indent: Optional[int], compact: bool) -> str:
+        return ujson.dumps(obj, ensure_ascii=False, indent=indent or 0, escape_forward_slashes=False)
+
+
+_BACKEND_CLASSES: Dict[str, Callable[[], JsonBackend]] = {
+    'orjson': OrjsonBackend,
+    'msgspec': MsgspecBackend,
+    'ujson': UjsonBackend,
+    'json': JsonBackend,
+}
+
+_MODULES = {'orjson': orjson, 'msgspec': msgspec, 'ujson': ujson, 'json': json}
+
+
+def available_backends() -> List[str]:
+    """当前环境中可用的后端（按自动选择的优先顺序）"""
+    return [name for name in BACKEND_PRIORITY if _MODULES[name] is not None]
+
+
+def create_backend(name: str) -> JsonBackend:
+    """创建指定名称的后端，未安装时抛出ValueError"""
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(f"未知的JSON后端: {name}")
+    if _MODULES[name] is None:
+        raise ValueError(f"JSON后端未安装: {name}")
+    return _BACKEND_CLASSES[name]()
+
+
+_backend: Optional[JsonBackend] = None
+
+
+def get_json_backend() -> JsonBackend:
+    """获取按JSON_BACKEND配置选择的共享后端（'auto'时取第一个已安装的后端）"""
+    global _backend
+    if _backend is None:
+        if JSON_BACKEND == 'auto':
+            name = available_backends()[0]
+        else:
+            name = JSON_BACKEND
+        try:
+            _backend = create_backend(name)
+        except ValueError as e:
+            logger.warning(f"{e}，使用标准库json")
+            _backend = JsonBackend()
+        # 选择后端时校验输出格式（json和紧凑格式）与标准库一致
+        for indent, compact in ((2, False), (None, True)):
+            _backend.dumps_backend(indent, compact)
+        logger.info(f"使用JSON后端: {_backend.name}")
+    return _backend
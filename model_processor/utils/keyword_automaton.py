@@ -0,0 +1,163 @@
+"""
+关键词多模式匹配自动机（Aho-Corasick）
+"""
+
+import hashlib
+import json
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 添加父目录到Python路径以支持导入config
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import VENDOR_MAPPING, SPECIAL_RULES, FUNCTION_KEYWORDS
+
+# 标签和描述生成中启发式判断直接使用的词，与规则表一起编入自动机
+HEURISTIC_KEYWORDS = (
+    'thinking', 'reasoning', 'r1', 'o1', 'image', 'generation', 'dall-e',
+    'tts', 'speech', 'voice', 'search', 'web', 'browse', 'embedding', 'embed',
+    'vision', 'vl', 'multimodal', 'fovt', 'pro', 'max', 'plus', 'ultra',
+)
+
+
+class KeywordAutomaton:
+    """Aho-Corasick多模式匹配自动机，一次扫描报告所有关键词命中"""
+
+    def __init__(self, keywords: Iterable[str]):
+        # goto[state]: 字符 -> 下一状态；fail[state]: 失配跳转；output[state]: 在该状态结束的关键词
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        self.keywords: Set[str] = set()
+
+        for keyword in keywords:
+            if keyword:
+                self._add(keyword)
+        self._build_fail_links()
+
+    def _add(self, keyword: str):
+        """向字典树中插入关键词"""
+        if keyword in self.keywords:
+            return
+        self.keywords.add(keyword)
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + (keyword,)
+
+    def _build_fail_links(self):
+        """广度优先构建失配指针，并把后缀状态的输出合并到当前状态"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        扫描文本，按结束位置依次产出所有关键词命中
+
+        Args:
+            text: 待扫描文本（调用方负责大小写归一化）
+
+        Returns:
+            (起始位置, 关键词) 迭代器
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                yield position - len(keyword) + 1, keyword
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """返回文本中出现过的所有关键词"""
+        return {keyword for _, keyword in self.iter_matches(text)}
+
+
+class RuleKeywordMatcher:
+    """基于同一个自动机的规则关键词匹配器，覆盖厂商映射、特殊规则和功能关键词"""
+
+    def __init__(self,
+                 vendor_mapping: Optional[Dict[str, str]] = None,
+                 special_rules: Optional[Dict[str, Dict]] = None,
+                 function_keywords: Optional[Dict[str, List[str]]] = None,
+                 extra_keywords: Iterable[str] = HEURISTIC_KEYWORDS):
+        self.vendor_mapping = VENDOR_MAPPING if vendor_mapping is None else vendor_mapping
+        self.special_rules = SPECIAL_RULES if special_rules is None else special_rules
+        self.function_keywords = FUNCTION_KEYWORDS if function_keywords is None else function_keywords
+
+        # 记录各规则表中关键词的原始顺序，保证命中结果与逐条遍历配置时一致
+        self._vendor_rank = {keyword: rank for rank, keyword in enumerate(self.vendor_mapping)}
+        self._special_rank = {keyword: rank for rank, keyword in enumerate(self.special_rules)}
+        self._function_rank = {tag_name: rank for rank, tag_name in enumerate(self.function_keywords)}
+
+        self._keyword_functions: Dict[str, List[str]] = {}
+        for tag_name, keywords in self.function_keywords.items():
+            for keyword in keywords:
+                tag_names = self._keyword_functions.setdefault(keyword.lower(), [])
+                if tag_name not in tag_names:
+                    tag_names.append(tag_name)
+
+        self.automaton = KeywordAutomaton(
+            list(self.vendor_mapping) + list(self.special_rules) + list(self._keyword_functions)
+            + list(extra_keywords)
+        )
+
+        # 规则表指纹，规则变化时使依赖规则的缓存失效
+        rules = [self.vendor_mapping, self.special_rules, self.function_keywords, sorted(extra_keywords)]
+        self.rules_version = hashlib.sha1(
+            json.dumps(rules, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        ).hexdigest()[:12]
+
+    def scan(self, text: str) -> Set[str]:
+        """扫描已转小写的文本，返回命中的关键词集合"""
+        return self.automaton.find_keywords(text)
+
+    def vendor_keywords(self, hits: Set[str]) -> List[str]:
+        """按VENDOR_MAPPING顺序返回命中的厂商关键词"""
+        return sorted((k for k in hits if k in self._vendor_rank), key=self._vendor_rank.__getitem__)
+
+    def special_rule_keys(self, hits: Set[str]) -> List[str]:
+        """按SPECIAL_RULES顺序返回命中的特殊规则键"""
+        return sorted((k for k in hits if k in self._special_rank), key=self._special_rank.__getitem__)
+
+    def function_tags(self, hits: Set[str]) -> List[str]:
+        """按FUNCTION_KEYWORDS顺序返回命中的功能标签"""
+        tag_names = set()
+        for keyword in hits:
+            tag_names.update(self._keyword_functions.get(keyword, ()))
+        return sorted(tag_names, key=self._function_rank.__getitem__)
+
+
+_rule_matcher: Optional[RuleKeywordMatcher] = None
+
+
+def get_rule_matcher() -> RuleKeywordMatcher:
+    """获取基于config规则表构建的共享匹配器（首次调用时编译）"""
+    global _rule_matcher
+    if _rule_matcher is None:
+        _rule_matcher = RuleKeywordMatcher()
+    return _rule_matcher
@@ -2,14 +2,134 @@
 统一日志系统
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 # 添加父目录到Python路径以支持导入config
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from config import LOG_LEVEL, LOG_FORMAT
+from config import LOG_LEVEL, LOG_FORMAT, LOG_ASYNC, LOG_SAMPLE_EVERY
+
+# 所有命名日志器共用的处理器（控制台和同一个日志文件句柄），首次使用时创建
+_handlers: List[logging.Handler] = []
+# 异步模式下挂到各日志器上的队列处理器和唯一的写入线程
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+# 热点日志的采样计数: 键 -> [出现次数, 输出次数]
+_sample_counts: Dict[str, List[int]] = {}
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """把日志记录原样放入队列，消息格式化和写入都留给写入线程（同进程队列无需序列化）"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _DirectQueue:
+    """工作进程中代替队列：直接交给处理器写入（进程池的工作进程退出时不执行atexit，后台线程中的日志可能丢失）"""
+
+    def __init__(self, handlers: List[logging.Handler]):
+        self.handlers = handlers
+
+    def put_nowait(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def _shared_handlers() -> List[logging.Handler]:
+    """创建（或返回已创建的）控制台和文件处理器"""
+    if not _handlers:
+        formatter = logging.Formatter(LOG_FORMAT)
+
+        # 控制台处理器
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(LOG_LEVEL)
+        console_handler.setFormatter(formatter)
+        _handlers.append(console_handler)
+
+        # 文件处理器（所有日志器共用一个文件句柄）
+        log_file = Path("model_processor.log")
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(LOG_LEVEL)
+        file_handler.setFormatter(formatter)
+        _handlers.append(file_handler)
+    return _handlers
+
+
+def _logger_handlers() -> List[logging.Handler]:
+    """日志器上挂的处理器：异步模式下为队列处理器，否则直接为共用的处理器"""
+    global _queue_handler, _listener
+
+    if not LOG_ASYNC:
+        return _shared_handlers()
+
+    if _queue_handler is None:
+        log_queue = queue.SimpleQueue()
+        _queue_handler = _DeferredQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, *_shared_handlers(), respect_handler_level=True)
+        _listener.start()
+    return [_queue_handler]
+
+
+def shutdown_logging():
+    """停止写入线程，写出队列中剩余的日志（程序退出时自动调用）"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in _handlers:
+        try:
+            handler.flush()
+        except (OSError, ValueError):
+            # 控制台流可能已被关闭（例如测试框架在退出前恢复了标准输出）
+            pass
+
+
+def configure_worker_logging():
+    """
+    工作进程的日志设置（进程池的initializer中调用，与fork、spawn、forkserver等启动方式无关）
+
+    工作进程不使用写入线程，日志记录直接交给处理器写入：fork继承来的写入线程在子进程中不存在，
+    spawn启动时导入本模块创建的写入线程在进程退出时不会被停止。
+    """
+    global _listener
+
+    if _listener is not None:
+        # spawn/forkserver: 停止本进程的写入线程并写出已排队的日志；fork: 继承来的线程已结束，直接返回
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        _queue_handler.queue = _DirectQueue(_shared_handlers())
+
+
+def _acquire_handlers():
+    """
+    fork前获取共用处理器的锁：等待写入线程写完当前记录
+
+    logging模块在子进程中重新初始化处理器的锁，但不会等待正在进行的写入；若fork时写入线程正持有
+    控制台或文件流的缓冲区锁，子进程第一次写日志就会永久阻塞。
+    """
+    for handler in _handlers:
+        handler.acquire()
+
+
+def _release_handlers():
+    """fork后在父进程中释放处理器的锁（子进程中由logging模块重新初始化）"""
+    for handler in _handlers:
+        handler.release()
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_acquire_handlers, after_in_parent=_release_handlers)
 
 
 class Logger:
@@ -24,41 +144,74 @@ class Logger:
             self._setup_handlers()
     
     def _setup_handlers(self):
-        """设置日志处理器"""
-        # 控制台处理器
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(LOG_LEVEL)
-        console_formatter = logging.Formatter(LOG_FORMAT)
-        console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
-        
-        # 文件处理器
-        log_file = Path("model_processor.log")
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(LOG_LEVEL)
-        file_formatter = logging.Formatter(LOG_FORMAT)
-        file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
+        """设置日志处理器（各日志器共用处理器，不再各自打开日志文件）"""
+        for handler in _logger_handlers():
+            self.logger.addHandler(handler)
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """调试信息"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """一般信息"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """警告信息"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """错误信息"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """严重错误"""
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
+    
+    def sampled(self, key: str, message: str, *args, level: int = logging.INFO):
+        """
+        热点日志（每个模型都会输出的消息）：按LOG_SAMPLE_EVERY采样，未输出的只计数
+        
+        消息使用%格式的参数延迟格式化，未达到日志级别或未被采样时不做任何格式化。
+        
+        Args:
+            key: 采样计数的键（同一类消息共用）
+            message: 消息格式
+            *args: 格式参数
+            level: 日志级别
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        counts = _sample_counts.get(key)
+        if counts is None:
+            counts = _sample_counts[key] = [0, 0]
+        counts[0] += 1
+        if LOG_SAMPLE_EVERY <= 1 or counts[0] % LOG_SAMPLE_EVERY == 1:
+            counts[1] += 1
+            self.logger.log(level, message, *args)
+
+
+def take_sample_counts() -> Dict[str, List[int]]:
+    """取出并清零热点日志的采样计数（工作进程把计数交给主进程汇总）"""
+    counts = dict(_sample_counts)
+    _sample_counts.clear()
+    return counts
+
+
+def merge_sample_counts(counts: Dict[str, List[int]]):
+    """合并其他进程的采样计数"""
+    for key, (total, written) in counts.items():
+        merged = _sample_counts.setdefault(key, [0, 0])
+        merged[0] += total
+        merged[1] += written
+
+
+def log_sample_summary():
+    """输出热点日志的汇总（被采样省略的消息数）"""
+    for key, (total, written) in _sample_counts.items():
+        if total > written:
+            logger.info(f"日志汇总 [{key}]: 共{total}条，输出{written}条（每{LOG_SAMPLE_EVERY}条输出1条）")
 
 
 # 创建全局日志实例
@@ -0,0 +1,127 @@
+"""
+图标匹配结果缓存（有界LRU，同时缓存未匹配结果）
+"""
+
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, TYPE_CHECKING
+
+from .logger import get_logger
+
+if TYPE_CHECKING:
+    from .icon_matcher import MatchResult
+
+logger = get_logger("MatchCache")
+
+
+class MatchCache:
+    """有界LRU匹配结果缓存"""
+
+    # 持久化文件格式版本
+    CACHE_VERSION = 1
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, MatchResult]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """检查键是否已缓存（不计入命中统计，也不调整LRU顺序）"""
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional['MatchResult']:
+        """查找缓存结果，命中时将其移到最近使用位置"""
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: 'MatchResult'):
+        """写入缓存结果（包括未匹配结果），超出容量时淘汰最久未使用的条目"""
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计信息"""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def load(self, cache_file: Path, cache_key: str) -> bool:
+        """
+        从文件加载缓存条目
+
+        Args:
+            cache_file: 缓存文件路径
+            cache_key: 当前图标索引与规则对应的缓存键，不一致时丢弃文件内容
+
+        Returns:
+            加载成功返回True
+        """
+        from .icon_matcher import MatchResult
+
+        if not cache_file.exists():
+            return False
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != self.CACHE_VERSION or data.get('key') != cache_key:
+                logger.info("匹配缓存已过期，忽略缓存文件")
+                return False
+
+            for name, model_id, result in data['entries']:
+                self.put((name, model_id), MatchResult(**result))
+
+            logger.info(f"加载匹配缓存: {len(self._entries)}条")
+            return True
+
+        except Exception as e:
+            logger.warning(f"读取匹配缓存失败: {e}")
+            return False
+
+    def save(self, cache_file: Path, cache_key: str) -> bool:
+        """将缓存条目写入文件（先写临时文件再原子替换）"""
+        try:
+            data: Dict[str, Any] = {
+                'version': self.CACHE_VERSION,
+                'key': cache_key,
+                'entries': [[name, model_id, asdict(result)]
+                            for (name, model_id), result in self._entries.items()],
+            }
+
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_name(cache_file.name + '.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_file, cache_file)
+
+            logger.info(f"匹配缓存已保存: {cache_file}")
+            return True
+
+        except Exception as e:
+            logger.warning(f"保存匹配缓存失败: {e}")
+            return False
@@ -0,0 +1,152 @@
+"""
+模型特征提取 - 每个模型只计算一次，供图标匹配、标签生成和描述生成共享
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, TYPE_CHECKING
+
+from .keyword_automaton import get_rule_matcher
+
+if TYPE_CHECKING:
+    from .icon_matcher import MatchResult
+
+# 预编译的正则表达式
+_INVALID_NAME_CHARS = re.compile(r'[^a-z0-9\-_]')
+_REPEATED_HYPHENS = re.compile(r'-+')
+_KEYWORD_PATTERN = re.compile(r'[a-zA-Z0-9]+')
+_NUMERIC_VERSION = re.compile(r'\d+\.\d+')
+
+# 版本模式（按优先顺序）
+_VERSION_PATTERNS = [
+    re.compile(r'(\d+\.\d+)'),  # 2.5, 3.0 等
+    re.compile(r'(r\d+)'),      # r1, r2 等
+    re.compile(r'(o\d+)'),      # o1, o3 等
+    re.compile(r'(v\d+)'),      # v3 等
+    re.compile(r'(\d+b)'),      # 32b, 72b 等参数量
+]
+
+# 关键词提取时跳过的常见词
+_SKIP_WORDS = {'the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by'}
+
+# 计算模型族键时去掉的变体后缀（渠道标记、发布形态、日期戳）
+_FAMILY_SUFFIXES = {'fovt', 'free', 'latest', 'preview', 'instruct', 'chat', 'hf', 'exp', 'beta'}
+_FAMILY_DATE_SUFFIX = re.compile(r'\d{4}(?:\d{2}){0,2}')  # 0520、202405、20240513
+_FAMILY_TWO_DIGITS = re.compile(r'\d{2}')
+_FAMILY_SEPARATORS = re.compile(r'[-_:\s]+')
+
+
+def normalize_name(name: str) -> str:
+    """标准化名称：小写，只保留字母数字和连字符"""
+    if not name:
+        return ""
+
+    # 转小写
+    name = name.lower()
+
+    # 去除特殊字符，保留字母数字和连字符
+    name = _INVALID_NAME_CHARS.sub('', name)
+
+    # 将下划线替换为连字符
+    name = name.replace('_', '-')
+
+    # 去除多余的连字符
+    name = _REPEATED_HYPHENS.sub('-', name)
+    return name.strip('-')
+
+
+def extract_keywords(text: str) -> List[str]:
+    """从文本中提取关键词（过滤短词和常见词）"""
+    if not text:
+        return []
+
+    words = _KEYWORD_PATTERN.findall(text.lower())
+    return [word for word in words if len(word) >= 2 and word not in _SKIP_WORDS]
+
+
+def extract_versions(text: str) -> List[str]:
+    """按模式优先级提取文本中的所有版本片段"""
+    versions = []
+    for pattern in _VERSION_PATTERNS:
+        versions.extend(pattern.findall(text))
+    return versions
+
+
+def is_numeric_version(version: str) -> bool:
+    """判断版本片段是否为数字版本（如2.5）"""
+    return bool(_NUMERIC_VERSION.match(version))
+
+
+@dataclass
+class ModelFeatures:
+    """单个模型的预计算特征"""
+    model_name: str
+    model_id: str
+    text: str  # f"{model_name} {model_id}".lower()
+    normalized_name: str
+    normalized_id: str
+    tokens: List[str]  # 名称和ID中的关键词
+    hits: Set[str]  # 规则关键词在text中的命中
+    versions: List[str]  # 版本片段
+    match_result: Optional['MatchResult'] = field(default=None)  # 图标匹配结果（匹配后填充）
+
+    @property
+    def icon_name(self) -> str:
+        """匹配到的图标名称，未匹配时为空字符串"""
+        if self.match_result and self.match_result.matched:
+            return self.match_result.icon_name
+        return ""
+
+
+def family_key(features: ModelFeatures) -> str:
+    """
+    计算模型族键：取ID（为空时取名称）去掉提供方前缀和变体后缀后的规范形式
+
+    例如 qwen2.5-72b-instruct、qwen2.5-72b-instruct-fovt 和 Qwen/Qwen2.5-72B-Instruct 属于同一族。
+    族只用于把可能共享处理结果的模型放在一起，是否真的共享由各处理步骤按自身的输入校验。
+
+    Args:
+        features: 模型特征
+
+    Returns:
+        族键
+    """
+    source = features.model_id if isinstance(features.model_id, str) and features.model_id else features.model_name
+    if not isinstance(source, str):
+        return ""
+
+    parts = [part for part in _FAMILY_SEPARATORS.split(source.lower().rsplit('/', 1)[-1]) if part]
+    while len(parts) > 1:
+        if parts[-1] in _FAMILY_SUFFIXES or _FAMILY_DATE_SUFFIX.fullmatch(parts[-1]):
+            parts.pop()
+        elif len(parts) > 3 and len(parts[-3]) == 4 and parts[-3].isdigit() and \
+                _FAMILY_TWO_DIGITS.fullmatch(parts[-2]) and _FAMILY_TWO_DIGITS.fullmatch(parts[-1]):
+            del parts[-3:]  # 2024-05-13
+        else:
+            break
+    return '-'.join(parts)
+
+
+def build_model_features(model_name: str, model_id: str) -> ModelFeatures:
+    """
+    提取模型特征
+
+    Args:
+        model_name: 模型名称
+        model_id: 模型ID
+
+    Returns:
+        模型特征
+    """
+    text = f"{model_name} {model_id}".lower()
+
+    return ModelFeatures(
+        model_name=model_name,
+        model_id=model_id,
+        text=text,
+        normalized_name=normalize_name(model_name),
+        normalized_id=normalize_name(model_id),
+        tokens=extract_keywords(text),
+        hits=get_rule_matcher().scan(text),
+        versions=extract_versions(text),
+    )
@@ -0,0 +1,153 @@
+"""
+增量处理缓存 - 按模型内容指纹保存上一次的处理结果，未变化的模型直接复用
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+
+logger = get_logger("ProcessedCache")
+
+
+def model_fingerprint(model_data: Dict[str, Any]) -> str:
+    """
+    计算模型的内容指纹（只覆盖影响处理结果的输入：名称、ID、描述和标签）
+
+    Args:
+        model_data: 模型数据
+
+    Returns:
+        指纹字符串
+    """
+    meta = model_data.get('meta')
+    if not isinstance(meta, dict):
+        meta = {}
+    inputs = [model_data.get('name', ''), model_data.get('id', ''), meta.get('description'), meta.get('tags')]
+    return hashlib.sha1(
+        json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=repr).encode('utf-8')
+    ).hexdigest()
+
+
+class ProcessedModelCache:
+    """
+    模型处理结果缓存
+
+    每个条目记录匹配结果和处理时写入meta的字段；复用时把这些字段写回当前输入的meta，
+    其他字段始终取自本次输入。缓存键包含规则表指纹和图标清单版本，任一变化时整个缓存失效。
+    """
+
+    # 持久化文件格式版本
+    CACHE_VERSION = 1
+
+    def __init__(self):
+        self._previous: Dict[str, Dict[str, Any]] = {}  # 上一次运行保存的条目
+        self._entries: Dict[str, Dict[str, Any]] = {}  # 本次运行的条目（保存时只保留这些）
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """本次运行的条目"""
+        return self._entries
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """查找上一次运行的处理结果，命中时转入本次运行的条目"""
+        entry = self._previous.get(fingerprint)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries[fingerprint] = entry
+        self.hits += 1
+        return entry
+
+    def put(self, fingerprint: str, match: Optional[Dict[str, Any]], meta: Dict[str, Any]):
+        """
+        记录模型的处理结果
+
+        Args:
+            fingerprint: 模型内容指纹
+            match: 图标匹配结果（MatchResult的字段字典）
+            meta: 处理时写入meta的字段
+        """
+        self._entries[fingerprint] = {'match': match, 'meta': meta}
+
+    def merge(self, entries: Dict[str, Dict[str, Any]]):
+        """合并其他进程记录的条目"""
+        self._entries.update(entries)
+
+    def forget_previous(self):
+        """停止复用上一次运行的结果（图标清单在运行中更新时使用）"""
+        self._previous = {}
+
+    def discard(self, fingerprint: str):
+        """丢弃条目（复用后又被重新处理的模型）"""
+        self._entries.pop(fingerprint, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取缓存统计信息"""
+        return {
+            'size': len(self._entries),
+            'previous': len(self._previous),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def load(self, cache_file: Path, cache_key: str) -> bool:
+        """
+        从文件加载上一次运行的处理结果
+
+        Args:
+            cache_file: 缓存文件路径
+            cache_key: 当前规则与图标清单对应的缓存键，不一致时丢弃文件内容
+
+        Returns:
+            加载成功返回True
+        """
+        if not cache_file.exists():
+            return False
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != self.CACHE_VERSION or data.get('key') != cache_key:
+                logger.info("增量处理缓存已过期，所有模型重新处理")
+                return False
+
+            self._previous = data['entries']
+            logger.info(f"加载增量处理缓存: {len(self._previous)}个模型")
+            return True
+
+        except Exception as e:
+            logger.warning(f"读取增量处理缓存失败: {e}")
+            return False
+
+    def save(self, cache_file: Path, cache_key: str) -> bool:
+        """将本次运行的处理结果写入文件（先写临时文件再原子替换）"""
+        try:
+            data: Dict[str, Any] = {
+                'version': self.CACHE_VERSION,
+                'key': cache_key,
+                'entries': self._entries,
+            }
+
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = cache_file.with_name(cache_file.name + '.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_file, cache_file)
+
+            logger.info(f"增量处理缓存已保存: {cache_file} ({len(self._entries)}个模型)")
+            return True
+
+        except Exception as e:
+            logger.warning(f"保存增量处理缓存失败: {e}")
+            return False
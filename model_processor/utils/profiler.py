@@ -0,0 +1,155 @@
+"""
+性能分析 - 在cProfile下运行处理流程，同时用采样线程收集调用栈，输出pstats和火焰图可用的折叠栈
+"""
+
+import cProfile
+import collections
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Counter, List, Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger("Profiler")
+
+
+def _frame_label(frame) -> str:
+    """折叠栈中的帧名称: 函数名 (文件名:起始行号)"""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    采样线程：按固定间隔记录各线程的调用栈
+
+    只采样非守护线程（日志写入、后台刷新等守护线程大部分时间在等待，会淹没处理流程的调用栈）；
+    每条调用栈以线程名开头，便于在火焰图中区分流水线的各个阶段。
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter[Tuple[str, ...]] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="StackSampler", daemon=True)
+
+    def start(self):
+        """开始采样"""
+        self._thread.start()
+
+    def stop(self):
+        """停止采样并等待采样线程结束"""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            threads = {thread.ident: thread for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                thread = threads.get(ident)
+                if ident == own_ident or thread is None or thread.daemon:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(thread.name)
+                self.samples[tuple(reversed(stack))] += 1
+
+    def write_collapsed(self, file_path: Path):
+        """写入折叠栈文本（每行: 帧;帧;...;帧 采样次数），可直接交给flamegraph.pl、speedscope等工具"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+
+class RunProfiler:
+    """在cProfile和调用栈采样下运行函数，保存分析结果并汇总最耗时的函数"""
+
+    def __init__(self, output_dir: Path, sample_interval: float, name: str = "model_processor"):
+        """
+        Args:
+            output_dir: 分析结果的保存目录
+            sample_interval: 调用栈采样间隔（秒）
+            name: 输出文件名前缀（后接时间戳）
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.name = name
+        self.stats = None  # type: Optional[pstats.Stats]
+        self.pstats_file = None  # type: Optional[Path]
+        self.collapsed_file = None  # type: Optional[Path]
+
+    def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        在性能分析下运行函数（只覆盖当前进程；cProfile只记录调用线程，其他线程见折叠栈）
+
+        Returns:
+            函数的返回值
+        """
+        profile = cProfile.Profile()
+        sampler = StackSampler(self.sample_interval)
+        sampler.start()
+        profile.enable()
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            sampler.stop()
+            self._save(profile, sampler)
+
+    def _save(self, profile: cProfile.Profile, sampler: StackSampler):
+        """保存pstats和折叠栈文件"""
+        try:
+            self.stats = pstats.Stats(profile)
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            prefix = self.output_dir / f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}"
+
+            self.pstats_file = prefix.with_suffix('.pstats')
+            profile.dump_stats(str(self.pstats_file))
+            self.collapsed_file = prefix.with_suffix('.collapsed')
+            sampler.write_collapsed(self.collapsed_file)
+
+            logger.info(f"性能分析结果已保存: {self.pstats_file}, {self.collapsed_file} "
+                        f"({sum(sampler.samples.values())}次采样)")
+
+        except Exception as e:
+            logger.error(f"保存性能分析结果时出错: {e}")
+
+    def top_functions(self, limit: int) -> List[Tuple[str, int, float, float]]:
+        """
+        按累计耗时排序的函数
+
+        Args:
+            limit: 返回的函数个数
+
+        Returns:
+            (函数描述, 调用次数, 自身耗时, 累计耗时) 列表
+        """
+        if self.stats is None:
+            return []
+
+        self.stats.sort_stats('cumulative')
+        functions = []
+        for func in self.stats.fcn_list[:limit]:
+            _, calls, total_time, cumulative_time, _ = self.stats.stats[func]
+            functions.append((pstats.func_std_string(func), calls, total_time, cumulative_time))
+        return functions
+
+    def format_report(self, limit: int) -> str:
+        """报告中的性能分析部分"""
+        functions = self.top_functions(limit)
+        if not functions:
+            return ""
+
+        report = f"\n性能分析 (按累计耗时前{len(functions)}个函数, 只包含主进程的主线程):"
+        for description, calls, total_time, cumulative_time in functions:
+            report += f"\n  累计{cumulative_time:.3f}秒, 自身{total_time:.3f}秒, 调用{calls}次: {description}"
+        if self.pstats_file:
+            report += f"\n  pstats: {self.pstats_file}\n  折叠栈: {self.collapsed_file}"
+        return report
@@ -0,0 +1,140 @@
+"""
+基于字符n-gram向量的图标相似度评分
+"""
+
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # 可选依赖，未安装时使用纯Python稀疏实现
+    np = None
+    sparse = None
+
+from .logger import get_logger
+
+logger = get_logger("Similarity")
+
+
+def ngram_vector(text: str, size: int) -> Dict[str, float]:
+    """
+    生成L2归一化的字符n-gram计数向量
+
+    Args:
+        text: 标准化后的名称
+        size: n-gram长度
+
+    Returns:
+        n-gram -> 权重
+    """
+    padded = f"#{text}#"
+    counts = Counter(padded[i:i + size] for i in range(max(len(padded) - size + 1, 1)))
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    return {gram: count / norm for gram, count in counts.items()}
+
+
+class NgramSimilarityScorer:
+    """候选名称与图标名称之间的余弦相似度评分器"""
+
+    def __init__(self, icon_names: Iterable[str], ngram_size: int = 3):
+        self.ngram_size = ngram_size
+        self.icon_names: List[str] = sorted(set(icon_names))
+        self.vocabulary: Dict[str, int] = {}
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        self._best: Dict[str, Tuple[Optional[str], float]] = {}  # 批量预计算的结果
+
+        rows, cols, values = [], [], []
+        for row, name in enumerate(self.icon_names):
+            for gram, weight in ngram_vector(name, ngram_size).items():
+                col = self.vocabulary.setdefault(gram, len(self.vocabulary))
+                self._postings.setdefault(gram, []).append((row, weight))
+                rows.append(row)
+                cols.append(col)
+                values.append(weight)
+
+        self._icon_matrix = None
+        if sparse is not None:
+            # 转置存储为 词表 x 图标，查询矩阵右乘即可得到所有得分
+            self._icon_matrix = sparse.csr_matrix(
+                (values, (cols, rows)), shape=(len(self.vocabulary), len(self.icon_names))
+            )
+
+        backend = "scipy" if self._icon_matrix is not None else "python"
+        logger.info(f"相似度索引构建完成: {len(self.icon_names)}个图标, {len(self.vocabulary)}个n-gram ({backend})")
+
+    def score_batch(self, candidates: Iterable[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """
+        批量计算候选名称的最佳图标，结果同时缓存供best_match使用
+
+        Args:
+            candidates: 标准化后的候选名称
+
+        Returns:
+            候选名称 -> (最佳图标名称, 相似度)
+        """
+        candidates = list(candidates)
+        pending = [c for c in dict.fromkeys(candidates) if c and c not in self._best]
+        if pending:
+            if self._icon_matrix is not None:
+                self._best.update(self._score_matrix(pending))
+            else:
+                self._best.update((c, self._score_postings(c)) for c in pending)
+        return {c: self._best[c] for c in candidates if c in self._best}
+
+    def best_match(self, candidate: str) -> Tuple[Optional[str], float]:
+        """获取单个候选名称的最佳图标及相似度"""
+        if not candidate:
+            return None, 0.0
+        if candidate not in self._best:
+            self.score_batch([candidate])
+        return self._best[candidate]
+
+    # 矩阵打分时每批的候选数量，限制稠密得分矩阵的大小
+    MATRIX_CHUNK_SIZE = 1024
+
+    def _score_matrix(self, candidates: List[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """用稀疏矩阵乘法为候选名称分块打分"""
+        results = {}
+        for start in range(0, len(candidates), self.MATRIX_CHUNK_SIZE):
+            results.update(self._score_matrix_chunk(candidates[start:start + self.MATRIX_CHUNK_SIZE]))
+        return results
+
+    def _score_matrix_chunk(self, candidates: List[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        """一次稀疏矩阵乘法为一批候选名称打分"""
+        rows, cols, values = [], [], []
+        for row, candidate in enumerate(candidates):
+            for gram, weight in ngram_vector(candidate, self.ngram_size).items():
+                col = self.vocabulary.get(gram)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+                    values.append(weight)
+
+        query_matrix = sparse.csr_matrix(
+            (values, (rows, cols)), shape=(len(candidates), len(self.vocabulary))
+        )
+        scores = (query_matrix @ self._icon_matrix).toarray()
+        if scores.shape[1] == 0:
+            return {candidate: (None, 0.0) for candidate in candidates}
+        best_columns = np.argmax(scores, axis=1)
+        best_scores = scores[np.arange(len(candidates)), best_columns]
+
+        results = {}
+        for candidate, column, score in zip(candidates, best_columns, best_scores):
+            results[candidate] = (self.icon_names[column], float(score)) if score > 0 else (None, 0.0)
+        return results
+
+    def _score_postings(self, candidate: str) -> Tuple[Optional[str], float]:
+        """通过n-gram倒排表累加得分（未安装numpy/scipy时使用）"""
+        scores: Dict[int, float] = {}
+        for gram, weight in ngram_vector(candidate, self.ngram_size).items():
+            for row, icon_weight in self._postings.get(gram, ()):
+                scores[row] = scores.get(row, 0.0) + weight * icon_weight
+
+        if not scores:
+            return None, 0.0
+        # 得分相同时取排序靠前的图标，与矩阵实现的argmax一致
+        row = min(scores, key=lambda r: (-scores[r], r))
+        return self.icon_names[row], scores[row]
@@ -0,0 +1,137 @@
+"""
+阶段计时 - 低开销地累计各处理阶段的耗时、调用次数和单次耗时分布（对数分桶直方图，可跨进程合并）
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator
+
+# 直方图每翻一倍分的桶数：8个桶时分位数的相对误差约为4%
+_BUCKETS_PER_DOUBLING = 8
+# 直方图下限（秒），更短的耗时都计入第一个桶
+_MIN_SECONDS = 1e-7
+
+
+class LatencyHistogram:
+    """单次耗时的对数分桶直方图，只保存每个桶的计数，内存占用与调用次数无关"""
+
+    __slots__ = ('buckets', 'calls', 'seconds', 'max')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.calls = 0
+        self.seconds = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """记录一次耗时"""
+        if seconds > _MIN_SECONDS:
+            index = int(math.log2(seconds / _MIN_SECONDS) * _BUCKETS_PER_DOUBLING)
+        else:
+            index = 0
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.calls += 1
+        self.seconds += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram'):
+        """累加另一个直方图"""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """
+        估算分位数（取所在桶的几何中点，不超过最大值）
+
+        Args:
+            percent: 百分位，例如95
+
+        Returns:
+            耗时（秒），没有记录时为0
+        """
+        if not self.calls:
+            return 0.0
+
+        rank = max(1, math.ceil(self.calls * percent / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(_MIN_SECONDS * 2 ** ((index + 0.5) / _BUCKETS_PER_DOUBLING), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """汇总: 调用次数、累计/平均/最大耗时和p50/p95/p99（秒）"""
+        return {
+            'calls': self.calls,
+            'seconds': self.seconds,
+            'mean': self.seconds / self.calls if self.calls else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class StageTimer:
+    """按阶段名称累计耗时直方图"""
+
+    def __init__(self):
+        self.stages: Dict[str, LatencyHistogram] = {}
+
+    def record(self, stage: str, seconds: float):
+        """记录阶段的一次耗时"""
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = LatencyHistogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def measure(self, stage: str):
+        """计时上下文（用于只执行一次或少数几次的阶段）"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def iter_timed(self, stage: str, items: Iterable[Any]) -> Iterator[Any]:
+        """逐个产出元素，并把取得每个元素的耗时（例如流式解析）计入阶段"""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.record(stage, time.perf_counter() - started)
+            yield item
+
+    def take(self) -> Dict[str, LatencyHistogram]:
+        """取出并清零计时数据（多进程处理时工作进程按分块汇总到主进程）"""
+        stages = self.stages
+        self.stages = {}
+        return stages
+
+    def merge(self, stages: Dict[str, LatencyHistogram]):
+        """累加take取出的计时数据"""
+        for stage, histogram in stages.items():
+            self.stages.setdefault(stage, LatencyHistogram()).merge(histogram)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """各阶段的汇总，见LatencyHistogram.summary"""
+        return {stage: histogram.summary() for stage, histogram in self.stages.items()}
+
+
+def format_latency(summary: Dict[str, float]) -> str:
+    """把汇总格式化为报告中的一行: 累计、调用次数和分位数（毫秒）"""
+    text = f"累计{summary['seconds'] * 1000:.1f}ms, 调用{summary['calls']}次"
+    if summary['calls'] > 1:
+        text += (f", p50 {summary['p50'] * 1000:.3f}ms, p95 {summary['p95'] * 1000:.3f}ms, "
+                 f"p99 {summary['p99'] * 1000:.3f}ms")
+    return text
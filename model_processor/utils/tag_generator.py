@@ -5,12 +5,14 @@
 import re
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Optional
 
 # 添加父目录到Python路径以支持导入config
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import FUNCTION_KEYWORDS, VENDOR_TAGS, SPECIAL_RULES
 from .logger import get_logger
+from .keyword_automaton import get_rule_matcher
+from .model_features import ModelFeatures
 
 logger = get_logger("TagGenerator")
 
@@ -22,6 +24,7 @@ class TagGenerator:
         self.function_keywords = FUNCTION_KEYWORDS
         self.vendor_tags = VENDOR_TAGS
         self.special_rules = SPECIAL_RULES
+        self.rule_matcher = get_rule_matcher()
 
         # 定义允许的标签列表（精简后的标签体系）
         self.allowed_tags = {
@@ -120,19 +123,20 @@ class TagGenerator:
                 mapped_tag = self.tag_mapping[tag]
                 if mapped_tag is not None and mapped_tag not in filtered_tags:
                     filtered_tags.append(mapped_tag)
-                    logger.debug(f"标签映射: {tag} -> {mapped_tag}")
+                    logger.debug("标签映射: %s -> %s", tag, mapped_tag)
                 elif mapped_tag is None:
-                    logger.debug(f"删除标签: {tag}")
+                    logger.debug("删除标签: %s", tag)
             # 然后检查是否在允许列表中
             elif tag in self.allowed_tags:
                 if tag not in filtered_tags:
                     filtered_tags.append(tag)
             else:
-                logger.debug(f"过滤掉不允许的标签: {tag}")
+                logger.debug("过滤掉不允许的标签: %s", tag)
 
         return filtered_tags
     
-    def generate_vendor_tags(self, icon_name: str, model_name: str, model_id: str) -> List[str]:
+    def generate_vendor_tags(self, icon_name: str, model_name: str, model_id: str,
+                             features: Optional[ModelFeatures] = None) -> List[str]:
         """
         根据图标名称生成厂商标签
         
@@ -140,6 +144,7 @@ class TagGenerator:
             icon_name: 匹配到的图标名称
             model_name: 模型名称
             model_id: 模型ID
+            features: 预先提取的模型特征（可选）
             
         Returns:
             厂商标签列表
@@ -156,18 +161,21 @@ class TagGenerator:
                     tags.extend(self.vendor_tags[base_icon_name])
             
             # 检查特殊规则
-            text_to_check = f"{model_name} {model_id}".lower()
+            if features is not None:
+                hits = features.hits
+            else:
+                hits = self.rule_matcher.scan(f"{model_name} {model_id}".lower())
             
-            for rule_key, rule_config in self.special_rules.items():
-                if rule_key in text_to_check:
-                    if 'tags' in rule_config:
-                        tags.extend(rule_config['tags'])
+            for rule_key in self.rule_matcher.special_rule_keys(hits):
+                rule_config = self.special_rules[rule_key]
+                if 'tags' in rule_config:
+                    tags.extend(rule_config['tags'])
             
             # 去重
             tags = list(set(tags))
             
             if tags:
-                logger.debug(f"生成厂商标签: {tags}")
+                logger.debug("生成厂商标签: %s", tags)
             
             return tags
             
@@ -192,23 +200,21 @@ class TagGenerator:
             # 合并文本进行分析
             text_to_analyze = f"{model_name} {description}".lower()
             
-            # 检查功能关键词
-            for tag_name, keywords in self.function_keywords.items():
-                for keyword in keywords:
-                    if keyword.lower() in text_to_analyze:
-                        tags.append(tag_name)
-                        break  # 找到一个关键词就够了
+            hits = self.rule_matcher.scan(text_to_analyze)
+            
+            # 检查功能关键词（一个关键词命中就够了）
+            tags.extend(self.rule_matcher.function_tags(hits))
             
             # 特殊逻辑：根据模型名称特征推断（使用新的精简标签）
-            if any(word in text_to_analyze for word in ['thinking', 'reasoning', 'r1', 'o1']):
+            if hits & {'thinking', 'reasoning', 'r1', 'o1'}:
                 if '推理思考' not in tags:
                     tags.append('推理思考')
 
-            if any(word in text_to_analyze for word in ['image', 'vision', 'vl', 'multimodal']):
+            if hits & {'image', 'vision', 'vl', 'multimodal'}:
                 if '多模态' not in tags:
                     tags.append('多模态')
 
-            if any(word in text_to_analyze for word in ['search', 'web', 'browse']):
+            if hits & {'search', 'web', 'browse'}:
                 if '搜索检索' not in tags:
                     tags.append('搜索检索')
             
@@ -216,7 +222,7 @@ class TagGenerator:
             tags = list(set(tags))
             
             if tags:
-                logger.debug(f"生成功能标签: {tags}")
+                logger.debug("生成功能标签: %s", tags)
             
             return tags
             
@@ -285,20 +291,24 @@ class TagGenerator:
                     result_tags.append({'name': tag_name})
                     existing_tag_names.add(tag_name)
             
-            logger.debug(f"标签合并完成: {len(result_tags)}个标签")
+            logger.debug("标签合并完成: %d个标签", len(result_tags))
             return result_tags
             
         except Exception as e:
             logger.error(f"合并标签时出错: {e}")
             return existing_tags if existing_tags else []
     
-    def generate_tags(self, model_data: Dict[str, Any], icon_name: str = "") -> List[Dict[str, str]]:
+    def generate_tags(self, model_data: Dict[str, Any], icon_name: str = "",
+                      features: Optional[ModelFeatures] = None,
+                      vendor_tags: Optional[List[str]] = None) -> List[Dict[str, str]]:
         """
         为模型生成完整的标签集合
 
         Args:
             model_data: 模型数据字典
             icon_name: 匹配到的图标名称
+            features: 预先提取的模型特征（可选）
+            vendor_tags: 已生成的厂商标签（可选，同一模型族共用）
 
         Returns:
             完整的标签列表
@@ -315,7 +325,8 @@ class TagGenerator:
             existing_tags = model_data.get('meta', {}).get('tags', [])
 
             # 生成厂商标签
-            vendor_tags = self.generate_vendor_tags(icon_name, model_name, model_id)
+            if vendor_tags is None:
+                vendor_tags = self.generate_vendor_tags(icon_name, model_name, model_id, features)
 
             # 生成功能标签
             function_tags = self.generate_function_tags(model_name, description)
@@ -340,7 +351,7 @@ class TagGenerator:
             # 转换回字典格式
             filtered_final_tags = [{'name': tag_name} for tag_name in allowed_tag_names]
 
-            logger.info(f"为模型 '{model_name}' 生成了 {len(filtered_final_tags)} 个标签")
+            logger.sampled("生成标签", "为模型 '%s' 生成了 %d 个标签", model_name, len(filtered_final_tags))
             return filtered_final_tags
 
         except Exception as e: